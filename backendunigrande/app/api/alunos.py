@@ -2,23 +2,49 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Request, Response, status
-from fastapi.responses import HTMLResponse
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response, status)
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from tortoise.exceptions import (DoesNotExist, IntegrityError,
                                  MultipleObjectsReturned)
 from tortoise.transactions import in_transaction
 
 from app.auth.utils import setup_logger
-from app.schemas.unigrande import (AlunoCreate, AlunoListPaginated,
-                                   AlunoResponse, AlunoUpdate)
+from app.models.unigrande import Aluno, Curso, Historico, Matriz
+from app.schemas.unigrande import (AlunoBulkCreate, AlunoBulkCreateResult,
+                                   AlunoCreate, AlunoExpandido,
+                                   AlunoListPaginated, AlunoResponse,
+                                   AlunoUpdate, CountModeLiteral, CursorPage,
+                                   NomeSugestao, ProgressoCurricular)
+from app.services.busca import BUSCA_LIMIT, BUSCA_MAX_LIMIT, name_index
+from app.services.expand import Expansao, expand_param, get_response
+from app.services.export import ExportFormat, stream_export
+from app.services.fieldsets import fields_param
+from app.services.filtering import filters_param
+from app.services.loader import DataLoader, get_loader, responses
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.progresso import ProgressoService
+from app.services.serialization import json_response
 from app.services.unigrande import AlunoService
+from app.services.versioning import conditional_get
 
 logger = setup_logger()
 router = APIRouter()
 
+# ETag das leituras: muda quando alunos ou cursos são alterados
+etag_alunos = Depends(conditional_get(Aluno, Curso))
+# busca por id com `?expand=` (o ETag inclui as tabelas das relações pedidas)
+expand_alunos = Depends(expand_param(Aluno))
+# `?fields=`: só as colunas dos campos pedidos
+campos_alunos = Depends(fields_param(AlunoService.RESPONSE_COLUMNS))
+# filtros das listagens (só colunas com índice; ver AlunoService.FILTERS)
+filtros_alunos = Depends(filters_param(AlunoService.FILTERS))
+# progresso curricular: matriz do curso e históricos do aluno
+etag_progresso = Depends(conditional_get(Aluno, Matriz, Historico))
+
 # BASE_DIR = app/
 BASE_DIR = Path(__file__).resolve().parent.parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
@@ -39,14 +65,14 @@ async def error_500(e: Exception):
 # Aluno
 # ----------------------------------------------------------------------
 @router.post("/create-aluno", response_model=AlunoResponse, status_code=201)
-async def create_aluno(payload: AlunoCreate):
+async def create_aluno(payload: AlunoCreate, loader: DataLoader = Depends(get_loader)):
     """
     Cria um aluno. A FK `curso_id` deve existir.
     """
     async with in_transaction():
         try:
             obj = await AlunoService.create(payload)
-            return await AlunoService.response(obj)
+            return await AlunoService.response(obj, loader)
         except IntegrityError as e:
             # violações de FK/unique/etc.
             raise HTTPException(
@@ -56,14 +82,44 @@ async def create_aluno(payload: AlunoCreate):
             await error_500(e)
 
 
-@router.get("/buscar-aluno/{matricula}", response_model=AlunoResponse)
-async def get_aluno(matricula: int):
+@router.post("/create-alunos-lote", response_model=AlunoBulkCreateResult)
+async def create_alunos_lote(payload: AlunoBulkCreate):
+    """
+    Cria alunos em lote (carga de início de semestre).
+    Linhas com `curso_id` inexistente ou matrícula já cadastrada/repetida são
+    rejeitadas individualmente; as demais são inseridas numa única transação.
+    """
+    try:
+        results = await AlunoService.bulk_create(payload.alunos)
+        accepted = sum(1 for r in results if r.status == "accepted")
+        return AlunoBulkCreateResult(
+            total=len(results),
+            accepted=accepted,
+            rejected=len(results) - accepted,
+            results=results,
+        )
+    except IntegrityError as e:
+        # ex.: matrícula inserida por outra requisição durante a carga
+        raise HTTPException(status_code=409, detail=f"Restrição de integridade: {e}")
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/buscar-aluno/{matricula}", response_model=AlunoExpandido)
+async def get_aluno(
+    matricula: int,
+    expansao: Expansao = expand_alunos,
+    campos: Optional[List[str]] = campos_alunos,
+    loader: DataLoader = Depends(get_loader),
+):
     """
     Busca um aluno pela matrícula (PK).
+    Com `expand`, inclui curso, históricos e matrículas do aluno.
+    Exemplo:
+      /alunos/buscar-aluno/2021001?expand=curso,matriculas.turma
     """
     try:
-        obj = await AlunoService.get(matricula)
-        return await AlunoService.response(obj)
+        return await get_response(AlunoService, matricula, expansao, loader, campos)
     except (DoesNotExist, MultipleObjectsReturned):
         raise HTTPException(status_code=404, detail="Aluno não encontrado")
     except HTTPException as e:
@@ -73,26 +129,147 @@ async def get_aluno(matricula: int):
 
 
 @router.get("/listar-alunos", response_model=List[AlunoResponse])
-async def list_alunos():
+async def list_alunos(
+    etag: str = etag_alunos,
+    campos: Optional[List[str]] = campos_alunos,
+    filtros: Dict[str, Any] = filtros_alunos,
+):
     """
     Lista todos os alunos.
+    Com `fields`, só esses campos, num SELECT só com as colunas deles.
+    Exemplo (dropdown):
+      /alunos/listar-alunos?fields=matricula,nome
+    """
+    try:
+        # linhas de .values() já no formato de AlunoResponse
+        return json_response(
+            List[AlunoResponse],
+            await AlunoService.list_values(campos, filtros),
+            etag,
+            validate=False,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get(
+    "/listar-alunos-cursor",
+    response_model=CursorPage[AlunoResponse],
+)
+async def list_alunos_cursor(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    with_total: bool = False,
+    count_mode: CountModeLiteral = "cached",
+    etag: str = etag_alunos,
+    campos: Optional[List[str]] = campos_alunos,
+    filtros: Dict[str, Any] = filtros_alunos,
+    loader: DataLoader = Depends(get_loader),
+):
+    """
+    Lista alunos com paginação por cursor (keyset), ordenada por `matricula` (padrão)
+    ou `sort=nome`. Use `next_cursor`/`prev_cursor` da resposta para navegar;
+    o total só é calculado com `with_total=true`, no modo `count_mode`
+    (exact, cached ou estimate).
+    Filtros (só colunas com índice): `curso_id`, `curso_id__in`; `mgp__gte` e
+    `mgp__lte` só junto de `curso_id` (com filtro, o total é exato).
+    Exemplos:
+      /alunos/listar-alunos-cursor?limit=20&sort=nome
+      /alunos/listar-alunos-cursor?curso_id=3&mgp__gte=7
+    """
+    try:
+        page = await AlunoService.list_page(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            fields=campos,
+            filters=filtros,
+        )
+        return json_response(
+            CursorPage[AlunoResponse],
+            dict(
+                limit=limit,
+                next_cursor=page.next_cursor,
+                prev_cursor=page.prev_cursor,
+                total=page.total,
+                total_mode=page.total_mode,
+                results=(
+                    page.rows
+                    if campos is not None
+                    else await responses(AlunoService.response, page.rows, loader)
+                ),
+            ),
+            etag,
+            validate=campos is None,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get(
+    "/progresso-aluno/{matricula}",
+    response_model=ProgressoCurricular,
+    dependencies=[etag_progresso],
+)
+async def progresso_aluno(matricula: int):
+    """
+    Disciplinas da matriz do curso do aluno já concluídas (AP), pendentes e
+    atrasadas (pendentes de um período da matriz que o aluno já deveria ter
+    cursado), com o percentual concluído.
     """
     try:
-        rows = await AlunoService.list_all()
-        return [await AlunoService.response(x) for x in rows]
+        return await ProgressoService.do_aluno(matricula)
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/exportar-alunos", response_class=StreamingResponse)
+async def exportar_alunos(formato: ExportFormat = "ndjson"):
+    """
+    Exporta todos os alunos em streaming (NDJSON ou CSV), com o nome do curso.
+    O banco é lido em blocos, então a memória por requisição não cresce com a tabela.
+    Exemplo:
+      /alunos/exportar-alunos?formato=csv
+    """
+    try:
+        return stream_export(AlunoService.export_rows(), formato, "alunos")
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/autocomplete-alunos", response_model=List[NomeSugestao])
+async def autocomplete_alunos(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(BUSCA_LIMIT, ge=1, le=BUSCA_MAX_LIMIT),
+):
+    """
+    Sugestões por nome, sem acento e sem diferenciar maiúsculas: primeiro os
+    nomes que começam com `q`, depois os que têm palavras começando por cada
+    palavra de `q`. Servido por um índice em memória (sem ir ao banco).
+    Exemplo:
+      /alunos/autocomplete-alunos?q=sil&limit=10
+    """
+    try:
+        achados = await name_index.search(Aluno, q, limit)
+        return [NomeSugestao(id=id_, nome=nome) for id_, nome in achados]
     except Exception as e:
         await error_500(e)
 
 
 @router.put("/atualizar-aluno/{matricula}", response_model=AlunoResponse)
-async def update_aluno(matricula: int, payload: AlunoUpdate):
+async def update_aluno(
+    matricula: int, payload: AlunoUpdate, loader: DataLoader = Depends(get_loader)
+):
     """
     Atualiza dados do aluno. Se `curso_id` vier no payload, valida a existência do curso no service.
     """
     async with in_transaction():
         try:
             obj = await AlunoService.update(matricula, payload)
-            return await AlunoService.response(obj)
+            return await AlunoService.response(obj, loader)
         except HTTPException as e:
             # por exemplo, 404 do service ou 409 custom
             raise e
@@ -115,20 +292,49 @@ async def delete_aluno(matricula: int):
             await error_500(e)
 
 
-@router.get("/listar-alunos-paginado", response_model=AlunoListPaginated)
-async def list_alunos_paginado(limit: int = 10, offset: int = 0):
+@router.get(
+    "/listar-alunos-paginado",
+    response_model=AlunoListPaginated,
+)
+async def list_alunos_paginado(
+    limit: int = 10,
+    offset: int = 0,
+    count_mode: CountModeLiteral = "cached",
+    etag: str = etag_alunos,
+    campos: Optional[List[str]] = campos_alunos,
+    filtros: Dict[str, Any] = filtros_alunos,
+    loader: DataLoader = Depends(get_loader),
+):
     """
     Lista alunos com paginação (limit/offset).
+    O total vem do modo `count_mode`: exact (COUNT(*)), cached (COUNT(*) em cache,
+    invalidado nas escritas) ou estimate (estatística do planner do Postgres).
     Exemplo:
       /alunos/listar-alunos-paginado?limit=20&offset=0
     """
     try:
-        rows, total = await AlunoService.list_paginated(limit=limit, offset=offset)
-        return AlunoListPaginated(
-            total=total,
+        rows, total, total_mode = await AlunoService.list_paginated(
             limit=limit,
             offset=offset,
-            results=[await AlunoService.response(x) for x in rows],
+            count_mode=count_mode,
+            fields=campos,
+            filters=filtros,
+        )
+        return json_response(
+            AlunoListPaginated,
+            dict(
+                total=total,
+                total_mode=total_mode,
+                limit=limit,
+                offset=offset,
+                results=(
+                    rows
+                    if campos is not None
+                    else await responses(AlunoService.response, rows, loader)
+                ),
+            ),
+            etag,
+            validate=campos is None,
         )
     except Exception as e:
         await error_500(e)
@@ -137,24 +343,25 @@ async def list_alunos_paginado(limit: int = 10, offset: int = 0):
 @router.get("/list-alunos/view", response_class=HTMLResponse)
 async def alunos_view(
     request: Request,
-    limit: int = 10,
-    offset: int = 0,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    with_total: bool = False,
+    count_mode: CountModeLiteral = "cached",
+    etag: str = etag_alunos,
+    loader: DataLoader = Depends(get_loader),
 ):
     """
-    Tela HTML com listagem paginada de alunos.
+    Tela HTML com listagem paginada de alunos (paginação por cursor).
+    O total só é calculado com `with_total=true`, no modo `count_mode`.
+    O `TemplateResponse` é devolvido direto, então o ETag vai no próprio header.
     Exemplo:
-      /alunos/view?limit=20&offset=0
+      /alunos/list-alunos/view?limit=20&with_total=true
     """
     try:
-        rows, total = await AlunoService.list_paginated(limit=limit, offset=offset)
-        alunos = [await AlunoService.response(x) for x in rows]
-
-        # cálculo básico de paginação
-        page = (offset // limit) + 1 if limit > 0 else 1
-        total_pages = (total + limit - 1) // limit if limit > 0 else 1
-
-        next_offset = offset + limit if page < total_pages else None
-        prev_offset = offset - limit if offset - limit >= 0 else None
+        page = await AlunoService.list_page(
+            limit=limit, cursor=cursor, with_total=with_total, count_mode=count_mode
+        )
+        alunos = await responses(AlunoService.response, page.rows, loader)
 
         return templates.TemplateResponse(
             "alunos.html",
@@ -162,14 +369,13 @@ async def alunos_view(
                 "request": request,
                 "titulo_pagina": "Lista de Alunos",
                 "alunos": alunos,
-                "total": total,
+                "total": page.total,
+                "with_total": with_total,
                 "limit": limit,
-                "offset": offset,
-                "page": page,
-                "total_pages": total_pages,
-                "next_offset": next_offset,
-                "prev_offset": prev_offset,
+                "next_cursor": page.next_cursor,
+                "prev_cursor": page.prev_cursor,
             },
+            headers={"ETag": etag},
         )
     except Exception as e:
         await error_500(e)
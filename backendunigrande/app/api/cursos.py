@@ -1,20 +1,42 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from tortoise.exceptions import DoesNotExist, MultipleObjectsReturned
 from tortoise.transactions import in_transaction
 
 from app.auth.utils import setup_logger
-from app.schemas.unigrande import CursoCreate, CursoResponse, CursoUpdate
+from app.models.unigrande import Aluno, Curso, Historico, Matriz, Professor
+from app.schemas.unigrande import (CountModeLiteral, CursoCreate,
+                                   CursoExpandido, CursoResponse, CursorPage,
+                                   CursoUpdate, ProgressoCurricular)
+from app.services.expand import Expansao, expand_param, get_response
+from app.services.fieldsets import fields_param
+from app.services.filtering import filters_param
+from app.services.loader import DataLoader, get_loader, responses
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.progresso import ProgressoService
+from app.services.serialization import json_response
 from app.services.unigrande import CursoService
+from app.services.versioning import conditional_get
 
 # Configurar o logger
 logger = setup_logger()
 
 router = APIRouter()
 
+# ETag das leituras: muda quando cursos ou professores (coordenador) são alterados
+etag_cursos = Depends(conditional_get(Curso, Professor))
+# busca por id com `?expand=` (o ETag inclui as tabelas das relações pedidas)
+expand_cursos = Depends(expand_param(Curso))
+# `?fields=`: só as colunas dos campos pedidos
+campos_cursos = Depends(fields_param(CursoService.RESPONSE_COLUMNS))
+# filtros das listagens (só colunas com índice; ver CursoService.FILTERS)
+filtros_cursos = Depends(filters_param(CursoService.FILTERS))
+# progresso curricular: matriz, alunos e históricos do curso
+etag_progresso = Depends(conditional_get(Curso, Aluno, Matriz, Historico))
+
 
 # =============== util de erro ===============
 async def error_500(e: Exception):
@@ -58,20 +80,30 @@ async def error_500(e: Exception):
         ```
         """,
 )
-async def create_curso(payload: CursoCreate):
+async def create_curso(payload: CursoCreate, loader: DataLoader = Depends(get_loader)):
     async with in_transaction():
         try:
             obj = await CursoService.create(payload)
-            return await CursoService.response(obj)
+            return await CursoService.response(obj, loader)
         except Exception as e:
             await error_500(e)
 
 
-@router.get("/buscar-curso/{id}", response_model=CursoResponse)
-async def get_curso(id: int):
+@router.get("/buscar-curso/{id}", response_model=CursoExpandido)
+async def get_curso(
+    id: int,
+    expansao: Expansao = expand_cursos,
+    campos: Optional[List[str]] = campos_cursos,
+    loader: DataLoader = Depends(get_loader),
+):
+    """
+    Busca um curso pelo ID (PK).
+    Com `expand`, inclui coordenador, alunos, matriz e turmas do curso.
+    Exemplo:
+      /cursos/buscar-curso/26?expand=coordenador,alunos
+    """
     try:
-        obj = await CursoService.get(id)
-        return await CursoService.response(obj)
+        return await get_response(CursoService, id, expansao, loader, campos)
     except (DoesNotExist, MultipleObjectsReturned):
         raise HTTPException(404, "Curso não encontrado")
     except HTTPException as e:
@@ -81,20 +113,102 @@ async def get_curso(id: int):
 
 
 @router.get("/listar-cursos", response_model=List[CursoResponse])
-async def list_cursos():
+async def list_cursos(
+    etag: str = etag_cursos,
+    campos: Optional[List[str]] = campos_cursos,
+    filtros: Dict[str, Any] = filtros_cursos,
+):
+    try:
+        # linhas de .values() já no formato de CursoResponse
+        return json_response(
+            List[CursoResponse],
+            await CursoService.list_values(campos, filtros),
+            etag,
+            validate=False,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get(
+    "/listar-cursos-cursor",
+    response_model=CursorPage[CursoResponse],
+)
+async def list_cursos_cursor(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    with_total: bool = False,
+    count_mode: CountModeLiteral = "cached",
+    etag: str = etag_cursos,
+    campos: Optional[List[str]] = campos_cursos,
+    filtros: Dict[str, Any] = filtros_cursos,
+    loader: DataLoader = Depends(get_loader),
+):
+    """
+    Lista cursos com paginação por cursor (keyset), ordenada por `id` (padrão)
+    ou `sort=nome`. Use `next_cursor`/`prev_cursor` da resposta para navegar;
+    o total só é calculado com `with_total=true`, no modo `count_mode`
+    (exact, cached ou estimate).
+    Exemplo:
+      /cursos/listar-cursos-cursor?limit=20&sort=nome
+    """
+    try:
+        page = await CursoService.list_page(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            fields=campos,
+            filters=filtros,
+        )
+        return json_response(
+            CursorPage[CursoResponse],
+            dict(
+                limit=limit,
+                next_cursor=page.next_cursor,
+                prev_cursor=page.prev_cursor,
+                total=page.total,
+                total_mode=page.total_mode,
+                results=(
+                    page.rows
+                    if campos is not None
+                    else await responses(CursoService.response, page.rows, loader)
+                ),
+            ),
+            etag,
+            validate=campos is None,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get(
+    "/progresso-curso/{id}",
+    response_model=List[ProgressoCurricular],
+)
+async def progresso_curso(id: int, etag: str = etag_progresso):
+    """
+    Progresso curricular de todos os alunos do curso (concluídas, pendentes e
+    atrasadas frente à matriz), calculado em lote com consultas constantes.
+    """
     try:
-        lista_cursos = await CursoService.list_all()
-        return [await CursoService.response(curso) for curso in lista_cursos]
+        return json_response(
+            List[ProgressoCurricular], await ProgressoService.do_curso(id), etag
+        )
     except Exception as e:
         await error_500(e)
 
 
 @router.put("/atualizar-curso/{id}", response_model=CursoResponse)
-async def update_curso(id: int, payload: CursoUpdate):
+async def update_curso(
+    id: int, payload: CursoUpdate, loader: DataLoader = Depends(get_loader)
+):
     async with in_transaction():
         try:
             obj = await CursoService.update(id, payload)
-            return await CursoService.response(obj)
+            return await CursoService.response(obj, loader)
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -1,21 +1,41 @@
 # app/api/disciplinas.py
 from __future__ import annotations
 
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from tortoise.exceptions import (DoesNotExist, IntegrityError,
                                  MultipleObjectsReturned)
 from tortoise.transactions import in_transaction
 
 from app.auth.utils import setup_logger
-from app.schemas.unigrande import (DisciplinaCreate, DisciplinaResponse,
-                                   DisciplinaUpdate)
+from app.models.unigrande import Disciplina
+from app.schemas.unigrande import (CountModeLiteral, CursorPage,
+                                   DisciplinaCreate, DisciplinaExpandido,
+                                   DisciplinaResponse, DisciplinaUpdate,
+                                   NomeSugestao)
+from app.services.busca import BUSCA_LIMIT, BUSCA_MAX_LIMIT, name_index
+from app.services.expand import Expansao, expand_param, get_response
+from app.services.fieldsets import fields_param
+from app.services.filtering import filters_param
+from app.services.loader import DataLoader, get_loader
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.serialization import json_response
 from app.services.unigrande import DisciplinaService
+from app.services.versioning import conditional_get
 
 logger = setup_logger()
 router = APIRouter()
 
+# ETag das leituras: muda quando disciplinas são alterados
+etag_disciplinas = Depends(conditional_get(Disciplina))
+# busca por id com `?expand=` (o ETag inclui as tabelas das relações pedidas)
+expand_disciplinas = Depends(expand_param(Disciplina))
+# `?fields=`: só as colunas dos campos pedidos
+campos_disciplinas = Depends(fields_param(DisciplinaService.RESPONSE_COLUMNS))
+# filtros das listagens (só colunas com índice; ver DisciplinaService.FILTERS)
+filtros_disciplinas = Depends(filters_param(DisciplinaService.FILTERS))
+
 
 # =============== util de erro ===============
 async def error_500(e: Exception):
@@ -49,14 +69,21 @@ async def create_disciplina(payload: DisciplinaCreate):
             await error_500(e)
 
 
-@router.get("/buscar-disciplina/{id}", response_model=DisciplinaResponse)
-async def get_disciplina(id: int):
+@router.get("/buscar-disciplina/{id}", response_model=DisciplinaExpandido)
+async def get_disciplina(
+    id: int,
+    expansao: Expansao = expand_disciplinas,
+    campos: Optional[List[str]] = campos_disciplinas,
+    loader: DataLoader = Depends(get_loader),
+):
     """
     Busca uma disciplina pelo ID (PK).
+    Com `expand`, inclui a matriz e as turmas da disciplina.
+    Exemplo:
+      /disciplinas/buscar-disciplina/7?expand=turmas.professor
     """
     try:
-        obj = await DisciplinaService.get(id)
-        return await DisciplinaService.response(obj)
+        return await get_response(DisciplinaService, id, expansao, loader, campos)
     except (DoesNotExist, MultipleObjectsReturned):
         raise HTTPException(status_code=404, detail="Disciplina não encontrada")
     except HTTPException as e:
@@ -65,14 +92,98 @@ async def get_disciplina(id: int):
         await error_500(e)
 
 
-@router.get("/listar-disciplinas", response_model=List[DisciplinaResponse])
-async def list_disciplinas():
+@router.get(
+    "/listar-disciplinas",
+    response_model=List[DisciplinaResponse],
+)
+async def list_disciplinas(
+    etag: str = etag_disciplinas,
+    campos: Optional[List[str]] = campos_disciplinas,
+    filtros: Dict[str, Any] = filtros_disciplinas,
+):
     """
     Lista todas as disciplinas.
     """
     try:
-        rows = await DisciplinaService.list_all()
-        return [await DisciplinaService.response(x) for x in rows]
+        # linhas de .values() já no formato de DisciplinaResponse
+        return json_response(
+            List[DisciplinaResponse],
+            await DisciplinaService.list_values(campos, filtros),
+            etag,
+            validate=False,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get(
+    "/listar-disciplinas-cursor",
+    response_model=CursorPage[DisciplinaResponse],
+)
+async def list_disciplinas_cursor(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    with_total: bool = False,
+    count_mode: CountModeLiteral = "cached",
+    etag: str = etag_disciplinas,
+    campos: Optional[List[str]] = campos_disciplinas,
+    filtros: Dict[str, Any] = filtros_disciplinas,
+):
+    """
+    Lista disciplinas com paginação por cursor (keyset), ordenada por `id` (padrão)
+    ou `sort=nome`. Use `next_cursor`/`prev_cursor` da resposta para navegar;
+    o total só é calculado com `with_total=true`, no modo `count_mode`
+    (exact, cached ou estimate).
+    Exemplo:
+      /disciplinas/listar-disciplinas-cursor?limit=20&sort=nome
+    """
+    try:
+        page = await DisciplinaService.list_page(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            fields=campos,
+            filters=filtros,
+        )
+        return json_response(
+            CursorPage[DisciplinaResponse],
+            dict(
+                limit=limit,
+                next_cursor=page.next_cursor,
+                prev_cursor=page.prev_cursor,
+                total=page.total,
+                total_mode=page.total_mode,
+                results=(
+                    page.rows
+                    if campos is not None
+                    else [await DisciplinaService.response(x) for x in page.rows]
+                ),
+            ),
+            etag,
+            validate=campos is None,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/autocomplete-disciplinas", response_model=List[NomeSugestao])
+async def autocomplete_disciplinas(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(BUSCA_LIMIT, ge=1, le=BUSCA_MAX_LIMIT),
+):
+    """
+    Sugestões por nome, sem acento e sem diferenciar maiúsculas: primeiro os
+    nomes que começam com `q`, depois os que têm palavras começando por cada
+    palavra de `q`. Servido por um índice em memória (sem ir ao banco).
+    Exemplo:
+      /disciplinas/autocomplete-disciplinas?q=calc&limit=10
+    """
+    try:
+        achados = await name_index.search(Disciplina, q, limit)
+        return [NomeSugestao(id=id_, nome=nome) for id_, nome in achados]
     except Exception as e:
         await error_500(e)
 
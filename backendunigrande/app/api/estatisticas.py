@@ -0,0 +1,138 @@
+# app/api/estatisticas.py
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.auth.utils import setup_logger
+from app.models.unigrande import (Curso, Disciplina, Estatistica,
+                                  PeriodoLetivo, Professor)
+from app.schemas.unigrande import EstatisticaGrupo
+from app.services.estatisticas import Dimensao, EstatisticaService
+from app.services.versioning import conditional_get
+
+logger = setup_logger()
+router = APIRouter()
+
+# ETag: muda com o resumo e com as tabelas cujas remoções o apagam em cascata
+etag_estatisticas = Depends(
+    conditional_get(Estatistica, Curso, Disciplina, Professor, PeriodoLetivo)
+)
+
+
+# =============== util de erro ===============
+async def error_500(e: Exception):
+    # se já for HTTPException (ex.: 404/409), apenas repasse
+    if isinstance(e, HTTPException):
+        raise e
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Ocorreu um erro inesperado: {str(e)}",
+    )
+
+
+async def _agrupar(dimensao: Dimensao, **filtros: Optional[int]):
+    try:
+        return await EstatisticaService.agrupar(
+            dimensao, **{k: v for k, v in filtros.items() if v is not None}
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+# ----------------------------------------------------------------------
+# Estatísticas (somente leitura; vêm da tabela-resumo `estatisticas`)
+# ----------------------------------------------------------------------
+@router.get(
+    "/por-curso",
+    response_model=List[EstatisticaGrupo],
+    dependencies=[etag_estatisticas],
+)
+async def estatisticas_por_curso(
+    periodo_letivo_id: Optional[int] = None,
+    disciplina_id: Optional[int] = None,
+    professor_id: Optional[int] = None,
+):
+    """
+    Taxa de aprovação, média final e taxa de faltas de cada curso
+    (históricos pelo curso do aluno; matrículas pelo curso da turma).
+    Exemplo:
+      /estatisticas/por-curso?periodo_letivo_id=12
+    """
+    return await _agrupar(
+        "curso",
+        periodo_letivo_id=periodo_letivo_id,
+        disciplina_id=disciplina_id,
+        professor_id=professor_id,
+    )
+
+
+@router.get(
+    "/por-disciplina",
+    response_model=List[EstatisticaGrupo],
+    dependencies=[etag_estatisticas],
+)
+async def estatisticas_por_disciplina(
+    periodo_letivo_id: Optional[int] = None,
+    curso_id: Optional[int] = None,
+    professor_id: Optional[int] = None,
+):
+    """
+    Indicadores de cada disciplina.
+    Exemplo:
+      /estatisticas/por-disciplina?curso_id=3
+    """
+    return await _agrupar(
+        "disciplina",
+        periodo_letivo_id=periodo_letivo_id,
+        curso_id=curso_id,
+        professor_id=professor_id,
+    )
+
+
+@router.get(
+    "/por-professor",
+    response_model=List[EstatisticaGrupo],
+    dependencies=[etag_estatisticas],
+)
+async def estatisticas_por_professor(
+    periodo_letivo_id: Optional[int] = None,
+    curso_id: Optional[int] = None,
+    disciplina_id: Optional[int] = None,
+):
+    """
+    Indicadores de cada professor, pelas turmas que ele leciona
+    (históricos sem turma ofertada ficam de fora).
+    Exemplo:
+      /estatisticas/por-professor?periodo_letivo_id=12
+    """
+    return await _agrupar(
+        "professor",
+        periodo_letivo_id=periodo_letivo_id,
+        curso_id=curso_id,
+        disciplina_id=disciplina_id,
+    )
+
+
+@router.get(
+    "/por-periodo",
+    response_model=List[EstatisticaGrupo],
+    dependencies=[etag_estatisticas],
+)
+async def estatisticas_por_periodo(
+    curso_id: Optional[int] = None,
+    disciplina_id: Optional[int] = None,
+    professor_id: Optional[int] = None,
+):
+    """
+    Indicadores de cada período letivo.
+    Exemplo:
+      /estatisticas/por-periodo?curso_id=3
+    """
+    return await _agrupar(
+        "periodo_letivo",
+        curso_id=curso_id,
+        disciplina_id=disciplina_id,
+        professor_id=professor_id,
+    )
@@ -0,0 +1,86 @@
+# app/api/historicos.py
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.auth.utils import setup_logger
+from app.models.unigrande import Aluno, Disciplina, Historico, PeriodoLetivo
+from app.schemas.unigrande import HistoricoEscolar
+from app.services.export import ExportFormat, stream_export
+from app.services.fechamento import fechar_periodo
+from app.services.unigrande import HistoricoService
+from app.services.versioning import conditional_get
+
+logger = setup_logger()
+router = APIRouter()
+
+# ETag do histórico escolar: muda com históricos, alunos, disciplinas e períodos
+etag_historico_escolar = Depends(
+    conditional_get(Historico, Aluno, Disciplina, PeriodoLetivo)
+)
+
+
+# =============== util de erro ===============
+async def error_500(e: Exception):
+    # se já for HTTPException (ex.: 404/409), apenas repasse
+    if isinstance(e, HTTPException):
+        raise e
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Ocorreu um erro inesperado: {str(e)}",
+    )
+
+
+# ----------------------------------------------------------------------
+# Histórico
+# ----------------------------------------------------------------------
+@router.get(
+    "/historico-escolar/{aluno_id}",
+    response_model=HistoricoEscolar,
+    dependencies=[etag_historico_escolar],
+)
+async def get_historico_escolar(aluno_id: int):
+    """
+    Histórico escolar de um aluno: disciplinas cursadas agrupadas por período
+    letivo, com média do período e média acumulada (ponderadas pelos créditos)
+    e créditos integralizados.
+    Exemplo:
+      /historicos/historico-escolar/2019001
+    """
+    try:
+        return await HistoricoService.historico_escolar(aluno_id)
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/exportar-historicos", response_class=StreamingResponse)
+async def exportar_historicos(formato: ExportFormat = "ndjson"):
+    """
+    Exporta todos os históricos em streaming (NDJSON ou CSV), com ano/semestre,
+    nome do aluno e da disciplina.
+    O banco é lido em blocos, então a memória por requisição não cresce com a tabela.
+    Exemplo:
+      /historicos/exportar-historicos?formato=csv
+    """
+    try:
+        return stream_export(HistoricoService.export_rows(), formato, "historicos")
+    except Exception as e:
+        await error_500(e)
+
+
+@router.post("/fechar-periodo/{periodo_letivo_id}")
+async def fechar_periodo_letivo(periodo_letivo_id: int):
+    """
+    Fecha o período letivo: gera os históricos (situação, média final e faltas)
+    a partir das notas e faltas das matrículas das turmas do período.
+    Pode ser chamado de novo sem duplicar nada (ex.: depois de uma falha ou de
+    lançamentos atrasados); históricos já existentes não são alterados.
+    """
+    try:
+        report = await fechar_periodo(periodo_letivo_id)
+    except Exception as e:
+        await error_500(e)
+    if report is None:
+        raise HTTPException(status_code=404, detail="PeriodoLetivo não encontrado.")
+    return report._asdict()
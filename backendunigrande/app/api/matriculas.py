@@ -0,0 +1,124 @@
+# app/api/matriculas.py
+from __future__ import annotations
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from tortoise.transactions import in_transaction
+
+from app.auth.utils import setup_logger
+from app.models.unigrande import Matricula
+from app.schemas.unigrande import (MatriculaCreate, MatriculaExpandido,
+                                   PautaTurma, PautaTurmaResult,
+                                   TicketMatricula)
+from app.services.admissao import fila_matriculas
+from app.services.expand import Expansao, expand_param, get_response
+from app.services.export import ExportFormat, stream_export
+from app.services.fieldsets import fields_param
+from app.services.loader import DataLoader, get_loader
+from app.services.unigrande import MatriculaService
+
+logger = setup_logger()
+router = APIRouter()
+
+# busca por id com `?expand=` (o ETag inclui as tabelas das relações pedidas)
+expand_matriculas = Depends(expand_param(Matricula))
+# `?fields=`: só as colunas dos campos pedidos
+campos_matriculas = Depends(fields_param(MatriculaService.RESPONSE_COLUMNS))
+
+
+# =============== util de erro ===============
+async def error_500(e: Exception):
+    # se já for HTTPException (ex.: 404/409), apenas repasse
+    if isinstance(e, HTTPException):
+        raise e
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Ocorreu um erro inesperado: {str(e)}",
+    )
+
+
+# ----------------------------------------------------------------------
+# Matrícula
+# ----------------------------------------------------------------------
+@router.post("/fila", response_model=TicketMatricula, status_code=202)
+async def enfileirar_matricula(payload: MatriculaCreate):
+    """
+    Pede uma matrícula pela fila de admissão (abertura das matrículas).
+    Responde na hora com um ticket `pendente`; o resultado sai em
+    `/matriculas/fila/{ticket}`. Com a fila cheia responde 429 com `Retry-After`.
+    """
+    try:
+        return fila_matriculas.submit(payload)
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/fila/{ticket}", response_model=TicketMatricula)
+async def consultar_ticket(ticket: str):
+    """
+    Situação de um pedido da fila: `pendente`, `aceita` (com `matricula_id`) ou
+    `recusada` (com `status_code`/`detail` equivalentes ao create direto).
+    Tickets expiram alguns minutos depois de concluídos.
+    """
+    obj = fila_matriculas.ticket(ticket)
+    if obj is None:
+        raise HTTPException(status_code=404, detail="Ticket não encontrado.")
+    return obj
+
+
+@router.get("/buscar-matricula/{id}", response_model=MatriculaExpandido)
+async def get_matricula(
+    id: int,
+    expansao: Expansao = expand_matriculas,
+    campos: Optional[List[str]] = campos_matriculas,
+    loader: DataLoader = Depends(get_loader),
+):
+    """
+    Busca uma matrícula pelo ID (PK), com notas e faltas.
+    Com `expand`, inclui o aluno e a turma (e a disciplina, o professor e o
+    período da turma).
+    Exemplo:
+      /matriculas/buscar-matricula/10?expand=aluno,turma.disciplina
+    """
+    try:
+        return await get_response(MatriculaService, id, expansao, loader, campos)
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/exportar-matriculas", response_class=StreamingResponse)
+async def exportar_matriculas(formato: ExportFormat = "ndjson"):
+    """
+    Exporta todas as matrículas (notas e faltas por turma) em streaming
+    (NDJSON ou CSV), com o nome do aluno.
+    O banco é lido em blocos, então a memória por requisição não cresce com a tabela.
+    Exemplo:
+      /matriculas/exportar-matriculas?formato=csv
+    """
+    try:
+        return stream_export(MatriculaService.export_rows(), formato, "matriculas")
+    except Exception as e:
+        await error_500(e)
+
+
+@router.put("/turma/{turma_id}/pauta", response_model=PautaTurmaResult)
+async def lancar_pauta(turma_id: int, payload: PautaTurma):
+    """
+    Lança notas e faltas da turma inteira numa requisição (pauta do professor).
+    Cada linha identifica o aluno por `aluno_id` e traz só os campos a alterar.
+    Se algum aluno não estiver matriculado na turma, nada é gravado (400).
+    Exemplo de corpo:
+      {"lancamentos": [{"aluno_id": 1, "nota_01": 8.5, "faltas_01": 2}]}
+    """
+    async with in_transaction():
+        try:
+            campos = await MatriculaService.lancar_pauta(turma_id, payload.lancamentos)
+            return PautaTurmaResult(
+                turma_id=turma_id,
+                atualizadas=len(payload.lancamentos) if campos else 0,
+                campos=campos,
+            )
+        except Exception as e:
+            await error_500(e)
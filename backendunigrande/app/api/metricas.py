@@ -0,0 +1,62 @@
+# app/api/metricas.py
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.services import pool
+from app.services.admissao import fila_matriculas
+from app.services.busca import name_index
+from app.services.cache import historico_escolar_cache, reference_cache
+
+router = APIRouter()
+
+
+# ----------------------------------------------------------------------
+# Métricas de processo
+# ----------------------------------------------------------------------
+@router.get("/cache")
+async def metricas_cache():
+    """
+    Tamanho e contadores de hit/miss do cache das tabelas de referência
+    (cursos, disciplinas, professores, períodos letivos), por tabela.
+    Os valores são do processo atual e zeram no restart.
+    """
+    return reference_cache.stats()
+
+
+@router.get("/cache-historico-escolar")
+async def metricas_cache_historico_escolar():
+    """
+    Tamanho e hit/miss do cache de históricos escolares (um por aluno).
+    """
+    return historico_escolar_cache.stats()
+
+
+@router.get("/fila-matriculas")
+async def metricas_fila_matriculas():
+    """
+    Profundidade da fila de admissão de matrículas, contadores de pedidos
+    (enfileirados, aceitos, recusados, recusados por fila cheia) e o tempo de
+    espera na fila (média, p95 e máximo das últimas amostras).
+    """
+    return fila_matriculas.stats()
+
+
+@router.get("/indice-nomes")
+async def metricas_indice_nomes():
+    """
+    Quantidade de nomes em cada índice do autocomplete já montado
+    (alunos, professores, disciplinas).
+    """
+    return name_index.stats()
+
+
+@router.get("/pool-conexoes")
+async def metricas_pool_conexoes():
+    """
+    Pool de conexões do Postgres, por conexão do Tortoise: limites (min/max),
+    conexões abertas, em uso e ociosas, pedidos aguardando conexão, falhas ao
+    adquirir e o histograma do tempo de espera por uma conexão (ms).
+    Vazio sem Postgres (ex.: sqlite nos testes).
+    """
+    return pool.stats()
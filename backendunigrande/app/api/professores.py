@@ -1,21 +1,37 @@
 # app/api/professores.py
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from tortoise.exceptions import (DoesNotExist, IntegrityError,
                                  MultipleObjectsReturned)
 from tortoise.transactions import in_transaction
 
 from app.auth.utils import setup_logger
-from app.schemas.unigrande import (ProfessorCreate, ProfessorResponse,
-                                   ProfessorUpdate)
+from app.models.unigrande import Professor
+from app.schemas.unigrande import (CountModeLiteral, CursorPage, NomeSugestao,
+                                   ProfessorCreate, ProfessorExpandido,
+                                   ProfessorResponse, ProfessorUpdate)
+from app.services.busca import BUSCA_LIMIT, BUSCA_MAX_LIMIT, name_index
+from app.services.expand import Expansao, expand_param, get_response
+from app.services.fieldsets import fields_param
+from app.services.loader import DataLoader, get_loader
+from app.services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.serialization import json_response
 from app.services.unigrande import ProfessorService
+from app.services.versioning import conditional_get
 
 logger = setup_logger()
 router = APIRouter()
 
+# ETag das leituras: muda quando professores são alterados
+etag_professores = Depends(conditional_get(Professor))
+# busca por id com `?expand=` (o ETag inclui as tabelas das relações pedidas)
+expand_professores = Depends(expand_param(Professor))
+# `?fields=`: só as colunas dos campos pedidos
+campos_professores = Depends(fields_param(ProfessorService.RESPONSE_COLUMNS))
+
 
 # =============== util de erro ===============
 async def error_500(e: Exception):
@@ -49,14 +65,21 @@ async def create_professor(payload: ProfessorCreate):
             await error_500(e)
 
 
-@router.get("/buscar-professor/{id}", response_model=ProfessorResponse)
-async def get_professor(id: int):
+@router.get("/buscar-professor/{id}", response_model=ProfessorExpandido)
+async def get_professor(
+    id: int,
+    expansao: Expansao = expand_professores,
+    campos: Optional[List[str]] = campos_professores,
+    loader: DataLoader = Depends(get_loader),
+):
     """
     Busca um professor por ID.
+    Com `expand`, inclui os cursos que coordena e as turmas que leciona.
+    Exemplo:
+      /professores/buscar-professor/3?expand=cursos,turmas.disciplina
     """
     try:
-        obj = await ProfessorService.get(id)
-        return await ProfessorService.response(obj)
+        return await get_response(ProfessorService, id, expansao, loader, campos)
     except (DoesNotExist, MultipleObjectsReturned):
         raise HTTPException(status_code=404, detail="Professor não encontrado")
     except HTTPException as e:
@@ -65,14 +88,94 @@ async def get_professor(id: int):
         await error_500(e)
 
 
-@router.get("/listar-professores", response_model=List[ProfessorResponse])
-async def list_professores():
+@router.get(
+    "/listar-professores",
+    response_model=List[ProfessorResponse],
+)
+async def list_professores(
+    etag: str = etag_professores, campos: Optional[List[str]] = campos_professores
+):
     """
     Lista todos os professores.
     """
     try:
-        rows = await ProfessorService.list_all()
-        return [await ProfessorService.response(x) for x in rows]
+        # linhas de .values() já no formato de ProfessorResponse
+        return json_response(
+            List[ProfessorResponse],
+            await ProfessorService.list_values(campos),
+            etag,
+            validate=False,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get(
+    "/listar-professores-cursor",
+    response_model=CursorPage[ProfessorResponse],
+)
+async def list_professores_cursor(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    with_total: bool = False,
+    count_mode: CountModeLiteral = "cached",
+    etag: str = etag_professores,
+    campos: Optional[List[str]] = campos_professores,
+):
+    """
+    Lista professores com paginação por cursor (keyset), ordenada por `id` (padrão)
+    ou `sort=nome`. Use `next_cursor`/`prev_cursor` da resposta para navegar;
+    o total só é calculado com `with_total=true`, no modo `count_mode`
+    (exact, cached ou estimate).
+    Exemplo:
+      /professores/listar-professores-cursor?limit=20&sort=nome
+    """
+    try:
+        page = await ProfessorService.list_page(
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            fields=campos,
+        )
+        return json_response(
+            CursorPage[ProfessorResponse],
+            dict(
+                limit=limit,
+                next_cursor=page.next_cursor,
+                prev_cursor=page.prev_cursor,
+                total=page.total,
+                total_mode=page.total_mode,
+                results=(
+                    page.rows
+                    if campos is not None
+                    else [await ProfessorService.response(x) for x in page.rows]
+                ),
+            ),
+            etag,
+            validate=campos is None,
+        )
+    except Exception as e:
+        await error_500(e)
+
+
+@router.get("/autocomplete-professores", response_model=List[NomeSugestao])
+async def autocomplete_professores(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(BUSCA_LIMIT, ge=1, le=BUSCA_MAX_LIMIT),
+):
+    """
+    Sugestões por nome, sem acento e sem diferenciar maiúsculas: primeiro os
+    nomes que começam com `q`, depois os que têm palavras começando por cada
+    palavra de `q`. Servido por um índice em memória (sem ir ao banco).
+    Exemplo:
+      /professores/autocomplete-professores?q=sil&limit=10
+    """
+    try:
+        achados = await name_index.search(Professor, q, limit)
+        return [NomeSugestao(id=id_, nome=nome) for id_, nome in achados]
     except Exception as e:
         await error_500(e)
 
@@ -1,8 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api import alunos, cursos, disciplinas, professores
+from app.api import (alunos, cursos, disciplinas, estatisticas, historicos,
+                     matriculas, metricas, professores)
+from app.services.versioning import bump_after_commit
 
-api_router = APIRouter()
+# versões das tabelas (ETag) incrementadas de novo após o commit das escritas
+api_router = APIRouter(dependencies=[Depends(bump_after_commit)])
 
 api_router.include_router(cursos.router, prefix="/cursos", tags=["cursos"])
 
@@ -15,3 +18,13 @@ api_router.include_router(alunos.router, prefix="/alunos", tags=["alunos"])
 api_router.include_router(
     disciplinas.router, prefix="/disciplinas", tags=["disciplinas"]
 )
+
+api_router.include_router(historicos.router, prefix="/historicos", tags=["historicos"])
+
+api_router.include_router(matriculas.router, prefix="/matriculas", tags=["matriculas"])
+
+api_router.include_router(
+    estatisticas.router, prefix="/estatisticas", tags=["estatisticas"]
+)
+
+api_router.include_router(metricas.router, prefix="/metricas", tags=["metricas"])
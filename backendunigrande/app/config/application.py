@@ -1,5 +1,6 @@
 # app/config/application.py
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -13,6 +14,8 @@ from app.api.routes import api_router
 from app.auth.utils import setup_logger
 from app.config.db import init_db, test_connection
 from app.config.settings import ALLOWED_ORIGINS, OPENAPI_SCHEMA
+from app.services.admissao import fila_matriculas
+from app.services.busca import name_index
 
 logger = setup_logger()
 ALLOWED_HOSTS = [
@@ -27,11 +30,14 @@ ALLOWED_HOSTS = [
 async def lifespan(app: FastAPI):
     logger.info("Starting up...")
 
+    orm = None
     if await test_connection():
         logger.info(
             "Conexão com o banco de dados bem-sucedida. Inicializando o banco..."
         )
-        init_db(app)
+        orm = await init_db(app)
+        # índice de nomes do autocomplete montado em segundo plano
+        app.state.name_index_warmup = asyncio.create_task(name_index.warm())
     else:
         logger.error(
             "Falha ao conectar com o banco de dados. Não será possível inicializar o banco."
@@ -40,6 +46,11 @@ async def lifespan(app: FastAPI):
     yield
 
     logger.info("Shutting down...")
+    # pedidos já aceitos na fila de matrículas são gravados antes de sair
+    await fila_matriculas.join()
+    await fila_matriculas.stop()
+    if orm is not None:
+        await orm.close_orm()
 
 
 def create_application() -> FastAPI:
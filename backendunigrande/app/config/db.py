@@ -1,11 +1,15 @@
 import logging
 import os
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from tortoise import Tortoise, run_async
+from tortoise.backends.base.config_generator import expand_db_url
 from tortoise.contrib.fastapi import RegisterTortoise
 
+from app.config.settings import Settings, get_settings
+
 # Carrega as variáveis de ambiente do arquivo .env
 load_dotenv()
 
@@ -14,25 +18,47 @@ log = logging.getLogger("uvicorn")
 # Define a URL base com base no ambiente
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-TORTOISE_ORM = {
-    "connections": {"default": DATABASE_URL},
-    "apps": {
-        "models": {
-            "models": ["app.models.tortoise", "aerich.models"],
-            "default_connection": "default",
-        },
-    },
-}
+
+def db_config(
+    models: List[str],
+    db_url: Optional[str] = DATABASE_URL,
+    settings: Optional[Settings] = None,
+) -> dict:
+    """
+    Configuração do Tortoise para `db_url`. No Postgres, o pool vem de
+    `Settings` (db_pool_*, db_statement_cache_size, db_command_timeout) e o
+    engine é o de app/services/pool.py (asyncpg com métricas do pool);
+    outros bancos (sqlite dos testes) ficam como na URL.
+    """
+    connection = expand_db_url(db_url) if db_url else db_url
+    if connection and connection["engine"] == "tortoise.backends.asyncpg":
+        settings = settings or get_settings()
+        connection["engine"] = "app.services.pool"
+        connection["credentials"].update(
+            minsize=settings.db_pool_min_size,
+            maxsize=settings.db_pool_max_size,
+            max_inactive_connection_lifetime=settings.db_pool_max_idle,
+            statement_cache_size=settings.db_statement_cache_size,
+            command_timeout=settings.db_command_timeout,
+        )
+    return {
+        "connections": {"default": connection},
+        "apps": {"models": {"models": models, "default_connection": "default"}},
+    }
 
 
-def init_db(app: FastAPI) -> None:
+TORTOISE_ORM = db_config(["app.models.tortoise", "aerich.models"])
+
+
+async def init_db(app: FastAPI) -> RegisterTortoise:
     """
     Função para inicializar a conexão com o banco de dados e registrar o Tortoise ORM no FastAPI.
+    Inicializa com `db_config` (pool dos Settings e engine monitorado); o
+    lifespan fecha as conexões com `close_orm()` no shutdown.
     """
-    RegisterTortoise(
+    return await RegisterTortoise(
         app,
-        db_url=DATABASE_URL,
-        modules={"models": ["app.models.tortoise"]},
+        config=db_config(["app.models.tortoise"], DATABASE_URL),
         generate_schemas=False,
     )
 
@@ -45,10 +71,7 @@ async def generate_schema() -> None:
 
     try:
         # Inicializa a conexão com o banco de dados
-        await Tortoise.init(
-            db_url=DATABASE_URL,
-            modules={"models": ["app.models.tortoise"]},
-        )
+        await Tortoise.init(config=db_config(["app.models.tortoise"], DATABASE_URL))
 
         log.info("Gerando esquema do banco de dados via Tortoise...")
 
@@ -69,8 +92,7 @@ async def test_connection() -> bool:
     try:
         # Teste de conexão
         await Tortoise.init(
-            db_url=DATABASE_URL,
-            modules={"models": ["app.models.tortoise", "aerich.models"]},
+            config=db_config(["app.models.tortoise", "aerich.models"], DATABASE_URL)
         )
         log.info("Conexão bem-sucedida!")
         return True
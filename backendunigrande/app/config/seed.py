@@ -0,0 +1,370 @@
+"""
+Carga em massa das tabelas de apoio (professores, cursos, alunos, disciplinas)
+a partir dos scripts `scripts-bd/*.sql` (um `insert into` por linha) ou de CSVs
+equivalentes (cabeçalho com os nomes das colunas, arquivo nomeado pela tabela).
+
+As FKs e as pks já existentes são validadas por conjunto, com poucas consultas
+`IN`, antes de gravar; a gravação é feita numa única transação, em ordem de
+dependência, com `COPY` (asyncpg `copy_records_to_table`) no Postgres e
+`bulk_create` em lotes no SQLite. Linhas cuja pk já existe são puladas, então
+rodar de novo a mesma carga não duplica nada.
+
+Uso (a partir de backendunigrande/):
+    python -m app.config.seed ../scripts-bd
+    python -m app.config.seed alunos_2026.csv --db-url sqlite://seed.db --create-schema
+
+Os caches em memória da API (contagens, tabelas de referência, ETags) expiram
+pelo TTL; reinicie a API se a carga precisar aparecer imediatamente.
+"""
+
+import argparse
+import asyncio
+import csv
+import re
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import (Any, Dict, Iterable, List, NamedTuple, Optional, Sequence,
+                    Set, Tuple, Type)
+
+from tortoise import Tortoise, fields
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
+
+from app.config.db import DATABASE_URL
+from app.models.unigrande import Aluno, Curso, Disciplina, Professor
+
+# ordem de gravação: cada tabela só depende das anteriores
+LOAD_ORDER: Tuple[Type[Model], ...] = (Professor, Curso, Aluno, Disciplina)
+
+# (coluna, tabela referenciada) validadas antes da carga
+FOREIGN_KEYS: Dict[Type[Model], Tuple[Tuple[str, Type[Model]], ...]] = {
+    Curso: (("coordenador_id", Professor),),
+    Aluno: (("curso_id", Curso),),
+}
+
+# chaves por consulta `IN` na validação (abaixo do limite de parâmetros do asyncpg)
+LOOKUP_CHUNK_SIZE = 5000
+
+# linhas por INSERT no caminho SQLite
+SQLITE_BATCH_SIZE = 1000
+
+_MODELS_BY_TABLE = {model._meta.db_table: model for model in LOAD_ORDER}
+
+
+class Dataset(NamedTuple):
+    model: Type[Model]
+    columns: List[str]
+    rows: List[tuple]
+    source: str
+
+
+class LoadReport(NamedTuple):
+    table: str
+    loaded: int
+    skipped: int
+    rejected: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.loaded / self.seconds if self.seconds else 0.0
+
+
+# =========================
+# Leitura dos arquivos
+# =========================
+_INSERT_RE = re.compile(
+    r"insert\s+into\s+(\w+)\s*\(([^)]*)\)\s*values\s*\(", re.IGNORECASE
+)
+# um valor da lista VALUES seguido do separador: 'texto' (com '' escapado),
+# to_date('...', 'formato'), null ou número
+_VALUE_RE = re.compile(
+    r"""\s*(?:
+        '(?P<text>(?:[^']|'')*)'
+      | to_date\(\s*'(?P<date>[^']*)'\s*,\s*'(?P<fmt>[^']*)'\s*\)
+      | (?P<null>null)
+      | (?P<number>[-+]?(?:\d+(?:\.\d*)?|\.\d+))
+    )\s*(?P<sep>[,)])""",
+    re.IGNORECASE | re.VERBOSE,
+)
+# formatos do to_date (Oracle/Postgres) usados nos scripts
+_DATE_TOKENS = {"dd": "%d", "mm": "%m", "yyyy": "%Y"}
+
+
+def _to_date(value: str, fmt: str) -> date:
+    strftime = re.sub(r"yyyy|dd|mm", lambda m: _DATE_TOKENS[m.group(0)], fmt.lower())
+    return datetime.strptime(value, strftime).date()
+
+
+def _model_for(table: str, source: str) -> Type[Model]:
+    model = _MODELS_BY_TABLE.get(table.lower())
+    if model is None:
+        raise ValueError(f"{source}: tabela não suportada pela carga: {table}.")
+    return model
+
+
+def parse_sql(path: Path) -> List[Dataset]:
+    """
+    Lê um script de `insert into tabela (colunas) values (...)`, um por comando.
+    Valores vêm como texto/número sem conversão (ver `_coerce_rows`), exceto
+    `to_date`, que já vira `date`.
+    """
+    text = path.read_text(encoding="utf-8")
+    datasets: Dict[Tuple[str, tuple], Dataset] = {}
+    pos = 0
+    while match := _INSERT_RE.search(text, pos):
+        table = match.group(1)
+        columns = [c.strip().lower() for c in match.group(2).split(",")]
+        row, pos = [], match.end()
+        while True:
+            value = _VALUE_RE.match(text, pos)
+            if value is None:
+                line = text.count("\n", 0, pos) + 1
+                raise ValueError(f"{path.name}:{line}: valor não reconhecido.")
+            pos = value.end()
+            if value.group("text") is not None:
+                row.append(value.group("text").replace("''", "'"))
+            elif value.group("date") is not None:
+                row.append(_to_date(value.group("date"), value.group("fmt")))
+            elif value.group("null") is not None:
+                row.append(None)
+            else:
+                row.append(value.group("number"))
+            if value.group("sep") == ")":
+                break
+        if len(row) != len(columns):
+            line = text.count("\n", 0, match.start()) + 1
+            raise ValueError(f"{path.name}:{line}: número de valores ≠ de colunas.")
+        key = (table.lower(), tuple(columns))
+        if key not in datasets:
+            datasets[key] = Dataset(
+                _model_for(table, path.name), columns, [], path.name
+            )
+        datasets[key].rows.append(tuple(row))
+    return list(datasets.values())
+
+
+def parse_csv(path: Path) -> List[Dataset]:
+    """
+    Lê um CSV com cabeçalho; a tabela é a última palavra do nome do arquivo
+    (`professores.csv`, `1 - professores.csv`). Campos vazios viram NULL.
+    """
+    table = re.search(r"(\w+)$", path.stem).group(1)
+    with path.open(newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        columns = [c.strip().lower() for c in next(reader)]
+        rows = [tuple(v if v != "" else None for v in row) for row in reader if row]
+    return [Dataset(_model_for(table, path.name), columns, rows, path.name)]
+
+
+def read_datasets(paths: Iterable[Path]) -> List[Dataset]:
+    """Lê arquivos .sql/.csv (ou diretórios com eles) e tipa os valores."""
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                sorted(p for p in path.iterdir() if p.suffix in (".sql", ".csv"))
+            )
+        else:
+            files.append(path)
+
+    datasets = []
+    for path in files:
+        parsed = parse_csv(path) if path.suffix == ".csv" else parse_sql(path)
+        datasets.extend(_coerce_rows(ds) for ds in parsed)
+    return datasets
+
+
+def _converter(model: Type[Model], column: str, source: str):
+    field = model._meta.fields_map.get(column)
+    if field is None:
+        raise ValueError(
+            f"{source}: coluna desconhecida em {model._meta.db_table}: {column}."
+        )
+    if isinstance(field, fields.IntField):
+        return int
+    if isinstance(field, fields.DecimalField):
+        return Decimal
+    if isinstance(field, fields.DateField):
+        return lambda v: v if isinstance(v, date) else date.fromisoformat(v)
+    return str
+
+
+def _coerce_rows(ds: Dataset) -> Dataset:
+    converters = [_converter(ds.model, c, ds.source) for c in ds.columns]
+    rows = [
+        tuple(None if v is None else conv(v) for conv, v in zip(converters, row))
+        for row in ds.rows
+    ]
+    return ds._replace(rows=rows)
+
+
+# =========================
+# Validação por conjunto
+# =========================
+async def _existing(model: Type[Model], keys: Set[Any]) -> Set[Any]:
+    """Quais `keys` já existem como pk de `model`, em consultas `IN` por blocos."""
+    pk = model._meta.pk_attr
+    keys, found = list(keys), set()
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        end = start + LOOKUP_CHUNK_SIZE
+        chunk = keys[start:end]
+        found.update(
+            await model.filter(**{f"{pk}__in": chunk}).values_list(pk, flat=True)
+        )
+    return found
+
+
+async def _known_fks(model, columns, rows, loaded_pks) -> Dict[int, Set[Any]]:
+    """
+    Para cada FK de `model` presente em `columns`: índice da coluna → valores
+    que existem (gravados por esta carga ou já no banco).
+    """
+    known = {}
+    for column, parent in FOREIGN_KEYS.get(model, ()):
+        if column not in columns:
+            continue
+        index = columns.index(column)
+        wanted = {row[index] for row in rows} - {None}
+        from_run = loaded_pks.get(parent, set())
+        known[index] = (wanted & from_run) | await _existing(parent, wanted - from_run)
+    return known
+
+
+def _reject_reason(row, pk_index, seen, fk_known, columns) -> Optional[str]:
+    if row[pk_index] in seen:
+        return f"{columns[pk_index]}={row[pk_index]} repetida na carga"
+    for index, known in fk_known.items():
+        if row[index] is not None and row[index] not in known:
+            return f"{columns[index]}={row[index]} não encontrado"
+    return None
+
+
+async def validate(datasets: Sequence[Dataset]):
+    """
+    Separa, por tabela e na ordem de carga, as linhas a gravar.
+    - pk já existente no banco: pulada (carga idempotente);
+    - pk repetida na própria carga: rejeitada (vale a primeira);
+    - FK que não está no banco nem nesta carga: rejeitada.
+    Retorna `{model: (colunas, linhas_aceitas, puladas, rejeitadas)}` e o
+    motivo de cada rejeição.
+    """
+    plan: Dict[Type[Model], Tuple[List[str], List[tuple], int, int]] = {}
+    loaded_pks: Dict[Type[Model], Set[Any]] = {}
+    problems: List[str] = []
+
+    for model in LOAD_ORDER:
+        parts = [ds for ds in datasets if ds.model is model]
+        if not parts:
+            continue
+        columns = parts[0].columns
+        if any(ds.columns != columns for ds in parts):
+            raise ValueError(
+                f"{model._meta.db_table}: arquivos com colunas diferentes na mesma carga."
+            )
+        rows = [row for ds in parts for row in ds.rows]
+        pk_index = columns.index(model._meta.pk_attr)
+        existing = await _existing(model, {row[pk_index] for row in rows})
+        fk_known = await _known_fks(model, columns, rows, loaded_pks)
+
+        accepted, skipped, rejected, seen = [], 0, 0, set()
+        for row in rows:
+            if row[pk_index] in existing:
+                skipped += 1
+                continue
+            reason = _reject_reason(row, pk_index, seen, fk_known, columns)
+            if reason:
+                rejected += 1
+                problems.append(f"{model._meta.db_table}: {reason}")
+                continue
+            seen.add(row[pk_index])
+            accepted.append(row)
+
+        loaded_pks[model] = seen | existing
+        plan[model] = (columns, accepted, skipped, rejected)
+    return plan, problems
+
+
+# =========================
+# Gravação
+# =========================
+async def load(datasets: Sequence[Dataset]) -> Tuple[List[LoadReport], List[str]]:
+    """
+    Valida e grava os datasets numa única transação, na ordem de `LOAD_ORDER`.
+    Postgres: COPY via asyncpg; outros bancos (SQLite nos testes): `bulk_create`.
+    """
+    plan, problems = await validate(datasets)
+    reports = []
+    async with in_transaction() as conn:
+        postgres = conn.capabilities.dialect == "postgres"
+        for model, (columns, rows, skipped, rejected) in plan.items():
+            start = time.perf_counter()
+            if rows and postgres:
+                async with conn.acquire_connection() as raw:
+                    await raw.copy_records_to_table(
+                        model._meta.db_table, records=rows, columns=columns
+                    )
+            elif rows:
+                await model.bulk_create(
+                    [model(**dict(zip(columns, row))) for row in rows],
+                    batch_size=SQLITE_BATCH_SIZE,
+                    using_db=conn,
+                )
+            reports.append(
+                LoadReport(
+                    model._meta.db_table,
+                    len(rows),
+                    skipped,
+                    rejected,
+                    time.perf_counter() - start,
+                )
+            )
+    return reports, problems
+
+
+async def run(db_url: str, paths: List[Path], create_schema: bool = False) -> None:
+    # o Tortoise precisa estar iniciado para os models conhecerem as colunas de FK
+    await Tortoise.init(db_url=db_url, modules={"models": ["app.models.tortoise"]})
+    try:
+        if create_schema:
+            await Tortoise.generate_schemas(safe=True)
+        started = time.perf_counter()
+        datasets = read_datasets(paths)
+        parsed = sum(len(ds.rows) for ds in datasets)
+        print(f"{parsed} linhas lidas em {time.perf_counter() - started:.2f}s")
+        reports, problems = await load(datasets)
+    finally:
+        await Tortoise.close_connections()
+
+    print(
+        f"{'tabela':<12} {'gravadas':>9} {'puladas':>8} {'rejeit.':>8} {'linhas/s':>12}"
+    )
+    for r in reports:
+        print(
+            f"{r.table:<12} {r.loaded:>9} {r.skipped:>8} {r.rejected:>8}"
+            f" {r.rows_per_second:>12,.0f}"
+        )
+    total = sum(r.loaded for r in reports)
+    elapsed = time.perf_counter() - started
+    print(f"total: {total} linhas em {elapsed:.2f}s ({total / elapsed:,.0f} linhas/s)")
+    for problem in problems[:20]:
+        print(f"  rejeitada: {problem}")
+    if len(problems) > 20:
+        print(f"  ... e mais {len(problems) - 20} rejeitadas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "paths", nargs="+", type=Path, help="arquivos .sql/.csv ou diretórios"
+    )
+    parser.add_argument("--db-url", default=DATABASE_URL)
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="cria as tabelas que faltarem (útil com SQLite)",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.db_url, args.paths, args.create_schema))
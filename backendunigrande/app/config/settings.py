@@ -1,10 +1,11 @@
 import logging
 import os
 from functools import lru_cache
+from typing import Optional
 
 from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer
-from pydantic import AnyUrl
+from pydantic import AnyUrl, Field, model_validator
 from pydantic_settings import BaseSettings
 
 # Carrega as variáveis de ambiente do arquivo .env
@@ -23,6 +24,23 @@ class Settings(BaseSettings):
     environment: str = "dev"
     testing: bool = 0
     database_url: AnyUrl = None
+    # pool de conexões do Postgres (asyncpg), por worker: max_size x workers
+    # precisa caber no max_connections do servidor (ver app/config/db.py)
+    db_pool_min_size: int = Field(1, ge=0)
+    db_pool_max_size: int = Field(5, ge=1)
+    # segundos até fechar uma conexão ociosa do pool (0 = nunca)
+    db_pool_max_idle: float = Field(300.0, ge=0)
+    # prepared statements em cache por conexão (0 atrás de pgbouncer em
+    # modo transaction)
+    db_statement_cache_size: int = Field(100, ge=0)
+    # segundos por comando SQL (None = sem limite)
+    db_command_timeout: Optional[float] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def _pool_sizes(self):
+        if self.db_pool_min_size > self.db_pool_max_size:
+            raise ValueError("db_pool_min_size maior que db_pool_max_size")
+        return self
 
 
 @lru_cache()
@@ -1,6 +1,6 @@
-from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
-                                  Matricula, Matriz, PeriodoLetivo, Professor,
-                                  Turma)
+from app.models.unigrande import (Aluno, Curso, Disciplina, Estatistica,
+                                  Historico, Matricula, Matriz, PeriodoLetivo,
+                                  Professor, Turma)
 
 __all__ = [
     "Curso",
@@ -12,4 +12,5 @@ __all__ = [
     "Matricula",
     "Turma",
     "Historico",
+    "Estatistica",
 ]
@@ -104,6 +104,8 @@ class Turma(models.Model):
         "models.Professor", related_name="turmas", null=True
     )
     vagas = fields.IntField(default=0)
+    # vagas - matrículas; só muda por UPDATE condicional (ver MatriculaService)
+    vagas_disponiveis = fields.IntField(default=0)
 
     class Meta:
         table = "turmas"
@@ -123,11 +125,15 @@ class Aluno(models.Model):
     total_creditos = fields.IntField()
     data_nascimento = fields.DateField(null=True)
     mgp = fields.DecimalField(max_digits=5, decimal_places=2, null=True)
+    # acumuladores da MGP, mantidos por app.services.mgp
+    mgp_pontos = fields.DecimalField(max_digits=12, decimal_places=2, default=0)
+    mgp_creditos = fields.IntField(default=0)
     curso = fields.ForeignKeyField("models.Curso", related_name="alunos")
 
     class Meta:
         table = "alunos"
-        indexes = ("nome", "curso_id")
+        # (nome, curso_id) não serve a filtros só por curso: índice próprio
+        indexes = (("nome", "curso_id"), ("curso_id",))
 
 
 class Historico(models.Model):
@@ -172,3 +178,43 @@ class Matricula(models.Model):
         table = "matriculas"
         unique_together = (("aluno", "turma"),)
         indexes = (("aluno_id", "turma_id"),)
+
+
+# --------- ESTATÍSTICAS ---------
+class Estatistica(models.Model):
+    """
+    ESTATISTICAS (contadores de históricos e matrículas por período/curso/disciplina)
+    """
+
+    id = fields.IntField(pk=True)
+    periodo_letivo = fields.ForeignKeyField(
+        "models.PeriodoLetivo", related_name="estatisticas"
+    )
+    curso = fields.ForeignKeyField("models.Curso", related_name="estatisticas")
+    disciplina = fields.ForeignKeyField(
+        "models.Disciplina", related_name="estatisticas"
+    )
+    # professor da turma do período/curso/disciplina, se houver
+    professor = fields.ForeignKeyField(
+        "models.Professor",
+        related_name="estatisticas",
+        null=True,
+        on_delete=fields.SET_NULL,
+    )
+    horas_obrig = fields.IntField(default=0)  # cópia de Disciplina.horas_obrig
+    # históricos (curso = curso do aluno)
+    historicos = fields.IntField(default=0)
+    aprovados = fields.IntField(default=0)
+    com_media = fields.IntField(default=0)
+    soma_medias = fields.DecimalField(max_digits=14, decimal_places=2, default=0)
+    com_faltas = fields.IntField(default=0)
+    soma_faltas = fields.IntField(default=0)
+    # matrículas (curso = curso da turma)
+    matriculas = fields.IntField(default=0)
+    faltas_matriculas = fields.IntField(default=0)
+
+    class Meta:
+        table = "estatisticas"
+        unique_together = (("periodo_letivo", "curso", "disciplina"),)
+        # a unique já cobre os filtros por período letivo
+        indexes = (("curso_id",), ("disciplina_id",), ("professor_id",))
@@ -3,9 +3,9 @@ from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
-from typing import List, Literal, Optional
+from typing import Any, Dict, Generic, List, Literal, Optional, TypeVar
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # =========================
@@ -37,6 +37,12 @@ class PeriodoLetivoSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class NomeSugestao(BaseModel):
+    # resultado do autocomplete por nome (id = matrícula no caso de alunos)
+    id: int
+    nome: str
+
+
 class AlunoSummary(BaseModel):
     matricula: int
     nome: str
@@ -49,6 +55,24 @@ class TurmaSummary(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# =========================
+# Paginação por cursor (keyset)
+# =========================
+T = TypeVar("T")
+
+# como o total foi obtido: COUNT(*), COUNT(*) em cache ou estimativa do planner
+CountModeLiteral = Literal["exact", "cached", "estimate"]
+
+
+class CursorPage(BaseModel, Generic[T]):
+    limit: int  # limite solicitado
+    next_cursor: Optional[str] = None  # None = última página
+    prev_cursor: Optional[str] = None  # None = primeira página
+    total: Optional[int] = None  # só calculado com `with_total=true`
+    total_mode: Optional[CountModeLiteral] = None
+    results: List[T]
+
+
 # =========================
 # PeriodoLetivo
 # =========================
@@ -176,6 +200,30 @@ class MatrizResponse(MatrizBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProgressoCurricular(BaseModel):
+    # situação do aluno frente à matriz do curso (listas de disciplina_id)
+    aluno: AlunoSummary
+    curso_id: int
+    semestres_cursados: int  # períodos letivos com algum histórico
+    total: int  # disciplinas da matriz
+    concluidas: List[int]  # aprovadas (AP)
+    pendentes: List[int]  # ainda não aprovadas
+    atrasadas: List[int]  # pendentes de período da matriz já cursado
+    percentual: float  # concluídas / total, em %
+
+
+class EstatisticaGrupo(BaseModel):
+    # indicadores de um curso/disciplina/professor/período (ver app.services.estatisticas)
+    id: int  # id do curso, disciplina, professor ou período letivo
+    historicos: int
+    aprovados: int
+    taxa_aprovacao: Optional[float]  # aprovados / históricos, em %
+    media_final: Optional[Decimal]  # média das médias finais lançadas
+    taxa_faltas: Optional[float]  # faltas / carga horária dos históricos, em %
+    matriculas: int  # matrículas em turmas (período em andamento)
+    taxa_faltas_em_curso: Optional[float]  # idem, sobre as matrículas, em %
+
+
 # =========================
 # Turma (oferta)
 # =========================
@@ -201,6 +249,7 @@ class TurmaUpdate(BaseModel):
 
 class TurmaResponse(TurmaBase):
     id: int
+    vagas_disponiveis: int
     periodo_letivo: PeriodoLetivoSummary
     curso: CursoSummary
     disciplina: DisciplinaSummary
@@ -211,11 +260,11 @@ class TurmaResponse(TurmaBase):
 # =========================
 # Aluno
 # =========================
+# total_creditos e mgp são derivados dos históricos (app.services.mgp):
+# aparecem nas respostas, mas não são aceitos na escrita
 class AlunoBase(BaseModel):
     nome: str
-    total_creditos: int
     data_nascimento: Optional[date] = None
-    mgp: Optional[Decimal] = None
     curso_id: int
 
 
@@ -225,13 +274,16 @@ class AlunoCreate(AlunoBase):
 
 class AlunoUpdate(BaseModel):
     nome: Optional[str] = None
-    total_creditos: Optional[int] = None
     data_nascimento: Optional[date] = None
-    mgp: Optional[Decimal] = None
     curso_id: Optional[int] = None
 
 
-class AlunoResponse(AlunoBase):
+class AlunoResponse(BaseModel):
+    nome: str
+    total_creditos: int
+    data_nascimento: Optional[date] = None
+    mgp: Optional[Decimal] = None
+    curso_id: int
     matricula: int
     curso: CursoSummary
     model_config = ConfigDict(from_attributes=True)
@@ -239,11 +291,35 @@ class AlunoResponse(AlunoBase):
 
 class AlunoListPaginated(BaseModel):
     total: int  # total de alunos na base
+    total_mode: CountModeLiteral  # modo que produziu o total
     limit: int  # limite solicitado
     offset: int  # deslocamento solicitado
     results: List[AlunoResponse]
 
 
+# limite de linhas por lote (mantém o `IN (...)` das validações abaixo
+# do limite de parâmetros do driver)
+ALUNO_BULK_MAX_ROWS = 10_000
+
+
+class AlunoBulkCreate(BaseModel):
+    alunos: List[AlunoCreate] = Field(max_length=ALUNO_BULK_MAX_ROWS)
+
+
+class AlunoBulkRowResult(BaseModel):
+    index: int  # posição da linha no lote enviado
+    matricula: int
+    status: Literal["accepted", "rejected"]
+    detail: Optional[str] = None  # motivo da rejeição
+
+
+class AlunoBulkCreateResult(BaseModel):
+    total: int  # linhas recebidas
+    accepted: int  # linhas inseridas
+    rejected: int  # linhas rejeitadas
+    results: List[AlunoBulkRowResult]
+
+
 # =========================
 # Histórico (resultado final por PL/disciplina)
 # =========================
@@ -280,6 +356,30 @@ class HistoricoResponse(HistoricoBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class HistoricoEscolarItem(BaseModel):
+    id: int
+    disciplina: DisciplinaSummary
+    situacao: SituacaoLiteral
+    media_final: Optional[Decimal] = None
+    faltas: Optional[int] = None
+
+
+class HistoricoEscolarPeriodo(BaseModel):
+    periodo_letivo: PeriodoLetivoSummary
+    disciplinas: List[HistoricoEscolarItem]
+    media_periodo: Optional[Decimal] = None  # ponderada pelos créditos, no período
+    media_acumulada: Optional[Decimal] = None  # ponderada, até este período
+    creditos_periodo: int  # créditos integralizados no período
+    creditos_acumulados: int
+
+
+class HistoricoEscolar(BaseModel):
+    aluno: AlunoSummary
+    periodos: List[HistoricoEscolarPeriodo]  # em ordem de (ano, semestre)
+    mgp: Optional[Decimal] = None  # média acumulada do último período
+    total_creditos: int  # créditos integralizados
+
+
 # =========================
 # Matrícula (lançamentos por turma)
 # =========================
@@ -314,3 +414,68 @@ class MatriculaResponse(MatriculaBase):
     aluno: AlunoSummary
     turma: TurmaSummary
     model_config = ConfigDict(from_attributes=True)
+
+
+# limite de linhas por pauta (uma turma tem no máximo algumas centenas de alunos)
+PAUTA_MAX_ROWS = 1_000
+
+
+class PautaLinha(BaseModel):
+    aluno_id: int  # Aluno.matricula, precisa estar matriculado na turma
+    nota_01: Optional[Decimal] = None
+    nota_02: Optional[Decimal] = None
+    nota_03: Optional[Decimal] = None
+    faltas_01: Optional[int] = None
+    faltas_02: Optional[int] = None
+    faltas_03: Optional[int] = None
+
+
+class PautaTurma(BaseModel):
+    # só os campos enviados em cada linha são alterados
+    lancamentos: List[PautaLinha] = Field(min_length=1, max_length=PAUTA_MAX_ROWS)
+
+
+class PautaTurmaResult(BaseModel):
+    turma_id: int
+    atualizadas: int  # matrículas alteradas
+    campos: List[str]  # colunas gravadas no UPDATE em lote
+
+
+class TicketMatricula(BaseModel):
+    # pedido de matrícula recebido pela fila de admissão
+    ticket: str
+    status: Literal["pendente", "aceita", "recusada"]
+    turma_id: int
+    aluno_id: int
+    matricula_id: Optional[int] = None  # preenchido quando aceita
+    status_code: Optional[int] = None  # HTTP equivalente da recusa (404/409/500)
+    detail: Optional[str] = None  # motivo da recusa
+
+
+# =========================
+# Expansão (?expand=)
+# =========================
+class _Expandido(BaseModel):
+    # relações pedidas em `expand`, cada uma com o *Response completo
+    # (lista nas relações "para muitos"); aninhadas no `expanded` do item
+    expanded: Optional[Dict[str, Any]] = None
+
+
+class CursoExpandido(CursoResponse, _Expandido):
+    pass
+
+
+class AlunoExpandido(AlunoResponse, _Expandido):
+    pass
+
+
+class ProfessorExpandido(ProfessorResponse, _Expandido):
+    pass
+
+
+class DisciplinaExpandido(DisciplinaResponse, _Expandido):
+    pass
+
+
+class MatriculaExpandido(MatriculaResponse, _Expandido):
+    pass
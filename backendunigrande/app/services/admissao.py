@@ -0,0 +1,211 @@
+# app/services/admissao.py
+"""
+Fila de admissão para a abertura das matrículas.
+
+Os pedidos entram numa fila em memória limitada e recebem um ticket na hora;
+um número fixo de workers (bem abaixo do tamanho do pool do Tortoise) consome a
+fila em lotes, agrupa por turma e grava cada grupo com
+`MatriculaService.create_lote_turma` (uma transação por turma). Com a fila
+cheia, o pedido é recusado com 429 em vez de esperar por uma conexão.
+
+A fila e os tickets são por processo (a API roda com um worker).
+"""
+from __future__ import annotations
+
+import asyncio
+import secrets
+import statistics
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional
+
+from fastapi import HTTPException, status
+
+from app.auth.utils import setup_logger
+from app.schemas.unigrande import MatriculaCreate, TicketMatricula
+from app.services.cache import TTLCache
+from app.services.unigrande import MatriculaService
+
+logger = setup_logger()
+
+FILA_MAXSIZE = 5_000  # pedidos aguardando; acima disso, 429
+FILA_WORKERS = 4  # conexões usadas pela fila ao mesmo tempo
+FILA_BATCH_SIZE = 200  # pedidos retirados da fila por worker de uma vez
+FILA_RETRY_AFTER_SECONDS = 5
+TICKET_TTL_SECONDS = 900.0  # por quanto tempo o resultado pode ser consultado
+ESPERAS_AMOSTRA = 1_000  # últimas esperas usadas nas métricas
+
+
+class Pedido(NamedTuple):
+    ticket: str
+    payload: MatriculaCreate
+    enfileirado_em: float
+
+
+class FilaMatriculas:
+    def __init__(
+        self,
+        maxsize: int = FILA_MAXSIZE,
+        workers: int = FILA_WORKERS,
+        batch_size: int = FILA_BATCH_SIZE,
+    ):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.batch_size = batch_size
+        self.tickets = TTLCache(maxsize=maxsize * 20, ttl=TICKET_TTL_SECONDS)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._esperas: Deque[float] = deque(maxlen=ESPERAS_AMOSTRA)
+        self._contadores: Dict[str, int] = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # ciclo de vida
+    # ------------------------------------------------------------------
+    def _ensure_started(self) -> asyncio.Queue:
+        # sobe os workers no primeiro pedido, no loop da aplicação
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._loop = loop
+            self._tasks = [
+                loop.create_task(self._worker(), name=f"fila-matriculas-{i}")
+                for i in range(self.workers)
+            ]
+        return self._queue
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    async def join(self) -> None:
+        """Espera a fila esvaziar (testes e desligamento)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    # ------------------------------------------------------------------
+    # entrada
+    # ------------------------------------------------------------------
+    def submit(self, payload: MatriculaCreate) -> TicketMatricula:
+        """Enfileira o pedido e devolve o ticket; 429 se a fila estiver cheia."""
+        queue = self._ensure_started()
+        ticket = TicketMatricula(
+            ticket=secrets.token_urlsafe(12),
+            status="pendente",
+            turma_id=payload.turma_id,
+            aluno_id=payload.aluno_id,
+        )
+        try:
+            queue.put_nowait(Pedido(ticket.ticket, payload, time.monotonic()))
+        except asyncio.QueueFull:
+            self._contadores["recusados_fila_cheia"] += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Fila de matrículas cheia, tente novamente.",
+                headers={"Retry-After": str(FILA_RETRY_AFTER_SECONDS)},
+            )
+        self._contadores["enfileirados"] += 1
+        self.tickets.set(ticket.ticket, ticket)
+        return ticket
+
+    def ticket(self, ticket: str) -> Optional[TicketMatricula]:
+        return self.tickets.get(ticket)
+
+    # ------------------------------------------------------------------
+    # processamento
+    # ------------------------------------------------------------------
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            lote = [await queue.get()]
+            while len(lote) < self.batch_size and not queue.empty():
+                lote.append(queue.get_nowait())
+            try:
+                await self._processar(lote)
+            except Exception as e:  # o worker não pode morrer
+                logger.exception("Falha ao processar lote da fila de matrículas")
+                for pedido in lote:
+                    self._concluir(
+                        pedido, HTTPException(status_code=500, detail=str(e))
+                    )
+            finally:
+                for _ in lote:
+                    queue.task_done()
+
+    async def _processar(self, lote: List[Pedido]) -> None:
+        agora = time.monotonic()
+        por_turma: Dict[int, List[Pedido]] = defaultdict(list)
+        for pedido in lote:
+            self._esperas.append(agora - pedido.enfileirado_em)
+            por_turma[pedido.payload.turma_id].append(pedido)
+
+        # cada turma tem a sua transação: a falha de uma não recusa os pedidos
+        # já gravados nas anteriores nem os das turmas seguintes
+        for turma_id, pedidos in por_turma.items():
+            try:
+                results = await MatriculaService.create_lote_turma(
+                    turma_id, [p.payload for p in pedidos]
+                )
+            except HTTPException as e:
+                results = [e] * len(pedidos)
+            except Exception as e:
+                logger.exception(
+                    "Falha ao processar a turma %s da fila de matrículas", turma_id
+                )
+                results = [HTTPException(status_code=500, detail=str(e))] * len(pedidos)
+            for pedido, erro in zip(pedidos, results):
+                self._concluir(pedido, erro)
+
+    def _concluir(self, pedido: Pedido, erro: Optional[HTTPException]) -> None:
+        ticket = self.tickets.get(pedido.ticket)
+        if ticket is None or ticket.status != "pendente":
+            return
+        if erro is None:
+            self._contadores["aceitos"] += 1
+            ticket = ticket.model_copy(
+                update={"status": "aceita", "matricula_id": pedido.payload.id}
+            )
+        else:
+            self._contadores["recusados"] += 1
+            ticket = ticket.model_copy(
+                update={
+                    "status": "recusada",
+                    "status_code": erro.status_code,
+                    "detail": erro.detail,
+                }
+            )
+        self.tickets.set(pedido.ticket, ticket)
+
+    # ------------------------------------------------------------------
+    # métricas
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        esperas = sorted(self._esperas)
+        if esperas:
+            p95 = esperas[min(len(esperas) - 1, int(len(esperas) * 0.95))]
+            espera = {
+                "amostras": len(esperas),
+                "media_ms": round(statistics.fmean(esperas) * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "max_ms": round(esperas[-1] * 1000, 2),
+            }
+        else:
+            espera = {"amostras": 0}
+        return {
+            "profundidade": self._queue.qsize() if self._queue else 0,
+            "maxsize": self.maxsize,
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "enfileirados": self._contadores["enfileirados"],
+            "aceitos": self._contadores["aceitos"],
+            "recusados": self._contadores["recusados"],
+            "recusados_fila_cheia": self._contadores["recusados_fila_cheia"],
+            "espera": espera,
+        }
+
+
+fila_matriculas = FilaMatriculas()
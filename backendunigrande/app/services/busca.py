@@ -0,0 +1,280 @@
+# app/services/busca.py
+"""
+Busca por nome (autocomplete) de alunos, professores e disciplinas, sem
+acento e sem diferenciar maiúsculas, servida por um índice em memória.
+
+Para cada entidade o índice guarda:
+- os nomes normalizados em uma lista ordenada, para "nome começa com" por
+  busca binária;
+- um índice invertido token → (nome normalizado, id) ordenados, com o
+  vocabulário também ordenado, para que cada palavra da consulta case como
+  prefixo de um token ("mar sil" acha "MARIA DA SILVA"). Como as listas já
+  estão em ordem alfabética, a busca por palavras para ao achar `limit` nomes.
+  Palavras com menos de `BUSCA_MIN_PREFIXO` letras casariam com boa parte do
+  vocabulário: só filtram os candidatos das palavras maiores.
+
+O índice é montado na primeira consulta (e aquecido no startup) a partir do
+banco e mantido pelos métodos de escrita dos services. É por processo (a API
+roda com um worker); escritas feitas fora da API só aparecem após o restart.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from tortoise.models import Model
+
+from app.auth.utils import setup_logger
+from app.models.unigrande import Aluno, Disciplina, Professor
+from app.services.export import iter_chunks
+
+logger = setup_logger()
+
+BUSCA_LIMIT = 10
+BUSCA_MAX_LIMIT = 50
+BUSCA_CHUNK_SIZE = 10_000  # linhas por consulta ao montar o índice
+BUSCA_MIN_PREFIXO = 3  # letras para uma palavra gerar candidatos por token
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_FIM = "\U0010ffff"  # maior que qualquer caractere: fecha o intervalo do prefixo
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e com espaços simples: "Ângela  Sá" → "angela sa"."""
+    sem_acento = "".join(
+        c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c)
+    )
+    return " ".join(sem_acento.casefold().split())
+
+
+def tokens(texto: str) -> List[str]:
+    return _TOKEN.findall(normalizar(texto))
+
+
+def _prefix_range(itens: List, prefixo) -> Tuple[int, int]:
+    """Intervalo [ini, fim) da lista ordenada cujos itens começam com `prefixo`."""
+    return bisect_left(itens, prefixo), bisect_left(itens, prefixo + _FIM)
+
+
+class NameIndex:
+    def __init__(self):
+        self._nomes: Dict[int, str] = {}  # id → nome original
+        self._chaves: Dict[int, str] = {}  # id → nome normalizado (ordenação)
+        self._tokens: Dict[int, Tuple[str, ...]] = {}  # id → tokens do nome
+        self._por_nome: List[Tuple[str, int]] = []  # (nome normalizado, id)
+        self._postings: Dict[str, List[Tuple[str, int]]] = {}  # token → _por_nome
+        self._vocab: List[str] = []  # tokens ordenados
+
+    def __len__(self) -> int:
+        return len(self._nomes)
+
+    # ------------------------------------------------------------------
+    # manutenção
+    # ------------------------------------------------------------------
+    def add(self, id_: int, nome: str) -> None:
+        if id_ in self._nomes:
+            self.remove(id_)
+        toks = tuple(dict.fromkeys(tokens(nome)))
+        self._nomes[id_] = nome
+        self._chaves[id_] = normalizar(nome)
+        self._tokens[id_] = toks
+        entrada = (self._chaves[id_], id_)
+        insort(self._por_nome, entrada)
+        for tok in toks:
+            entradas = self._postings.get(tok)
+            if entradas is None:
+                self._postings[tok] = [entrada]
+                insort(self._vocab, tok)
+            else:
+                insort(entradas, entrada)
+
+    def remove(self, id_: int) -> None:
+        if self._nomes.pop(id_, None) is None:
+            return
+        entrada = (self._chaves.pop(id_), id_)
+        del self._por_nome[bisect_left(self._por_nome, entrada)]
+        for tok in self._tokens.pop(id_):
+            entradas = self._postings[tok]
+            del entradas[bisect_left(entradas, entrada)]
+            if not entradas:
+                del self._postings[tok]
+                del self._vocab[bisect_left(self._vocab, tok)]
+
+    def load(self, rows: List[Tuple[int, str]]) -> None:
+        """Carga inicial: ordena uma vez em vez de inserir um a um."""
+        postings: Dict[str, List[Tuple[str, int]]] = {}
+        for id_, nome in rows:
+            toks = tuple(dict.fromkeys(tokens(nome)))
+            entrada = (normalizar(nome), id_)
+            self._nomes[id_] = nome
+            self._chaves[id_] = entrada[0]
+            self._tokens[id_] = toks
+            self._por_nome.append(entrada)
+            for tok in toks:
+                postings.setdefault(tok, []).append(entrada)
+        self._por_nome.sort()
+        for entradas in postings.values():
+            entradas.sort()
+        self._postings = postings
+        self._vocab = sorted(postings)
+
+    # ------------------------------------------------------------------
+    # consulta
+    # ------------------------------------------------------------------
+    def search(self, consulta: str, limit: int = BUSCA_LIMIT) -> List[Tuple[int, str]]:
+        """
+        Até `limit` pares (id, nome): primeiro os nomes que começam com a
+        consulta, em ordem alfabética; depois os que têm, para cada palavra da
+        consulta, um token começando por ela.
+        """
+        consulta_norm = normalizar(consulta)
+        palavras = _TOKEN.findall(consulta_norm)
+        if not palavras or limit <= 0:
+            return []
+
+        ini = bisect_left(self._por_nome, (consulta_norm,))
+        fim = min(bisect_left(self._por_nome, (consulta_norm + _FIM,)), ini + limit)
+        achados = [id_ for _, id_ in self._por_nome[ini:fim]]
+        if len(achados) < limit:
+            vistos = set(achados)
+            for id_ in self._match_tokens(palavras):
+                if id_ not in vistos:
+                    vistos.add(id_)
+                    achados.append(id_)
+                    if len(achados) == limit:
+                        break
+        return [(i, self._nomes[i]) for i in achados]
+
+    def _match_tokens(self, palavras: List[str]) -> Iterator[int]:
+        # a palavra mais seletiva (menos ids) gera os candidatos, já em ordem
+        # alfabética (merge das listas dos seus tokens); as demais só filtram,
+        # olhando os tokens de cada candidato. Quem consome para no `limit`.
+        # Palavras curtas não expandem o intervalo do vocabulário: o custo
+        # segue o tamanho do resultado, não o do vocabulário.
+        melhor: Optional[Tuple[int, str, int, int]] = None
+        for palavra in palavras:
+            if len(palavra) < BUSCA_MIN_PREFIXO:
+                continue
+            ini, fim = _prefix_range(self._vocab, palavra)
+            if ini == fim:
+                return
+            # só importa saber se é menor que a melhor até aqui
+            tamanho = 0
+            for i in range(ini, fim):
+                tamanho += len(self._postings[self._vocab[i]])
+                if melhor is not None and tamanho >= melhor[0]:
+                    break
+            if melhor is None or tamanho < melhor[0]:
+                melhor = (tamanho, palavra, ini, fim)
+        if melhor is None:
+            return
+
+        _, geradora, ini, fim = melhor
+        filtros = [palavra for palavra in palavras if palavra != geradora]
+        candidatos = heapq.merge(*(self._postings[t] for t in self._vocab[ini:fim]))
+        for _, id_ in candidatos:
+            toks = self._tokens[id_]
+            if all(any(t.startswith(p) for t in toks) for p in filtros):
+                yield id_
+
+
+class NameIndexes:
+    """Um NameIndex por entidade, montado sob demanda a partir do banco."""
+
+    PKS: Dict[Type[Model], str] = {
+        Aluno: "matricula",
+        Professor: "id",
+        Disciplina: "id",
+    }
+
+    def __init__(self):
+        self._indexes: Dict[Type[Model], NameIndex] = {}
+        self._locks: Dict[Type[Model], asyncio.Lock] = {}
+        # escritas que chegam durante a montagem (id, nome; None = remoção)
+        self._pendentes: Dict[Type[Model], List[Tuple[int, Optional[str]]]] = {}
+
+    async def index(self, model: Type[Model]) -> NameIndex:
+        index = self._indexes.get(model)
+        if index is not None:
+            return index
+        lock = self._locks.setdefault(model, asyncio.Lock())
+        async with lock:
+            if model not in self._indexes:
+                pendentes = self._pendentes[model] = []
+                try:
+                    index = await self._build(model)
+                    # a leitura do banco pode não ter visto as escritas feitas
+                    # enquanto ela corria: reaplicadas em ordem, sem await
+                    # entre o replay e a publicação do índice
+                    for id_, nome in pendentes:
+                        if nome is None:
+                            index.remove(id_)
+                        else:
+                            index.add(id_, nome)
+                    self._indexes[model] = index
+                finally:
+                    self._pendentes.pop(model, None)
+        return self._indexes[model]
+
+    async def _build(self, model: Type[Model]) -> NameIndex:
+        pk = self.PKS[model]
+        rows: List[Tuple[int, str]] = []
+        async for chunk in iter_chunks(
+            model.all(), pk, pk, "nome", chunk_size=BUSCA_CHUNK_SIZE
+        ):
+            rows.extend((r[pk], r["nome"]) for r in chunk)
+        index = NameIndex()
+        index.load(rows)
+        return index
+
+    async def warm(self) -> None:
+        """Monta todos os índices (startup); falhas só são registradas."""
+        for model in self.PKS:
+            try:
+                await self.index(model)
+            except Exception:
+                logger.exception("Falha ao montar o índice de nomes de %s", model)
+
+    async def search(
+        self, model: Type[Model], consulta: str, limit: int = BUSCA_LIMIT
+    ) -> List[Tuple[int, str]]:
+        return (await self.index(model)).search(consulta, limit)
+
+    # chamados pelos services depois de gravar; índice ainda não montado
+    # não precisa de manutenção (será lido do banco já atualizado), mas o que
+    # está sendo montado guarda as escritas para reaplicar no fim
+    def add(self, model: Type[Model], id_: int, nome: Optional[str]) -> None:
+        if nome is not None:
+            self._apply(model, id_, nome)
+
+    def remove(self, model: Type[Model], id_: int) -> None:
+        self._apply(model, id_, None)
+
+    def _apply(self, model: Type[Model], id_: int, nome: Optional[str]) -> None:
+        pendentes = self._pendentes.get(model)
+        if pendentes is not None:
+            pendentes.append((id_, nome))
+        index = self._indexes.get(model)
+        if index is None:
+            return
+        if nome is None:
+            index.remove(id_)
+        else:
+            index.add(id_, nome)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self._locks.clear()
+        self._pendentes.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            model._meta.db_table: len(index) for model, index in self._indexes.items()
+        }
+
+
+name_index = NameIndexes()
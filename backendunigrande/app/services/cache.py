@@ -0,0 +1,169 @@
+# app/services/cache.py
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Type
+
+from pydantic import BaseModel
+from tortoise.models import Model
+
+from app.models.unigrande import Curso, Disciplina, PeriodoLetivo, Professor
+from app.schemas.unigrande import (CursoSummary, DisciplinaSummary,
+                                   PeriodoLetivoSummary, ProfessorSummary)
+from app.services.versioning import after_commit
+
+# entradas por tabela de referência e validade de cada entrada
+REFERENCE_CACHE_MAXSIZE = 10_000
+REFERENCE_CACHE_TTL_SECONDS = 300.0
+
+# matriz curricular por curso (dict disciplina_id -> período)
+CURRICULO_CACHE_MAXSIZE = 1_000
+CURRICULO_CACHE_TTL_SECONDS = 600.0
+
+# históricos escolares montados (um por aluno)
+HISTORICO_ESCOLAR_CACHE_MAXSIZE = 5_000
+HISTORICO_ESCOLAR_CACHE_TTL_SECONDS = 600.0
+
+
+class TTLCache:
+    """
+    Dict em memória com despejo LRU ao passar de `maxsize` e expiração por `ttl`.
+    Conta hits/misses para exposição em /metricas.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None or item[1] <= time.monotonic():
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+        # de novo depois do commit (ver versioning.bump_after_commit)
+        after_commit(lambda: self._data.pop(key, None))
+
+    def clear(self) -> None:
+        self._data.clear()
+        after_commit(self._data.clear)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class ReferenceCache:
+    """
+    Cache read-through, por pk, dos resumos das tabelas que quase não mudam
+    (Curso, Disciplina, Professor, PeriodoLetivo).
+
+    Leituras que faltam no cache são resolvidas numa única consulta `id__in`
+    por tabela; os métodos create/update/delete dos services chamam `invalidate`,
+    que vale na hora e é repetido depois do commit da requisição.
+    O cache é por processo (a API roda com um worker); o TTL limita quanto
+    tempo uma escrita feita fora da API pode ficar invisível.
+    """
+
+    SUMMARIES: Dict[Type[Model], Type[BaseModel]] = {
+        Curso: CursoSummary,
+        Disciplina: DisciplinaSummary,
+        Professor: ProfessorSummary,
+        PeriodoLetivo: PeriodoLetivoSummary,
+    }
+
+    def __init__(
+        self,
+        maxsize: int = REFERENCE_CACHE_MAXSIZE,
+        ttl: float = REFERENCE_CACHE_TTL_SECONDS,
+    ):
+        self._caches = {model: TTLCache(maxsize, ttl) for model in self.SUMMARIES}
+
+    def handles(self, model: Type[Model]) -> bool:
+        return model in self._caches
+
+    def cached(self, model: Type[Model], pk: Any) -> Optional[BaseModel]:
+        """Resumo já em cache, sem ir ao banco (None se ausente/expirado)."""
+        return self._caches[model].get(pk)
+
+    async def get_many(
+        self, model: Type[Model], pks: Iterable[Any]
+    ) -> Dict[Any, BaseModel]:
+        """
+        Resumos das pks informadas; as que não estão em cache vêm numa única
+        consulta. Pks inexistentes no banco ficam fora do resultado.
+        """
+        cache = self._caches[model]
+        found, missing = {}, set()
+        for pk in set(pks):
+            if pk is None:
+                continue
+            summary = cache.get(pk)
+            if summary is None:
+                missing.add(pk)
+            else:
+                found[pk] = summary
+
+        if missing:
+            schema = self.SUMMARIES[model]
+            rows = await model.filter(id__in=missing).values(*schema.model_fields)
+            for row in rows:
+                summary = schema(**row)
+                cache.set(row["id"], summary)
+                found[row["id"]] = summary
+        return found
+
+    async def summary(self, model: Type[Model], pk: Any) -> Optional[BaseModel]:
+        if pk is None:
+            return None
+        return (await self.get_many(model, (pk,))).get(pk)
+
+    async def prime(self, model: Type[Model], pks: Iterable[Any]) -> None:
+        """Carrega de uma vez os resumos que uma listagem vai usar."""
+        await self.get_many(model, pks)
+
+    def invalidate(self, model: Type[Model], pk: Any) -> None:
+        self._caches[model].invalidate(pk)
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            model._meta.db_table: cache.stats() for model, cache in self._caches.items()
+        }
+
+
+reference_cache = ReferenceCache()
+
+# matriz de cada curso; MatrizService invalida o curso a cada escrita
+curriculo_cache = TTLCache(CURRICULO_CACHE_MAXSIZE, CURRICULO_CACHE_TTL_SECONDS)
+
+# HistoricoEscolar por matrícula; os services invalidam o aluno a cada escrita
+# em Histórico dele e limpam tudo quando muda uma disciplina ou um período
+historico_escolar_cache = TTLCache(
+    HISTORICO_ESCOLAR_CACHE_MAXSIZE, HISTORICO_ESCOLAR_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,72 @@
+# app/services/counting.py
+from __future__ import annotations
+
+import time
+from typing import Dict, Tuple, Type
+
+from tortoise.models import Model
+
+from app.schemas.unigrande import CountModeLiteral
+
+# validade do total guardado no modo "cached"
+COUNT_CACHE_TTL_SECONDS = 60.0
+
+
+class CountProvider:
+    """
+    Total de linhas de uma tabela para as listagens paginadas.
+
+    - exact: `SELECT COUNT(*)` a cada chamada;
+    - cached: o último COUNT(*) exato, reaproveitado por `ttl` segundos e
+      descartado pelos métodos de escrita dos services (`invalidate`);
+    - estimate: estimativa do planner (`pg_class.reltuples`), sem varrer a tabela.
+      Fora do Postgres, ou se a tabela nunca foi analisada, cai para "cached".
+
+    `count()` devolve também o modo que de fato produziu o número.
+    """
+
+    def __init__(self, ttl: float = COUNT_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._cache: Dict[str, Tuple[int, float]] = {}
+
+    async def count(
+        self, model: Type[Model], mode: CountModeLiteral = "exact"
+    ) -> Tuple[int, CountModeLiteral]:
+        if mode == "estimate":
+            estimate = await self._estimate(model)
+            if estimate is not None:
+                return estimate, "estimate"
+            mode = "cached"
+
+        if mode == "cached":
+            cached = self._cache.get(model._meta.db_table)
+            if cached and cached[1] > time.monotonic():
+                return cached[0], "cached"
+
+        total = await model.all().count()
+        self._cache[model._meta.db_table] = (total, time.monotonic() + self.ttl)
+        return total, mode
+
+    def invalidate(self, model: Type[Model]) -> None:
+        self._cache.pop(model._meta.db_table, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    @staticmethod
+    async def _estimate(model: Type[Model]):
+        db = model._meta.db
+        if db.capabilities.dialect != "postgres":
+            return None
+        rows = await db.execute_query_dict(
+            "SELECT reltuples::bigint AS estimate FROM pg_class"
+            " WHERE oid = to_regclass($1)",
+            [model._meta.db_table],
+        )
+        # reltuples = -1 (PG14+) ou 0 enquanto a tabela não foi analisada
+        if not rows or rows[0]["estimate"] is None or rows[0]["estimate"] <= 0:
+            return None
+        return int(rows[0]["estimate"])
+
+
+count_provider = CountProvider()
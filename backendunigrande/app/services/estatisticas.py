@@ -0,0 +1,477 @@
+# app/services/estatisticas.py
+"""
+Estatísticas acadêmicas (aprovação, média final e faltas) por curso,
+disciplina, professor e período letivo, servidas a partir da tabela-resumo
+`estatisticas`.
+
+Cada linha do resumo é uma chave (período letivo, curso, disciplina) com
+contadores somáveis: históricos, aprovados, soma das médias, soma das faltas,
+matrículas... Taxas e médias de qualquer agrupamento são razões entre somas
+desses contadores, então a leitura nunca toca históricos nem matrículas.
+
+Escritas de uma linha em Histórico/Matrícula aplicam só a diferença entre a
+contribuição antiga e a nova (UPDATE com `F()`), como a MGP do aluno. Escritas
+em lote e mudanças de chave (aluno que troca de curso, turma removida)
+recalculam as chaves afetadas a partir das tabelas de origem.
+
+Reconstrução completa (a partir de backendunigrande/):
+    python -m app.services.estatisticas
+    python -m app.services.estatisticas --periodos 11 12
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import (Dict, Iterable, List, Literal, NamedTuple, Optional, Set,
+                    Tuple)
+
+from tortoise import Tortoise
+from tortoise.expressions import F, Q
+from tortoise.functions import Sum
+from tortoise.transactions import in_transaction
+
+from app.models.unigrande import (Aluno, Disciplina, Estatistica, Historico,
+                                  Matricula, PeriodoLetivo, Turma)
+from app.schemas.unigrande import EstatisticaGrupo
+from app.services.export import iter_chunks
+from app.services.versioning import table_versions
+
+# linhas de origem por consulta no recálculo
+ESTATISTICAS_CHUNK_SIZE = 5000
+
+SITUACAO_APROVADO = "AP"
+
+_FALTAS = ("faltas_01", "faltas_02", "faltas_03")
+_CENTAVOS = Decimal("0.01")
+
+# (periodo_letivo_id, curso_id, disciplina_id)
+Chave = Tuple[int, int, int]
+
+Dimensao = Literal["curso", "disciplina", "professor", "periodo_letivo"]
+
+
+class Contagem(NamedTuple):
+    """Contadores de uma chave do resumo (ou a contribuição de uma linha)."""
+
+    historicos: int = 0
+    aprovados: int = 0
+    com_media: int = 0
+    soma_medias: Decimal = Decimal("0")
+    com_faltas: int = 0
+    soma_faltas: int = 0
+    matriculas: int = 0
+    faltas_matriculas: int = 0
+
+    def __add__(self, other: "Contagem") -> "Contagem":
+        return Contagem(*(a + b for a, b in zip(self, other)))
+
+    def __neg__(self) -> "Contagem":
+        return Contagem(*(-a for a in self))
+
+    def __sub__(self, other: "Contagem") -> "Contagem":
+        return self + -other
+
+
+def do_historico(situacao: str, media_final, faltas: Optional[int]) -> Contagem:
+    return Contagem(
+        historicos=1,
+        aprovados=int(situacao == SITUACAO_APROVADO),
+        com_media=int(media_final is not None),
+        soma_medias=Decimal(media_final) if media_final is not None else Decimal("0"),
+        com_faltas=int(faltas is not None),
+        soma_faltas=faltas or 0,
+    )
+
+
+def da_matricula(faltas_01, faltas_02, faltas_03) -> Contagem:
+    return Contagem(
+        matriculas=1,
+        faltas_matriculas=(faltas_01 or 0) + (faltas_02 or 0) + (faltas_03 or 0),
+    )
+
+
+class LinhaHistorico(NamedTuple):
+    """Os campos de um Histórico que afetam o resumo."""
+
+    aluno_id: int
+    periodo_letivo_id: int
+    disciplina_id: int
+    situacao: str
+    media_final: Optional[Decimal]
+    faltas: Optional[int]
+
+    @classmethod
+    def of(cls, historico: Historico) -> "LinhaHistorico":
+        return cls(
+            historico.aluno_id,
+            historico.periodo_letivo_id,
+            historico.disciplina_id,
+            historico.situacao,
+            historico.media_final,
+            historico.faltas,
+        )
+
+
+class LinhaMatricula(NamedTuple):
+    """Os campos de uma Matrícula que afetam o resumo."""
+
+    turma_id: int
+    faltas_01: Optional[int]
+    faltas_02: Optional[int]
+    faltas_03: Optional[int]
+
+    @classmethod
+    def of(cls, matricula: Matricula) -> "LinhaMatricula":
+        return cls(
+            matricula.turma_id,
+            matricula.faltas_01,
+            matricula.faltas_02,
+            matricula.faltas_03,
+        )
+
+    def contagem(self) -> Contagem:
+        return da_matricula(self.faltas_01, self.faltas_02, self.faltas_03)
+
+
+def _percentual(parte: int, total: int) -> Optional[float]:
+    return round(100 * parte / total, 2) if total else None
+
+
+def _grupo(row: dict) -> EstatisticaGrupo:
+    com_media = row["com_media"] or 0
+    soma_medias = Decimal(row["soma_medias"] or 0)
+    return EstatisticaGrupo(
+        id=row["id"],
+        historicos=row["historicos"] or 0,
+        aprovados=row["aprovados"] or 0,
+        taxa_aprovacao=_percentual(row["aprovados"] or 0, row["historicos"] or 0),
+        media_final=(
+            (soma_medias / com_media).quantize(_CENTAVOS, ROUND_HALF_UP)
+            if com_media
+            else None
+        ),
+        taxa_faltas=_percentual(row["soma_faltas"] or 0, row["carga_historicos"] or 0),
+        matriculas=row["matriculas"] or 0,
+        taxa_faltas_em_curso=_percentual(
+            row["faltas_matriculas"] or 0, row["carga_matriculas"] or 0
+        ),
+    )
+
+
+class EstatisticaService:
+    # ------------------------------------------------------------------
+    # leitura
+    # ------------------------------------------------------------------
+    @staticmethod
+    async def agrupar(dimensao: Dimensao, **filtros: int) -> List[EstatisticaGrupo]:
+        """
+        Um grupo por valor de `dimensao` (curso, disciplina, professor ou período
+        letivo), somando as linhas do resumo que atendem `filtros`
+        (`curso_id=3`, `periodo_letivo_id=12`...). Uma consulta com GROUP BY.
+        Taxa de faltas = faltas / (alunos × horas obrigatórias da disciplina).
+        """
+        coluna = f"{dimensao}_id"
+        qs = Estatistica.filter(**filtros)
+        if dimensao == "professor":
+            qs = qs.filter(professor_id__isnull=False)
+        rows = (
+            await qs.annotate(
+                t_historicos=Sum("historicos"),
+                t_aprovados=Sum("aprovados"),
+                t_com_media=Sum("com_media"),
+                t_soma_medias=Sum("soma_medias"),
+                t_soma_faltas=Sum("soma_faltas"),
+                t_carga_historicos=Sum(F("com_faltas") * F("horas_obrig")),
+                t_matriculas=Sum("matriculas"),
+                t_faltas_matriculas=Sum("faltas_matriculas"),
+                t_carga_matriculas=Sum(F("matriculas") * F("horas_obrig")),
+            )
+            .group_by(coluna)
+            .order_by(coluna)
+            .values(
+                coluna,
+                "t_historicos",
+                "t_aprovados",
+                "t_com_media",
+                "t_soma_medias",
+                "t_soma_faltas",
+                "t_carga_historicos",
+                "t_matriculas",
+                "t_faltas_matriculas",
+                "t_carga_matriculas",
+            )
+        )
+        return [
+            _grupo({"id": row.pop(coluna), **{k[2:]: v for k, v in row.items()}})
+            for row in rows
+        ]
+
+    # ------------------------------------------------------------------
+    # manutenção incremental
+    # ------------------------------------------------------------------
+    @staticmethod
+    async def historico_alterado(
+        before: Optional[LinhaHistorico], after: Optional[LinhaHistorico]
+    ) -> None:
+        """
+        Aplica a diferença entre a versão antiga e a nova de um histórico
+        (`None` para criação/remoção). A chave usa o curso atual do aluno.
+        Deve rodar na mesma transação da escrita em Histórico.
+        """
+        alunos = {linha.aluno_id for linha in (before, after) if linha is not None}
+        cursos = dict(
+            await Aluno.filter(matricula__in=alunos).values_list(
+                "matricula", "curso_id"
+            )
+        )
+        deltas: Dict[Chave, Contagem] = defaultdict(Contagem)
+        for linha, sign in ((before, -1), (after, 1)):
+            if linha is None or linha.aluno_id not in cursos:
+                continue
+            chave = (
+                linha.periodo_letivo_id,
+                cursos[linha.aluno_id],
+                linha.disciplina_id,
+            )
+            parte = do_historico(linha.situacao, linha.media_final, linha.faltas)
+            deltas[chave] += parte if sign > 0 else -parte
+        await EstatisticaService.apply(deltas)
+
+    @staticmethod
+    async def matricula_alterada(
+        before: Optional[LinhaMatricula], after: Optional[LinhaMatricula]
+    ) -> None:
+        """Como `historico_alterado`, para uma matrícula (chave da turma)."""
+        turmas = {linha.turma_id for linha in (before, after) if linha is not None}
+        chaves = await EstatisticaService.chaves_das_turmas(turmas)
+        deltas: Dict[Chave, Contagem] = defaultdict(Contagem)
+        for linha, sign in ((before, -1), (after, 1)):
+            if linha is None or linha.turma_id not in chaves:
+                continue
+            parte = linha.contagem()
+            deltas[chaves[linha.turma_id]] += parte if sign > 0 else -parte
+        await EstatisticaService.apply(deltas)
+
+    @staticmethod
+    async def chaves_das_turmas(turma_ids: Iterable[int]) -> Dict[int, Chave]:
+        rows = await Turma.filter(id__in=list(turma_ids)).values_list(
+            "id", "periodo_letivo_id", "curso_id", "disciplina_id"
+        )
+        return {id_: (pl, cu, di) for id_, pl, cu, di in rows}
+
+    @staticmethod
+    async def apply(deltas: Dict[Chave, Contagem]) -> None:
+        """
+        Soma cada delta à sua chave com um UPDATE `campo = campo + n`, sem
+        ler-e-gravar; a linha que ainda não existe é criada (INSERT que ignora
+        conflito, para duas escritas simultâneas na mesma chave nova).
+        """
+        aplicou = False
+        for chave, delta in deltas.items():
+            campos = {f: F(f) + v for f, v in zip(Contagem._fields, delta) if v}
+            if not campos:
+                continue
+            filtro = Estatistica.filter(
+                periodo_letivo_id=chave[0], curso_id=chave[1], disciplina_id=chave[2]
+            )
+            if not await filtro.update(**campos):
+                await Estatistica.bulk_create(
+                    await _novas_linhas(chave[0], {chave[1:]: Contagem()}),
+                    ignore_conflicts=True,
+                )
+                await filtro.update(**campos)
+            aplicou = True
+        if aplicou:
+            table_versions.bump(Estatistica)
+
+    # ------------------------------------------------------------------
+    # atributos copiados de Turma/Disciplina
+    # ------------------------------------------------------------------
+    @staticmethod
+    async def definir_professor(chave: Chave, professor_id: Optional[int]) -> None:
+        pl, curso_id, disciplina_id = chave
+        if await Estatistica.filter(
+            periodo_letivo_id=pl, curso_id=curso_id, disciplina_id=disciplina_id
+        ).update(professor_id=professor_id):
+            table_versions.bump(Estatistica)
+
+    @staticmethod
+    async def definir_horas(disciplina_id: int, horas_obrig: int) -> None:
+        if await Estatistica.filter(disciplina_id=disciplina_id).update(
+            horas_obrig=horas_obrig
+        ):
+            table_versions.bump(Estatistica)
+
+    # ------------------------------------------------------------------
+    # recálculo a partir das tabelas de origem
+    # ------------------------------------------------------------------
+    @staticmethod
+    async def chaves_do_aluno(matricula: int, curso_id: int) -> Set[Chave]:
+        """Chaves do resumo em que o aluno tem históricos ou matrículas."""
+        historicos = await Historico.filter(aluno_id=matricula).values_list(
+            "periodo_letivo_id", "disciplina_id"
+        )
+        turmas = await Matricula.filter(aluno_id=matricula).values_list(
+            "turma__periodo_letivo_id", "turma__curso_id", "turma__disciplina_id"
+        )
+        return {(pl, curso_id, di) for pl, di in historicos} | set(turmas)
+
+    @staticmethod
+    async def refresh(chaves: Iterable[Chave]) -> int:
+        """Recalcula as chaves informadas; devolve as linhas gravadas."""
+        por_periodo: Dict[int, Set[Tuple[int, int]]] = defaultdict(set)
+        for pl, curso_id, disciplina_id in chaves:
+            por_periodo[pl].add((curso_id, disciplina_id))
+        total = 0
+        for pl, pares in por_periodo.items():
+            total += await EstatisticaService.recompute_periodo(pl, pares)
+        return total
+
+    @staticmethod
+    async def recompute_periodo(
+        periodo_letivo_id: int,
+        pares: Optional[Set[Tuple[int, int]]] = None,
+        chunk_size: int = ESTATISTICAS_CHUNK_SIZE,
+    ) -> int:
+        """
+        Refaz as linhas do período (todas, ou só os pares (curso, disciplina)
+        de `pares`) lendo históricos e matrículas em blocos por keyset. A troca
+        das linhas é feita numa transação; deltas aplicados durante a leitura
+        podem se perder, então o rebuild completo deve rodar fora do horário
+        de lançamentos.
+        """
+        historicos = Historico.filter(periodo_letivo_id=periodo_letivo_id)
+        matriculas = Matricula.filter(turma__periodo_letivo_id=periodo_letivo_id)
+        alvo = Estatistica.filter(periodo_letivo_id=periodo_letivo_id)
+        if pares is not None:
+            if not pares:
+                return 0
+            cursos = list({c for c, _ in pares})
+            disciplinas = list({d for _, d in pares})
+            historicos = historicos.filter(
+                aluno__curso_id__in=cursos, disciplina_id__in=disciplinas
+            )
+            matriculas = matriculas.filter(
+                turma__curso_id__in=cursos, turma__disciplina_id__in=disciplinas
+            )
+            alvo = alvo.filter(
+                Q(
+                    *(Q(curso_id=c, disciplina_id=d) for c, d in pares),
+                    join_type="OR",
+                )
+            )
+
+        totais: Dict[Tuple[int, int], Contagem] = defaultdict(Contagem)
+        async for rows in iter_chunks(
+            historicos,
+            "id",
+            "id",
+            "disciplina_id",
+            "situacao",
+            "media_final",
+            "faltas",
+            chunk_size=chunk_size,
+            curso_id="aluno__curso_id",
+        ):
+            for r in rows:
+                totais[(r["curso_id"], r["disciplina_id"])] += do_historico(
+                    r["situacao"], r["media_final"], r["faltas"]
+                )
+        async for rows in iter_chunks(
+            matriculas,
+            "id",
+            "id",
+            *_FALTAS,
+            chunk_size=chunk_size,
+            curso_id="turma__curso_id",
+            disciplina_id="turma__disciplina_id",
+        ):
+            for r in rows:
+                totais[(r["curso_id"], r["disciplina_id"])] += da_matricula(
+                    *(r[f] for f in _FALTAS)
+                )
+        if pares is not None:
+            # o filtro por curso IN e disciplina IN traz também combinações vizinhas
+            totais = {par: c for par, c in totais.items() if par in pares}
+
+        linhas = await _novas_linhas(periodo_letivo_id, totais)
+        async with in_transaction():
+            await alvo.delete()
+            if linhas:
+                await Estatistica.bulk_create(linhas, batch_size=len(linhas))
+        table_versions.bump(Estatistica)
+        return len(linhas)
+
+    @staticmethod
+    async def rebuild(
+        periodos: Optional[Iterable[int]] = None,
+        chunk_size: int = ESTATISTICAS_CHUNK_SIZE,
+    ) -> int:
+        """Recalcula o resumo de todos os períodos letivos (ou dos informados)."""
+        if periodos is None:
+            periodos = (
+                await PeriodoLetivo.all().order_by("id").values_list("id", flat=True)
+            )
+        total = 0
+        for periodo_letivo_id in periodos:
+            total += await EstatisticaService.recompute_periodo(
+                periodo_letivo_id, chunk_size=chunk_size
+            )
+        return total
+
+
+async def _novas_linhas(
+    periodo_letivo_id: int, totais: Dict[Tuple[int, int], Contagem]
+) -> List[Estatistica]:
+    """Linhas do resumo com professor da turma e horas da disciplina."""
+    if not totais:
+        return []
+    disciplinas = list({d for _, d in totais})
+    horas = dict(
+        await Disciplina.filter(id__in=disciplinas).values_list("id", "horas_obrig")
+    )
+    professores = {
+        (cu, di): prof
+        for cu, di, prof in await Turma.filter(
+            periodo_letivo_id=periodo_letivo_id, disciplina_id__in=disciplinas
+        ).values_list("curso_id", "disciplina_id", "professor_id")
+    }
+    return [
+        Estatistica(
+            periodo_letivo_id=periodo_letivo_id,
+            curso_id=curso_id,
+            disciplina_id=disciplina_id,
+            professor_id=professores.get((curso_id, disciplina_id)),
+            horas_obrig=horas.get(disciplina_id, 0),
+            **contagem._asdict(),
+        )
+        for (curso_id, disciplina_id), contagem in totais.items()
+    ]
+
+
+async def run(db_url: str, periodos: Optional[List[int]], chunk_size: int) -> None:
+    await Tortoise.init(db_url=db_url, modules={"models": ["app.models.tortoise"]})
+    try:
+        start = time.perf_counter()
+        total = await EstatisticaService.rebuild(periodos, chunk_size)
+        print(
+            f"{total} linhas de estatísticas gravadas em {time.perf_counter() - start:.2f}s"
+        )
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    from app.config.db import DATABASE_URL
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument(
+        "--periodos", nargs="*", type=int, help="ids de PeriodoLetivo (padrão: todos)"
+    )
+    parser.add_argument("--db-url", default=DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=ESTATISTICAS_CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.db_url, args.periodos or None, args.chunk_size))
@@ -0,0 +1,329 @@
+# app/services/expand.py
+"""
+`?expand=` nas rotas de leitura: devolve, junto com o recurso, as relações
+pedidas (ex.: `expand=coordenador,alunos` em cursos ou
+`expand=turma.disciplina` em matrículas), no lugar das chamadas em sequência
+que o cliente faria para montar a tela.
+
+- Só caminhos da lista `EXPANSOES` do recurso são aceitos (400 no resto);
+  pedir `turma.disciplina` expande também `turma`.
+- Cada relação de cada nível é resolvida com uma consulta para todas as
+  linhas: relações "para um" pelo `DataLoader` da requisição (`pk__in`),
+  relações "para muitos" com `fk__in` sobre as pks do nível anterior. O número
+  de consultas é limitado pelo número de caminhos, não pelo de linhas.
+- Relações "para muitos" trazem no máximo `EXPAND_MAX_ROWS` linhas por
+  caminho (ordenadas pela pk); os caminhos cortados vão no header
+  `X-Expand-Truncated`. Para ler tudo, use as listagens paginadas.
+
+Cada item expandido é o *Response completo do model; expansões aninhadas vêm
+no `expanded` do próprio item. O ETag cobre as tabelas de todas as relações
+pedidas, então uma alteração em qualquer uma delas invalida a resposta.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import (Any, Awaitable, Callable, Dict, List, NamedTuple, Optional,
+                    Tuple, Type)
+
+from fastapi import HTTPException, Query, Request, Response, status
+from pydantic import BaseModel
+from tortoise.models import Model
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
+                                  Matricula, Matriz, PeriodoLetivo, Professor,
+                                  Turma)
+from app.services.fieldsets import trim
+from app.services.loader import DataLoader, responses
+from app.services.serialization import json_response
+from app.services.unigrande import (AlunoService, CursoService,
+                                    DisciplinaService, HistoricoService,
+                                    MatriculaService, MatrizService,
+                                    PeriodoLetivoService, ProfessorService,
+                                    TurmaService)
+from app.services.versioning import conditional_get
+
+# linhas por caminho "para muitos" (ex.: alunos de um curso)
+EXPAND_MAX_ROWS = 200
+
+TRUNCATED_HEADER = "X-Expand-Truncated"
+
+Arvore = Dict[str, "Arvore"]
+
+
+class Relacao(NamedTuple):
+    model: Type[Model]
+    fk: Optional[str] = None  # "para um": fk na origem (ex.: coordenador_id)
+    reverso: Optional[str] = None  # "para muitos": fk no destino (ex.: curso_id)
+
+
+class _Recurso(NamedTuple):
+    build: Callable[[Any, DataLoader], Awaitable[Any]]
+    tabelas: Tuple[Type[Model], ...]  # tabelas que compõem o *Response
+
+
+def _sem_loader(build):
+    async def wrapper(obj, loader: DataLoader):
+        return await build(obj)
+
+    return wrapper
+
+
+RECURSOS: Dict[Type[Model], _Recurso] = {
+    PeriodoLetivo: _Recurso(
+        _sem_loader(PeriodoLetivoService.response), (PeriodoLetivo,)
+    ),
+    Professor: _Recurso(_sem_loader(ProfessorService.response), (Professor,)),
+    Disciplina: _Recurso(_sem_loader(DisciplinaService.response), (Disciplina,)),
+    Curso: _Recurso(CursoService.response, (Curso, Professor)),
+    Aluno: _Recurso(AlunoService.response, (Aluno, Curso)),
+    Matriz: _Recurso(MatrizService.response, (Matriz, Curso, Disciplina)),
+    Turma: _Recurso(
+        TurmaService.response, (Turma, PeriodoLetivo, Curso, Disciplina, Professor)
+    ),
+    Historico: _Recurso(
+        HistoricoService.response, (Historico, Aluno, PeriodoLetivo, Disciplina)
+    ),
+    Matricula: _Recurso(MatriculaService.response, (Matricula, Aluno, Turma)),
+}
+
+RELACOES: Dict[Type[Model], Dict[str, Relacao]] = {
+    Curso: {
+        "coordenador": Relacao(Professor, fk="coordenador_id"),
+        "alunos": Relacao(Aluno, reverso="curso_id"),
+        "matriz": Relacao(Matriz, reverso="curso_id"),
+        "turmas": Relacao(Turma, reverso="curso_id"),
+    },
+    Aluno: {
+        "curso": Relacao(Curso, fk="curso_id"),
+        "historicos": Relacao(Historico, reverso="aluno_id"),
+        "matriculas": Relacao(Matricula, reverso="aluno_id"),
+    },
+    Professor: {
+        "cursos": Relacao(Curso, reverso="coordenador_id"),
+        "turmas": Relacao(Turma, reverso="professor_id"),
+    },
+    Disciplina: {
+        "matriz": Relacao(Matriz, reverso="disciplina_id"),
+        "turmas": Relacao(Turma, reverso="disciplina_id"),
+    },
+    Matriz: {
+        "curso": Relacao(Curso, fk="curso_id"),
+        "disciplina": Relacao(Disciplina, fk="disciplina_id"),
+    },
+    Turma: {
+        "periodo_letivo": Relacao(PeriodoLetivo, fk="periodo_letivo_id"),
+        "curso": Relacao(Curso, fk="curso_id"),
+        "disciplina": Relacao(Disciplina, fk="disciplina_id"),
+        "professor": Relacao(Professor, fk="professor_id"),
+    },
+    Historico: {
+        "periodo_letivo": Relacao(PeriodoLetivo, fk="periodo_letivo_id"),
+        "disciplina": Relacao(Disciplina, fk="disciplina_id"),
+    },
+    Matricula: {
+        "aluno": Relacao(Aluno, fk="aluno_id"),
+        "turma": Relacao(Turma, fk="turma_id"),
+    },
+}
+
+# caminhos aceitos em `?expand=` por recurso da rota
+EXPANSOES: Dict[Type[Model], Tuple[str, ...]] = {
+    Curso: (
+        "coordenador",
+        "alunos",
+        "matriz",
+        "matriz.disciplina",
+        "turmas",
+        "turmas.disciplina",
+        "turmas.professor",
+    ),
+    Aluno: (
+        "curso",
+        "curso.coordenador",
+        "historicos",
+        "historicos.disciplina",
+        "matriculas",
+        "matriculas.turma",
+        "matriculas.turma.disciplina",
+    ),
+    Professor: ("cursos", "turmas", "turmas.curso", "turmas.disciplina"),
+    Disciplina: ("matriz", "matriz.curso", "turmas", "turmas.professor"),
+    Matricula: (
+        "aluno",
+        "aluno.curso",
+        "turma",
+        "turma.periodo_letivo",
+        "turma.disciplina",
+        "turma.professor",
+    ),
+}
+
+
+def parse_expand(root: Type[Model], expand: Optional[str]) -> Arvore:
+    """Árvore dos caminhos pedidos (`{"turma": {"disciplina": {}}}`) ou 400."""
+    arvore: Arvore = {}
+    if not expand:
+        return arvore
+    permitidos = EXPANSOES[root]
+    for caminho in filter(None, (c.strip() for c in expand.split(","))):
+        if caminho not in permitidos:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"expand inválido: {caminho}. "
+                    f"Permitidos: {', '.join(permitidos)}."
+                ),
+            )
+        no = arvore
+        for nome in caminho.split("."):
+            no = no.setdefault(nome, {})
+    return arvore
+
+
+def _tabelas(model: Type[Model], arvore: Arvore) -> List[Type[Model]]:
+    tabelas = list(RECURSOS[model].tabelas)
+    for nome, sub in arvore.items():
+        tabelas += _tabelas(RELACOES[model][nome].model, sub)
+    return tabelas
+
+
+@dataclass
+class Expansao:
+    root: Type[Model]
+    arvore: Arvore
+    response: Response
+    etag: str
+
+
+def expand_param(root: Type[Model]):
+    """
+    Dependência das rotas com `?expand=`: valida os caminhos e faz o GET
+    condicional (como `conditional_get`) com as tabelas do recurso e das
+    relações pedidas.
+    """
+    descricao = "Relações a incluir, separadas por vírgula: " + ", ".join(
+        EXPANSOES[root]
+    )
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        expand: Optional[str] = Query(None, description=descricao),
+    ) -> Expansao:
+        arvore = parse_expand(root, expand)
+        tabelas = list(dict.fromkeys(_tabelas(root, arvore)))
+        etag = await conditional_get(*tabelas)(request, response)
+        return Expansao(root, arvore, response, etag)
+
+    return dependency
+
+
+async def _filhos(
+    rel: Relacao, objs: List[Model], pk_attr: str, loader: DataLoader
+) -> Tuple[List[Model], bool]:
+    """Destinos da relação para todas as linhas de `objs` (uma consulta)."""
+    if rel.fk is not None:
+        alvos = await loader.load_many(rel.model, {getattr(o, rel.fk) for o in objs})
+        return [a for a in alvos if a is not None], False
+    pks = {getattr(o, pk_attr) for o in objs}
+    if not pks:
+        return [], False
+    filhos = (
+        await rel.model.filter(**{f"{rel.reverso}__in": pks})
+        .order_by(rel.model._meta.pk_attr)
+        .limit(EXPAND_MAX_ROWS + 1)
+    )
+    return filhos[:EXPAND_MAX_ROWS], len(filhos) > EXPAND_MAX_ROWS
+
+
+async def _expandir(
+    model: Type[Model],
+    objs: List[Model],
+    arvore: Arvore,
+    loader: DataLoader,
+    truncados: List[str],
+    prefixo: str,
+) -> List[Dict[str, Any]]:
+    pk_attr = model._meta.pk_attr
+    saida: List[Dict[str, Any]] = [{} for _ in objs]
+    for nome, sub in arvore.items():
+        rel = RELACOES[model][nome]
+        filhos, cortado = await _filhos(rel, objs, pk_attr, loader)
+        if cortado:
+            truncados.append(prefixo + nome)
+        dados = await _montar(
+            rel.model, filhos, sub, loader, truncados, f"{prefixo}{nome}."
+        )
+        if rel.fk is not None:
+            alvo_pk = rel.model._meta.pk_attr
+            por_pk = {getattr(f, alvo_pk): d for f, d in zip(filhos, dados)}
+            for item, obj in zip(saida, objs):
+                item[nome] = por_pk.get(getattr(obj, rel.fk))
+        else:
+            grupos = defaultdict(list)
+            for f, d in zip(filhos, dados):
+                grupos[getattr(f, rel.reverso)].append(d)
+            for item, obj in zip(saida, objs):
+                item[nome] = grupos.get(getattr(obj, pk_attr), [])
+    return saida
+
+
+async def _montar(
+    model: Type[Model],
+    objs: List[Model],
+    arvore: Arvore,
+    loader: DataLoader,
+    truncados: List[str],
+    prefixo: str = "",
+) -> List[Any]:
+    built = await responses(RECURSOS[model].build, objs, loader)
+    if not arvore:
+        return built
+    expandidos = await _expandir(model, objs, arvore, loader, truncados, prefixo)
+    return [{**r.model_dump(), "expanded": e} for r, e in zip(built, expandidos)]
+
+
+async def expand_responses(
+    objs: List[Model], expansao: Expansao, loader: DataLoader
+) -> List[Any]:
+    """
+    *Response de cada linha de `objs` (do model `expansao.root`) com as
+    relações pedidas em `expanded`.
+    """
+    truncados: List[str] = []
+    result = await _montar(expansao.root, objs, expansao.arvore, loader, truncados)
+    if truncados:
+        expansao.response.headers[TRUNCATED_HEADER] = ",".join(truncados)
+    return result
+
+
+async def get_response(
+    service,
+    pk: Any,
+    expansao: Expansao,
+    loader: DataLoader,
+    fields: Optional[List[str]] = None,
+) -> Any:
+    """
+    Resposta das rotas buscar-*: `service.get(pk)` com as relações pedidas.
+    Com `fields` (app/services/fieldsets.py) só esses campos (e `expanded`),
+    num `Response` já serializado; sem `expand`, por `service.get_values`
+    (um SELECT só com as colunas pedidas).
+    """
+    if fields is not None and not expansao.arvore:
+        row = await service.get_values(pk, fields)
+        return json_response(dict, row, expansao.etag, validate=False)
+    obj = await service.get(pk, loader)
+    (result,) = await expand_responses([obj], expansao, loader)
+    if fields is None:
+        return result
+    if isinstance(result, BaseModel):
+        result = result.model_dump()
+    response = json_response(
+        dict, trim(result, [*fields, "expanded"]), expansao.etag, validate=False
+    )
+    truncados = expansao.response.headers.get(TRUNCATED_HEADER)
+    if truncados:
+        response.headers[TRUNCATED_HEADER] = truncados
+    return response
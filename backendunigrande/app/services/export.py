@@ -0,0 +1,88 @@
+# app/services/export.py
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Literal
+
+from fastapi.responses import StreamingResponse
+from tortoise.queryset import QuerySet
+
+# linhas lidas do banco por consulta durante a exportação
+EXPORT_CHUNK_SIZE = 1000
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+async def iter_chunks(
+    qs: QuerySet,
+    pk: str,
+    *fields: str,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    **joined: str,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Percorre `qs` em blocos de `chunk_size` linhas por keyset na pk
+    (`WHERE pk > última ORDER BY pk LIMIT n`), já projetadas com `.values()`.
+    Só um bloco fica em memória por vez, qualquer que seja o tamanho da tabela.
+    `joined` são colunas de relações, ex.: `curso_nome="curso__nome"`.
+    """
+    last = None
+    while True:
+        page = qs if last is None else qs.filter(**{f"{pk}__gt": last})
+        rows = await page.order_by(pk).limit(chunk_size).values(*fields, **joined)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last = rows[-1][pk]
+
+
+def _json_default(value: Any) -> Any:
+    # mesmo formato das respostas JSON da API (Decimal como string, datas ISO)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+async def _ndjson(chunks: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    async for rows in chunks:
+        yield "".join(
+            json.dumps(row, default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        )
+
+
+async def _csv(chunks: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    header_sent = False
+    async for rows in chunks:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_sent:
+            writer.writerow(rows[0].keys())
+            header_sent = True
+        writer.writerows(row.values() for row in rows)
+        yield buffer.getvalue()
+
+
+def stream_export(
+    chunks: AsyncIterator[List[Dict[str, Any]]], formato: ExportFormat, filename: str
+) -> StreamingResponse:
+    """
+    Monta a `StreamingResponse` em NDJSON ou CSV a partir dos blocos de `iter_chunks`.
+    """
+    if formato == "csv":
+        body, media_type, ext = _csv(chunks), "text/csv; charset=utf-8", "csv"
+    else:
+        body, media_type, ext = _ndjson(chunks), "application/x-ndjson", "ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{ext}"'},
+    )
@@ -0,0 +1,169 @@
+# app/services/fechamento.py
+"""
+Fechamento do período letivo: converte as matrículas (três notas e três
+contagens de faltas por turma) em linhas de Histórico com `situacao`,
+`media_final` e `faltas`.
+
+As matrículas do período são lidas em blocos por keyset já com o
+`disciplina_id` e o `limite_faltas` da turma (um JOIN por bloco). Cada bloco é
+apurado em memória e gravado com um único INSERT em lote, em uma transação por
+bloco. O INSERT ignora conflitos na chave única (período, aluno, disciplina),
+então o fechamento pode ser interrompido e rodado de novo: o que já foi gravado
+é mantido e só o restante entra.
+
+A partir de backendunigrande/:
+    python -m app.services.fechamento 12
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from app.models.unigrande import Historico, Matricula, PeriodoLetivo
+from app.services.cache import historico_escolar_cache
+from app.services.counting import count_provider
+from app.services.estatisticas import EstatisticaService
+from app.services.export import iter_chunks
+from app.services.mgp import MgpService
+from app.services.versioning import table_versions
+
+# média mínima para aprovação; abaixo dela, ou acima do limite de faltas, RE
+MEDIA_APROVACAO = Decimal("7.00")
+FECHAMENTO_CHUNK_SIZE = 2000
+
+_NOTAS = ("nota_01", "nota_02", "nota_03")
+_FALTAS = ("faltas_01", "faltas_02", "faltas_03")
+_CENTAVOS = Decimal("0.01")
+_ZERO = Decimal("0")
+
+
+class FechamentoReport(NamedTuple):
+    periodo_letivo_id: int
+    matriculas: int  # matrículas lidas
+    gravados: int  # históricos novos
+    existentes: int  # já gravados (rodada anterior, lançamento manual, repetidos)
+    seconds: float
+
+
+def apurar(rows: List[Dict[str, Any]], periodo_letivo_id: int) -> List[Historico]:
+    """
+    Resultado de um bloco de matrículas. Nota não lançada conta como zero
+    (a média é sempre sobre as três avaliações) e as faltas são somadas.
+    """
+    medias = [
+        (sum((r[n] or _ZERO for n in _NOTAS), _ZERO) / len(_NOTAS)).quantize(
+            _CENTAVOS, ROUND_HALF_UP
+        )
+        for r in rows
+    ]
+    faltas = [sum(r[f] or 0 for f in _FALTAS) for r in rows]
+    return [
+        Historico(
+            periodo_letivo_id=periodo_letivo_id,
+            aluno_id=r["aluno_id"],
+            disciplina_id=r["disciplina_id"],
+            situacao=(
+                "AP"
+                if media >= MEDIA_APROVACAO and falta <= r["limite_faltas"]
+                else "RE"
+            ),
+            media_final=media,
+            faltas=falta,
+        )
+        for r, media, falta in zip(rows, medias, faltas)
+    ]
+
+
+async def _gravar(historicos: List[Historico]) -> None:
+    async with in_transaction():
+        await Historico.bulk_create(
+            historicos, batch_size=len(historicos), ignore_conflicts=True
+        )
+        # históricos entram em lote, fora do HistoricoService: a MGP dos alunos
+        # do bloco é recalculada de uma vez
+        await MgpService.recompute(h.aluno_id for h in historicos)
+    for h in historicos:
+        historico_escolar_cache.invalidate(h.aluno_id)
+
+
+def _matriculas_do_periodo(periodo_letivo_id: int, chunk_size: int):
+    return iter_chunks(
+        Matricula.filter(turma__periodo_letivo_id=periodo_letivo_id),
+        "id",
+        "id",
+        "aluno_id",
+        *_NOTAS,
+        *_FALTAS,
+        chunk_size=chunk_size,
+        disciplina_id="turma__disciplina_id",
+        limite_faltas="turma__disciplina__limite_faltas",
+    )
+
+
+async def fechar_periodo(
+    periodo_letivo_id: int, chunk_size: int = FECHAMENTO_CHUNK_SIZE
+) -> Optional[FechamentoReport]:
+    """
+    Gera os históricos do período a partir das matrículas. Devolve `None` se o
+    período não existe. Idempotente: rodar de novo não duplica nem altera
+    históricos já gravados.
+    """
+    if not await PeriodoLetivo.exists(id=periodo_letivo_id):
+        return None
+
+    start = time.perf_counter()
+    antes = await Historico.filter(periodo_letivo_id=periodo_letivo_id).count()
+    lidas = 0
+    async for rows in _matriculas_do_periodo(periodo_letivo_id, chunk_size):
+        lidas += len(rows)
+        await _gravar(apurar(rows, periodo_letivo_id))
+    depois = await Historico.filter(periodo_letivo_id=periodo_letivo_id).count()
+
+    if depois != antes:
+        # históricos gravados em lote: o resumo do período é refeito de uma vez
+        await EstatisticaService.recompute_periodo(
+            periodo_letivo_id, chunk_size=chunk_size
+        )
+        count_provider.invalidate(Historico)
+        table_versions.bump(Historico)
+    return FechamentoReport(
+        periodo_letivo_id,
+        lidas,
+        depois - antes,
+        lidas - (depois - antes),
+        time.perf_counter() - start,
+    )
+
+
+async def run(db_url: str, periodos: Iterable[int], chunk_size: int) -> None:
+    await Tortoise.init(db_url=db_url, modules={"models": ["app.models.tortoise"]})
+    try:
+        for periodo_letivo_id in periodos:
+            report = await fechar_periodo(periodo_letivo_id, chunk_size)
+            if report is None:
+                print(f"período {periodo_letivo_id}: não encontrado")
+                continue
+            print(
+                f"período {report.periodo_letivo_id}: {report.matriculas} matrículas,"
+                f" {report.gravados} históricos gravados,"
+                f" {report.existentes} já existentes em {report.seconds:.2f}s"
+            )
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    from app.config.db import DATABASE_URL
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("periodos", nargs="+", type=int, help="ids de PeriodoLetivo")
+    parser.add_argument("--db-url", default=DATABASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=FECHAMENTO_CHUNK_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.db_url, args.periodos, args.chunk_size))
@@ -0,0 +1,71 @@
+# app/services/fieldsets.py
+"""
+`?fields=` (campos esparsos) nas rotas de leitura: o cliente escolhe os campos
+de topo do *Response (ex.: `fields=matricula,nome` para um dropdown) e a
+consulta seleciona só as colunas deles.
+
+Os campos vêm do `RESPONSE_COLUMNS` do service: cada coluna `relacao__campo`
+pertence ao campo aninhado `relacao` (ex.: `curso__nome` -> `curso`). Sem
+pedir `curso`, a consulta nem faz o JOIN em cursos; com `fields=matricula,nome`
+a listagem de alunos vira um único `SELECT matricula, nome FROM alunos`.
+
+O payload devolvido tem só os campos pedidos, então as rotas o serializam sem
+validar contra o *Response (`json_response(..., validate=False)`); o OpenAPI
+continua descrevendo o schema completo.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from fastapi import HTTPException, Query, status
+
+
+def response_fields(columns: Sequence[str]) -> List[str]:
+    """Campos de topo do *Response descritos por `columns` (RESPONSE_COLUMNS)."""
+    return list(dict.fromkeys(c.partition("__")[0] for c in columns))
+
+
+def select_columns(
+    columns: Sequence[str], fields: Optional[Sequence[str]]
+) -> Sequence[str]:
+    """Colunas de `columns` necessárias para `fields` (todas se None)."""
+    if fields is None:
+        return columns
+    return [c for c in columns if c.partition("__")[0] in fields]
+
+
+def parse_fields(columns: Sequence[str], fields: Optional[str]) -> Optional[List[str]]:
+    """Campos pedidos em `fields` (separados por vírgula), None se ausente, ou 400."""
+    if fields is None:
+        return None
+    permitidos = response_fields(columns)
+    pedidos = list(dict.fromkeys(filter(None, (f.strip() for f in fields.split(",")))))
+    invalidos = [f for f in pedidos if f not in permitidos]
+    if invalidos or not pedidos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"fields inválido: {', '.join(invalidos) or repr(fields)}. "
+                f"Permitidos: {', '.join(permitidos)}."
+            ),
+        )
+    return pedidos
+
+
+def trim(row: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Só as chaves de `fields` (na ordem da linha)."""
+    return {k: v for k, v in row.items() if k in fields}
+
+
+def fields_param(columns: Sequence[str]):
+    """Dependência: `?fields=` validado contra os campos de `columns`."""
+    descricao = "Campos a devolver, separados por vírgula: " + ", ".join(
+        response_fields(columns)
+    )
+
+    def dependency(
+        fields: Optional[str] = Query(None, description=descricao)
+    ) -> Optional[List[str]]:
+        return parse_fields(columns, fields)
+
+    return dependency
@@ -0,0 +1,198 @@
+# app/services/filtering.py
+"""
+Filtros e ordenação das listagens, conferidos contra os índices dos models.
+
+Cada service declara os filtros aceitos (`FilterSpec`, ex.:
+`AlunoService.FILTERS`). Na declaração, cada filtro é ligado ao índice que o
+atende, tirado da pk, de `unique_together` e de `Meta.indexes`:
+
+- a coluna precisa ser a primeira de um índice, ou vir depois de colunas que
+  também são filtros; nesse caso o filtro só é aceito junto delas (ex.:
+  turmas `curso_id` exige `periodo_letivo_id`, pelo índice
+  `(periodo_letivo_id, curso_id)`);
+- coluna sem índice só com `scan` explícito: "full" (tabela pequena, pode
+  ser varrida) ou "residual" (só junto de um filtro indexado, aplicado sobre
+  as linhas que o índice já selecionou, ex.: históricos por `situacao`).
+
+Um filtro sem índice e sem `scan` é erro de declaração (ValueError no
+import), então o custo de qualquer combinação aceita fica limitado pelos
+índices. O plano de cada filtro fica em `FilterSpec.plano` e vai na descrição
+do parâmetro no OpenAPI.
+
+Nas rotas, `filters_param(spec)` vira um parâmetro de query tipado por
+filtro e operador, na sintaxe do Tortoise: `curso_id=3`,
+`curso_id__in=1&curso_id__in=2`, `mgp__gte=7`.
+"""
+from __future__ import annotations
+
+import inspect
+from typing import (Any, Dict, List, Literal, NamedTuple, Optional, Sequence,
+                    Tuple, Type)
+
+from fastapi import HTTPException, Query, status
+from tortoise.models import Model
+
+Op = Literal["eq", "in", "gte", "lte"]
+Scan = Optional[Literal["full", "residual"]]
+
+# operadores que fixam o valor da coluna (servem de prefixo de índice)
+_IGUALDADE = ("eq", "in")
+
+
+class Filtro(NamedTuple):
+    campo: str  # coluna (ex.: "curso_id")
+    tipo: type = int
+    ops: Tuple[Op, ...] = ("eq", "in")
+    scan: Scan = None  # filtro sem índice (ver docstring do módulo)
+
+
+class Plano(NamedTuple):
+    indice: Tuple[str, ...]  # colunas do índice que atende o filtro
+    requer: Tuple[str, ...]  # colunas anteriores, filtradas por igualdade
+
+
+def model_indexes(model: Type[Model]) -> List[Tuple[str, ...]]:
+    """Colunas de cada índice do model: pk, únicos e `Meta.indexes`."""
+    meta = model._meta
+
+    def coluna(nome: str) -> str:
+        # antes do Tortoise.init a FK ainda não tem `source_field` nem a coluna
+        # `<fk>_id` em `fields_db_projection`
+        if nome in meta.fk_fields:
+            return meta.fields_map[nome].source_field or f"{nome}_id"
+        return meta.fields_db_projection.get(nome, nome)
+
+    indices = [(meta.db_pk_column,)]
+    indices += [
+        (coluna(nome),)
+        for nome, field in meta.fields_map.items()
+        if (field.index or field.unique) and nome in meta.fields_db_projection
+    ]
+    indices += [tuple(coluna(c) for c in cols) for cols in meta.unique_together]
+    indices += [tuple(coluna(c) for c in cols) for cols in meta.indexes]
+    return list(dict.fromkeys(indices))
+
+
+def _split(param: str) -> Tuple[str, Op]:
+    campo, _, op = param.partition("__")
+    return campo, op or "eq"
+
+
+class FilterSpec:
+    """
+    Filtros (`filtros`) e ordenações (`sorts`, colunas que começam um
+    índice) aceitos na listagem de `model`.
+    """
+
+    def __init__(
+        self,
+        model: Type[Model],
+        filtros: Sequence[Filtro] = (),
+        sorts: Sequence[str] = (),
+    ):
+        self.model = model
+        self.table = model._meta.db_table
+        self.indices = model_indexes(model)
+        self.filtros: Dict[str, Filtro] = {f.campo: f for f in filtros}
+        self.plano: Dict[str, Optional[Plano]] = {}
+        for f in filtros:
+            plano = self._plano(f.campo)
+            if plano is None and f.scan is None:
+                raise ValueError(
+                    f"{model.__name__}.{f.campo}: nenhum índice atende o filtro "
+                    "(declare scan='full' ou scan='residual' para aceitar)."
+                )
+            self.plano[f.campo] = plano
+        for sort in sorts:
+            if not any(indice[0] == sort for indice in self.indices):
+                raise ValueError(f"{model.__name__}.{sort}: ordenação sem índice.")
+        self.sorts = tuple(sorts)
+
+    def _plano(self, campo: str) -> Optional[Plano]:
+        # o índice em que a coluna aparece mais cedo, com as anteriores filtráveis
+        candidatos = [
+            Plano(indice, indice[: indice.index(campo)])
+            for indice in self.indices
+            if campo in indice
+            and all(c in self.filtros for c in indice[: indice.index(campo)])
+        ]
+        return min(candidatos, key=lambda p: len(p.requer), default=None)
+
+    def descricao(self, campo: str) -> str:
+        plano = self.plano[campo]
+        if plano is None:
+            if self.filtros[campo].scan == "residual":
+                return "sem índice: só junto de um filtro indexado"
+            return "sem índice (tabela pequena)"
+        texto = f"índice {self.table} ({', '.join(plano.indice)})"
+        if plano.requer:
+            texto += f"; exige também {', '.join(plano.requer)}"
+        return texto
+
+    def validate(self, valores: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Confere a combinação pedida (`{"curso_id__in": [1, 2]}`) contra o
+        plano de cada filtro; devolve os kwargs para `QuerySet.filter` ou 400.
+        """
+        if not valores:
+            return {}
+        campos = dict.fromkeys(_split(p)[0] for p in valores)
+        fixos = {c for c, op in map(_split, valores) if op in _IGUALDADE}
+        indexado = False
+        for campo in campos:
+            plano = self.plano[campo]
+            if plano is None:
+                continue
+            faltam = [c for c in plano.requer if c not in fixos]
+            if faltam:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        f"Filtro {campo} exige também {', '.join(faltam)} "
+                        f"(índice {self.table} ({', '.join(plano.indice)}))."
+                    ),
+                )
+            indexado = True
+        residuais = [c for c in campos if self.filtros[c].scan == "residual"]
+        if residuais and not indexado:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Filtro {', '.join(residuais)} (sem índice) só junto de um "
+                    f"filtro indexado: {', '.join(self._indexados())}."
+                ),
+            )
+        return valores
+
+    def _indexados(self) -> List[str]:
+        return [c for c, p in self.plano.items() if p is not None and not p.requer]
+
+    def apply(self, qs, filters: Optional[Dict[str, Any]]):
+        """`qs` com os filtros já validados (`filters_param`/`validate`)."""
+        return qs.filter(**filters) if filters else qs
+
+
+def filters_param(spec: FilterSpec):
+    """
+    Dependência com um parâmetro de query tipado por filtro e operador de
+    `spec`; devolve os filtros pedidos, validados (`FilterSpec.validate`).
+    """
+    params = []
+    for f in spec.filtros.values():
+        for op in f.ops:
+            nome = f.campo if op == "eq" else f"{f.campo}__{op}"
+            tipo = List[f.tipo] if op == "in" else f.tipo
+            params.append(
+                inspect.Parameter(
+                    nome,
+                    inspect.Parameter.KEYWORD_ONLY,
+                    default=Query(None, description=spec.descricao(f.campo)),
+                    annotation=Optional[tipo],
+                )
+            )
+
+    async def dependency(**valores: Any) -> Dict[str, Any]:
+        return spec.validate({k: v for k, v in valores.items() if v is not None})
+
+    dependency.__signature__ = inspect.Signature(params)
+    return dependency
@@ -0,0 +1,117 @@
+# app/services/loader.py
+"""
+DataLoader por requisição: junta as buscas por pk feitas pelos services e
+montadores de resposta e resolve cada model com uma única consulta `pk__in`.
+
+As buscas (`load` / `summary`) pedidas na mesma volta do event loop entram no
+mesmo lote; o lote é disparado com `call_soon`, depois que todas as corrotinas
+prontas daquela volta rodaram. Montando as respostas de uma página com
+`responses` (um `asyncio.gather`), cada relação aninhada vira uma consulta por
+página, e não uma por linha. Cada pk é buscada uma vez por requisição: a
+segunda busca da mesma chave reaproveita o resultado.
+
+Resumos das tabelas de referência (`summary`) passam pelo `reference_cache`,
+que só vai ao banco pelas chaves que ainda não tem.
+
+Nas rotas: `loader: DataLoader = Depends(get_loader)` (o FastAPI reaproveita a
+mesma instância para todas as dependências da requisição).
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from typing import (Any, Awaitable, Callable, Dict, Iterable, List, Optional,
+                    Set, Tuple, Type, TypeVar)
+
+from pydantic import BaseModel
+from tortoise.models import Model
+
+from app.services.cache import reference_cache
+
+M = TypeVar("M", bound=Model)
+R = TypeVar("R")
+
+_INSTANCIA, _RESUMO = "instancia", "resumo"
+_Chave = Tuple[str, Type[Model]]
+
+
+class DataLoader:
+    def __init__(self):
+        self._futures: Dict[_Chave, Dict[Any, asyncio.Future]] = defaultdict(dict)
+        self._fila: Dict[_Chave, List[Any]] = {}
+        # o loop só guarda referência fraca às tasks: sem esta, um lote em
+        # andamento pode ser coletado e deixar as buscas esperando para sempre
+        self._tasks: Set[asyncio.Task] = set()
+        self.lotes = 0  # lotes resolvidos (consultas, fora os hits de cache)
+
+    async def load(self, model: Type[M], pk: Any) -> Optional[M]:
+        """Instância do model com essa pk (None se não existe)."""
+        if pk is None:
+            return None
+        return await self._enqueue(_INSTANCIA, model, pk)
+
+    async def load_many(self, model: Type[M], pks: Iterable[Any]) -> List[Optional[M]]:
+        return list(await asyncio.gather(*(self.load(model, pk) for pk in pks)))
+
+    async def summary(self, model: Type[Model], pk: Any) -> Optional[BaseModel]:
+        """Resumo (CursoSummary, ...) de uma tabela do `reference_cache`."""
+        if pk is None:
+            return None
+        return await self._enqueue(_RESUMO, model, pk)
+
+    def _enqueue(self, tipo: str, model: Type[Model], pk: Any) -> asyncio.Future:
+        chave = (tipo, model)
+        futures = self._futures[chave]
+        future = futures.get(pk)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = futures[pk] = loop.create_future()
+            fila = self._fila.get(chave)
+            if fila is None:
+                fila = self._fila[chave] = []
+                loop.call_soon(self._dispatch, chave)
+            fila.append(pk)
+        return future
+
+    def _dispatch(self, chave: _Chave) -> None:
+        task = asyncio.ensure_future(self._resolve(chave, self._fila.pop(chave)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, chave: _Chave, pks: List[Any]) -> None:
+        tipo, model = chave
+        futures = self._futures[chave]
+        try:
+            if tipo == _RESUMO:
+                found = await reference_cache.get_many(model, pks)
+            else:
+                pk_attr = model._meta.pk_attr
+                found = {
+                    getattr(obj, pk_attr): obj
+                    for obj in await model.filter(**{f"{pk_attr}__in": pks})
+                }
+        except Exception as e:
+            # erro não fica em cache: a próxima busca tenta de novo
+            for pk in pks:
+                futures.pop(pk).set_exception(e)
+            return
+        self.lotes += 1
+        for pk in pks:
+            futures[pk].set_result(found.get(pk))
+
+
+def get_loader() -> DataLoader:
+    """Dependência FastAPI: um DataLoader novo por requisição."""
+    return DataLoader()
+
+
+async def responses(
+    build: Callable[[Any, DataLoader], Awaitable[R]],
+    rows: Iterable[Any],
+    loader: DataLoader,
+) -> List[R]:
+    """
+    `build(row, loader)` de todas as linhas ao mesmo tempo, para que as buscas
+    de cada relação caiam no mesmo lote.
+    """
+    return list(await asyncio.gather(*(build(row, loader) for row in rows)))
@@ -0,0 +1,202 @@
+# app/services/mgp.py
+"""
+MGP (média geral ponderada pelos créditos) e créditos integralizados do aluno,
+mantidos de forma incremental a partir das escritas em Histórico.
+
+Cada aluno guarda dois acumuladores, `mgp_pontos` (Σ média_final × créditos) e
+`mgp_creditos` (Σ créditos que entram na média). Uma escrita em Histórico
+aplica só a diferença entre a contribuição antiga e a nova da linha, então o
+custo não depende de quantos históricos o aluno tem.
+
+Recompute de reparo (a partir de backendunigrande/):
+    python -m app.services.mgp --batch-size 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from tortoise import Tortoise
+
+from app.models.unigrande import Aluno, Disciplina, Historico
+from app.services.cache import reference_cache
+from app.services.export import iter_chunks
+from app.services.versioning import table_versions
+
+# situações que entram na média e situações que integralizam créditos
+SITUACOES_MGP = frozenset({"AP", "RE"})
+SITUACOES_CREDITO = frozenset({"AP"})
+
+# alunos por lote no recompute completo
+RECOMPUTE_BATCH_SIZE = 1000
+
+_CENTAVOS = Decimal("0.01")
+
+
+class Lancamento(NamedTuple):
+    """Os campos de um Histórico que afetam a MGP do aluno."""
+
+    aluno_id: int
+    disciplina_id: int
+    situacao: str
+    media_final: Optional[Decimal]
+
+    @classmethod
+    def of(cls, historico: Historico) -> "Lancamento":
+        return cls(
+            historico.aluno_id,
+            historico.disciplina_id,
+            historico.situacao,
+            historico.media_final,
+        )
+
+
+class Acumulado(NamedTuple):
+    pontos: Decimal = Decimal("0")
+    creditos_mgp: int = 0
+    creditos: int = 0
+
+    def __add__(self, other: "Acumulado") -> "Acumulado":
+        return Acumulado(*(a + b for a, b in zip(self, other)))
+
+    def __neg__(self) -> "Acumulado":
+        return Acumulado(-self.pontos, -self.creditos_mgp, -self.creditos)
+
+
+def contribution(situacao: str, media_final, creditos: int) -> Acumulado:
+    """Quanto uma linha de histórico soma aos acumuladores do aluno."""
+    in_mgp = situacao in SITUACOES_MGP and media_final is not None
+    return Acumulado(
+        Decimal(media_final) * creditos if in_mgp else Decimal("0"),
+        creditos if in_mgp else 0,
+        creditos if situacao in SITUACOES_CREDITO else 0,
+    )
+
+
+def mgp_of(pontos: Decimal, creditos_mgp: int) -> Optional[Decimal]:
+    if not creditos_mgp:
+        return None
+    return (Decimal(pontos) / creditos_mgp).quantize(_CENTAVOS, ROUND_HALF_UP)
+
+
+class MgpService:
+    @staticmethod
+    async def apply_change(
+        before: Optional[Lancamento], after: Optional[Lancamento]
+    ) -> None:
+        """
+        Aplica a diferença entre a versão antiga (`before`) e a nova (`after`)
+        de um histórico; `None` para criação/remoção. Se o histórico mudou de
+        aluno, o antigo perde a contribuição e o novo ganha.
+        Deve rodar na mesma transação da escrita em Histórico.
+        """
+        deltas: Dict[int, Acumulado] = defaultdict(Acumulado)
+        for lancamento, sign in ((before, -1), (after, 1)):
+            if lancamento is None:
+                continue
+            disciplina = await reference_cache.summary(
+                Disciplina, lancamento.disciplina_id
+            )
+            part = contribution(
+                lancamento.situacao, lancamento.media_final, disciplina.creditos
+            )
+            deltas[lancamento.aluno_id] += part if sign > 0 else -part
+
+        for aluno_id, delta in deltas.items():
+            if delta != Acumulado():
+                await MgpService._apply_delta(aluno_id, delta)
+
+    @staticmethod
+    async def _apply_delta(aluno_id: int, delta: Acumulado) -> None:
+        # FOR UPDATE: duas escritas simultâneas do mesmo aluno não perdem delta
+        aluno = await Aluno.select_for_update().get_or_none(matricula=aluno_id)
+        if aluno is None:
+            return
+        aluno.mgp_pontos += delta.pontos
+        aluno.mgp_creditos += delta.creditos_mgp
+        aluno.total_creditos += delta.creditos
+        aluno.mgp = mgp_of(aluno.mgp_pontos, aluno.mgp_creditos)
+        await aluno.save(
+            update_fields=["mgp_pontos", "mgp_creditos", "total_creditos", "mgp"]
+        )
+        table_versions.bump(Aluno)
+
+    @staticmethod
+    async def recompute(matriculas: Iterable[int]) -> int:
+        """
+        Refaz do zero os acumuladores dos alunos informados a partir de todos os
+        seus históricos: uma consulta de leitura e um UPDATE em lote.
+        """
+        matriculas = list(set(matriculas))
+        if not matriculas:
+            return 0
+        rows = await Historico.filter(aluno_id__in=matriculas).values(
+            "aluno_id", "situacao", "media_final", creditos="disciplina__creditos"
+        )
+        totals: Dict[int, Acumulado] = defaultdict(Acumulado)
+        for row in rows:
+            totals[row["aluno_id"]] += contribution(
+                row["situacao"], row["media_final"], row["creditos"]
+            )
+
+        alunos: List[Aluno] = []
+        for matricula in matriculas:
+            total = totals[matricula]
+            alunos.append(
+                Aluno(
+                    matricula=matricula,
+                    mgp_pontos=total.pontos,
+                    mgp_creditos=total.creditos_mgp,
+                    total_creditos=total.creditos,
+                    mgp=mgp_of(total.pontos, total.creditos_mgp),
+                )
+            )
+        await Aluno.bulk_update(
+            alunos,
+            fields=["mgp_pontos", "mgp_creditos", "total_creditos", "mgp"],
+            batch_size=len(alunos),
+        )
+        table_versions.bump(Aluno)
+        return len(alunos)
+
+    @staticmethod
+    async def recompute_all(batch_size: int = RECOMPUTE_BATCH_SIZE) -> int:
+        """
+        Reparo: percorre todos os alunos em lotes por keyset na matrícula e
+        recalcula cada lote; memória e tamanho de transação ficam limitados
+        ao lote, qualquer que seja o tamanho das tabelas.
+        """
+        total = 0
+        async for rows in iter_chunks(
+            Aluno.all(), "matricula", "matricula", chunk_size=batch_size
+        ):
+            total += await MgpService.recompute(r["matricula"] for r in rows)
+        return total
+
+
+async def run(db_url: str, batch_size: int) -> None:
+    await Tortoise.init(db_url=db_url, modules={"models": ["app.models.tortoise"]})
+    try:
+        start = time.perf_counter()
+        total = await MgpService.recompute_all(batch_size)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{total} alunos recalculados em {elapsed:.2f}s"
+            f" ({total / elapsed if elapsed else 0:,.0f} alunos/s)"
+        )
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    from app.config.db import DATABASE_URL
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument("--db-url", default=DATABASE_URL)
+    parser.add_argument("--batch-size", type=int, default=RECOMPUTE_BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(run(args.db_url, args.batch_size))
@@ -0,0 +1,162 @@
+# app/services/pagination.py
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from tortoise.expressions import Q
+from tortoise.queryset import QuerySet
+
+from app.schemas.unigrande import CountModeLiteral
+from app.services.counting import count_provider
+
+# tamanho padrão e máximo de página nas listagens por cursor
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 200
+
+
+# =========================
+# Cursor opaco
+# =========================
+def encode_cursor(direction: str, sort: str, key: Sequence[Any]) -> str:
+    """
+    Codifica a posição da página em base64 url-safe.
+    `direction` é "next" ou "prev"; `key` é (valor da ordenação, pk) da linha de borda.
+    """
+    raw = json.dumps({"d": direction, "s": sort, "k": list(key)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[str, List[Any]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, cursor_sort, key = data["d"], data["s"], data["k"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+        )
+    if direction not in ("next", "prev") or not isinstance(key, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+        )
+    if cursor_sort != sort:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor gerado para outra ordenação.",
+        )
+    return direction, key
+
+
+# =========================
+# Paginação keyset
+# =========================
+class Page(NamedTuple):
+    rows: List[Any]
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+    total: Optional[int]
+    total_mode: Optional[CountModeLiteral]
+
+
+def _after(sort: str, pk: str, key: List[Any], op: str) -> Q:
+    """
+    Condição "depois de `key`" na ordem (sort, pk); `op` é "gt" ou "lt".
+    Para ordenação pela própria pk vira um simples `pk > x`.
+    """
+    if sort == pk:
+        return Q(**{f"{pk}__{op}": key[-1]})
+    value, pk_value = key
+    return Q(**{f"{sort}__{op}": value}) | Q(**{sort: value, f"{pk}__{op}": pk_value})
+
+
+async def keyset_page(
+    qs: QuerySet,
+    *,
+    pk: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    allowed_sorts: Sequence[str] = (),
+    with_total: bool = False,
+    count_mode: CountModeLiteral = "exact",
+    values: Optional[Sequence[str]] = None,
+    filtered: bool = False,
+) -> Page:
+    """
+    Pagina `qs` por keyset (WHERE chave > última vista ORDER BY chave LIMIT n),
+    ordenando por `sort` (coluna indexada) com desempate pela pk.
+    Qualquer página custa o mesmo que a primeira; o total da tabela só é
+    obtido com `with_total`, pelo `count_provider` no modo `count_mode`.
+    Com `values`, as linhas são dicts de `.values()` com essas colunas (mais
+    as da ordenação, usadas nos cursores). Com `filtered` (qs filtrado), o
+    total é o COUNT(*) exato do próprio `qs`, não o da tabela.
+    """
+    sort = sort or pk
+    if sort != pk and sort not in allowed_sorts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Ordenação não permitida: {sort}.",
+        )
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    order = [sort, pk] if sort != pk else [pk]
+
+    total = total_mode = None
+    if with_total and filtered:
+        total, total_mode = await qs.count(), "exact"
+    elif with_total:
+        total, total_mode = await count_provider.count(qs.model, count_mode)
+
+    direction, key = ("next", None)
+    if cursor:
+        direction, key = decode_cursor(cursor, sort)
+        if len(key) != len(order):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor inválido."
+            )
+
+    page_qs = qs
+    if direction == "next":
+        if key is not None:
+            page_qs = page_qs.filter(_after(sort, pk, key, "gt"))
+        page_qs = page_qs.order_by(*order)
+    else:
+        page_qs = page_qs.filter(_after(sort, pk, key, "lt"))
+        page_qs = page_qs.order_by(*[f"-{f}" for f in order])
+
+    page_qs = page_qs.limit(limit + 1)
+    if values is not None:
+        page_qs = page_qs.values(*dict.fromkeys([*values, *order]))
+    rows = list(await page_qs)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+
+    next_cursor, prev_cursor = _edge_cursors(
+        rows, direction, sort, order, has_more, came_from_cursor=key is not None
+    )
+    return Page(rows, next_cursor, prev_cursor, total, total_mode)
+
+
+def _edge_cursors(rows, direction, sort, order, has_more, came_from_cursor):
+    """
+    Cursores da página: indo para frente, há anterior sempre que viemos de um
+    cursor; voltando, há próxima sempre (é a página de onde viemos).
+    """
+    if not rows:
+        return None, None
+
+    def key_of(obj) -> List[Any]:
+        if isinstance(obj, dict):
+            return [obj[f] for f in order]
+        return [getattr(obj, f) for f in order]
+
+    first = encode_cursor("prev", sort, key_of(rows[0]))
+    last = encode_cursor("next", sort, key_of(rows[-1]))
+    if direction == "next":
+        return (last if has_more else None), (first if came_from_cursor else None)
+    return last, (first if has_more else None)
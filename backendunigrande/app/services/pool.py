@@ -0,0 +1,103 @@
+# app/services/pool.py
+"""
+Pool de conexões do Postgres com métricas.
+
+Engine do Tortoise (`"engine": "app.services.pool"`, montado por
+`app/config/db.py:db_config`): o cliente asyncpg do Tortoise, com o pool
+embrulhado em `PoolMonitorado`. Toda aquisição de conexão (consultas e
+transações) passa por `acquire()`, que mede quanto o pedido esperou por uma
+conexão e quantos pedidos estão esperando no momento.
+
+As métricas (`stats()`, em `/metricas/pool-conexoes`) são do processo atual e
+zeram no restart; com vários workers, cada um tem o seu pool.
+"""
+from __future__ import annotations
+
+import bisect
+import time
+from typing import Any, Dict, Optional
+
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+
+# limites (ms) das faixas do histograma de espera por conexão
+LATENCIA_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class PoolMonitorado:
+    """
+    `asyncpg.Pool` com contadores: `acquire()` é medido, o resto é repassado
+    ao pool original.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self.aguardando = 0
+        self.aquisicoes = 0
+        self.falhas = 0
+        self._buckets = [0] * (len(LATENCIA_BUCKETS_MS) + 1)
+        self._espera_total = 0.0
+        self._espera_max = 0.0
+
+    def __getattr__(self, nome: str) -> Any:
+        return getattr(self._pool, nome)
+
+    async def acquire(self, *, timeout: Optional[float] = None):
+        inicio = time.perf_counter()
+        self.aguardando += 1
+        try:
+            connection = await self._pool.acquire(timeout=timeout)
+        except BaseException:
+            self.falhas += 1
+            raise
+        finally:
+            self.aguardando -= 1
+        self._registrar((time.perf_counter() - inicio) * 1000)
+        return connection
+
+    def _registrar(self, espera_ms: float) -> None:
+        self.aquisicoes += 1
+        self._espera_total += espera_ms
+        self._espera_max = max(self._espera_max, espera_ms)
+        self._buckets[bisect.bisect_left(LATENCIA_BUCKETS_MS, espera_ms)] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        tamanho = self._pool.get_size()
+        ociosas = self._pool.get_idle_size()
+        faixas = [f"<={limite}" for limite in LATENCIA_BUCKETS_MS] + ["+inf"]
+        espera: Dict[str, Any] = {"amostras": self.aquisicoes}
+        if self.aquisicoes:
+            espera["media_ms"] = round(self._espera_total / self.aquisicoes, 2)
+            espera["max_ms"] = round(self._espera_max, 2)
+        espera["histograma_ms"] = dict(zip(faixas, self._buckets))
+        return {
+            "min": self._pool.get_min_size(),
+            "max": self._pool.get_max_size(),
+            "tamanho": tamanho,
+            "em_uso": tamanho - ociosas,
+            "ociosas": ociosas,
+            "aguardando": self.aguardando,
+            "falhas": self.falhas,
+            "espera": espera,
+        }
+
+
+class MonitoredAsyncpgDBClient(AsyncpgDBClient):
+    async def create_pool(self, **kwargs) -> PoolMonitorado:
+        pool = PoolMonitorado(await super().create_pool(**kwargs))
+        pools[self.connection_name] = pool
+        return pool
+
+    async def _close(self) -> None:
+        pools.pop(self.connection_name, None)
+        await super()._close()
+
+
+# pools abertos, por nome da conexão do Tortoise
+pools: Dict[str, PoolMonitorado] = {}
+
+client_class = MonitoredAsyncpgDBClient
+
+
+def stats() -> Dict[str, Any]:
+    """Métricas de cada pool aberto (vazio sem Postgres, ex.: testes)."""
+    return {nome: pool.stats() for nome, pool in pools.items()}
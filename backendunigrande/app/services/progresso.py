@@ -0,0 +1,122 @@
+# app/services/progresso.py
+"""
+Progresso curricular: compara a matriz do curso (Matriz) com as disciplinas em
+que o aluno já foi aprovado (Histórico AP).
+
+A matriz de cada curso fica em cache como `{disciplina_id: periodo}`; o resto
+é operação de conjunto sobre os `disciplina_id` aprovados. "Atrasada" é a
+disciplina pendente cujo período na matriz é menor ou igual ao número de
+períodos letivos que o aluno já cursou.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, List, Set
+
+from fastapi import HTTPException, status
+
+from app.models.unigrande import Aluno, Curso, Historico, Matriz
+from app.schemas.unigrande import AlunoSummary, ProgressoCurricular
+from app.services.cache import curriculo_cache, reference_cache
+
+SITUACAO_CONCLUIDA = "AP"
+
+
+def _progresso(
+    aluno: AlunoSummary,
+    curso_id: int,
+    curriculo: Dict[int, int],
+    aprovadas: Set[int],
+    semestres: int,
+) -> ProgressoCurricular:
+    concluidas = curriculo.keys() & aprovadas
+    pendentes = curriculo.keys() - aprovadas
+    atrasadas = {d for d in pendentes if curriculo[d] <= semestres}
+    total = len(curriculo)
+    return ProgressoCurricular(
+        aluno=aluno,
+        curso_id=curso_id,
+        semestres_cursados=semestres,
+        total=total,
+        concluidas=sorted(concluidas),
+        pendentes=sorted(pendentes),
+        atrasadas=sorted(atrasadas),
+        percentual=round(100 * len(concluidas) / total, 2) if total else 0.0,
+    )
+
+
+class ProgressoService:
+    @staticmethod
+    async def curriculo(curso_id: int) -> Dict[int, int]:
+        """Matriz do curso como `{disciplina_id: periodo}` (em cache)."""
+        curriculo = curriculo_cache.get(curso_id)
+        if curriculo is None:
+            curriculo = dict(
+                await Matriz.filter(curso_id=curso_id).values_list(
+                    "disciplina_id", "periodo"
+                )
+            )
+            curriculo_cache.set(curso_id, curriculo)
+        return curriculo
+
+    @staticmethod
+    async def do_aluno(matricula: int) -> ProgressoCurricular:
+        aluno = await Aluno.get_or_none(matricula=matricula)
+        if aluno is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Aluno não encontrado."
+            )
+        curriculo = await ProgressoService.curriculo(aluno.curso_id)
+        historicos = await Historico.filter(aluno_id=matricula).values_list(
+            "disciplina_id", "situacao", "periodo_letivo_id"
+        )
+        aprovadas = {d for d, s, _ in historicos if s == SITUACAO_CONCLUIDA}
+        semestres = len({pl for _, _, pl in historicos})
+        return _progresso(
+            AlunoSummary(matricula=aluno.matricula, nome=aluno.nome),
+            aluno.curso_id,
+            curriculo,
+            aprovadas,
+            semestres,
+        )
+
+    @staticmethod
+    async def do_curso(curso_id: int) -> List[ProgressoCurricular]:
+        """
+        Progresso de todos os alunos do curso com três consultas (alunos,
+        disciplinas aprovadas e períodos cursados), qualquer que seja o número
+        de alunos, mais curso e matriz quando não estão em cache.
+        """
+        if await reference_cache.summary(Curso, curso_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Curso não encontrado."
+            )
+        curriculo = await ProgressoService.curriculo(curso_id)
+        alunos = (
+            await Aluno.filter(curso_id=curso_id)
+            .order_by("matricula")
+            .values("matricula", "nome")
+        )
+
+        do_curso = Historico.filter(aluno__curso_id=curso_id)
+        aprovadas: Dict[int, Set[int]] = defaultdict(set)
+        for aluno_id, disciplina_id in await do_curso.filter(
+            situacao=SITUACAO_CONCLUIDA
+        ).values_list("aluno_id", "disciplina_id"):
+            aprovadas[aluno_id].add(disciplina_id)
+        semestres: Dict[int, int] = defaultdict(int)
+        for aluno_id, _ in await do_curso.distinct().values_list(
+            "aluno_id", "periodo_letivo_id"
+        ):
+            semestres[aluno_id] += 1
+
+        return [
+            _progresso(
+                AlunoSummary(**a),
+                curso_id,
+                curriculo,
+                aprovadas[a["matricula"]],
+                semestres[a["matricula"]],
+            )
+            for a in alunos
+        ]
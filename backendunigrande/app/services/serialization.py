@@ -0,0 +1,52 @@
+# app/services/serialization.py
+"""
+Serialização das respostas de listagem em uma passada.
+
+Quando a rota devolve o valor para o FastAPI, ele é validado de novo contra o
+`response_model` (mesmo que já sejam instâncias do schema), convertido pelo
+`jsonable_encoder` e só então codificado pelo `json` da stdlib, tudo em Python
+e linha a linha. `json_response` valida o conteúdo uma vez com um
+`TypeAdapter` do mesmo schema (instâncias do schema não são revalidadas) e
+gera o JSON no pydantic-core.
+
+Linhas de `.values()` já projetadas exatamente nos campos do schema
+(`list_values` dos services, conferido em tests/test_serialization.py) podem
+pular também essa validação (`validate=False`) e vão direto para o encoder.
+
+A rota continua declarando `response_model` no decorador, então o OpenAPI não
+muda; como o `Response` é devolvido pronto, o ETag vem da dependência
+(`etag: str = etag_x`) e vai no próprio header.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def json_response(
+    schema: Any, content: Any, etag: Optional[str] = None, *, validate: bool = True
+) -> Response:
+    """
+    `content` (dicts, instâncias do schema ou objetos com os atributos)
+    serializado como `schema`, ex.: `List[AlunoResponse]`. Com
+    `validate=False`, `content` já precisa estar no formato do schema.
+    """
+    if validate:
+        adapter = _adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    else:
+        body = to_json(content)
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"ETag": etag} if etag is not None else None,
+    )
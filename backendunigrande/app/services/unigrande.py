@@ -1,33 +1,68 @@
 # app/services/unigrande.py
 from __future__ import annotations
 
+from decimal import Decimal
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
 from fastapi import HTTPException, status
+from pypika_tortoise.functions import Count
+from pypika_tortoise.terms import Star
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import F
+from tortoise.models import Model
+from tortoise.transactions import in_transaction
 
 from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
                                   Matricula, Matriz, PeriodoLetivo, Professor,
                                   Turma)
-from app.schemas.unigrande import (AlunoCreate, AlunoResponse, AlunoSummary,
-                                   AlunoUpdate, CursoCreate, CursoResponse,
-                                   CursoSummary, CursoUpdate, DisciplinaCreate,
-                                   DisciplinaResponse, DisciplinaSummary,
+from app.schemas.unigrande import (AlunoBulkRowResult, AlunoCreate,
+                                   AlunoResponse, AlunoSummary, AlunoUpdate,
+                                   CountModeLiteral, CursoCreate,
+                                   CursoResponse, CursoUpdate,
+                                   DisciplinaCreate, DisciplinaResponse,
                                    DisciplinaUpdate, HistoricoCreate,
-                                   HistoricoResponse, HistoricoUpdate,
-                                   MatriculaCreate, MatriculaResponse,
-                                   MatriculaUpdate, MatrizCreate,
-                                   MatrizResponse, MatrizUpdate,
-                                   PeriodoLetivoCreate, PeriodoLetivoResponse,
-                                   PeriodoLetivoSummary, PeriodoLetivoUpdate,
+                                   HistoricoEscolar, HistoricoEscolarItem,
+                                   HistoricoEscolarPeriodo, HistoricoResponse,
+                                   HistoricoUpdate, MatriculaCreate,
+                                   MatriculaResponse, MatriculaUpdate,
+                                   MatrizCreate, MatrizResponse, MatrizUpdate,
+                                   PautaLinha, PeriodoLetivoCreate,
+                                   PeriodoLetivoResponse, PeriodoLetivoUpdate,
                                    ProfessorCreate, ProfessorResponse,
-                                   ProfessorSummary, ProfessorUpdate,
-                                   TurmaCreate, TurmaResponse, TurmaSummary,
-                                   TurmaUpdate)
+                                   ProfessorUpdate, TurmaCreate, TurmaResponse,
+                                   TurmaSummary, TurmaUpdate)
+from app.services.busca import name_index
+from app.services.cache import (curriculo_cache, historico_escolar_cache,
+                                reference_cache)
+from app.services.counting import count_provider
+from app.services.estatisticas import (Contagem, EstatisticaService,
+                                       LinhaHistorico, LinhaMatricula)
+from app.services.export import EXPORT_CHUNK_SIZE, iter_chunks
+from app.services.fieldsets import select_columns, trim
+from app.services.filtering import FilterSpec, Filtro
+from app.services.loader import DataLoader
+from app.services.mgp import (Acumulado, Lancamento, MgpService, contribution,
+                              mgp_of)
+from app.services.pagination import DEFAULT_PAGE_SIZE, Page, keyset_page
+from app.services.versioning import table_versions
+
+# linhas por INSERT nas cargas em lote (bulk_create)
+BULK_BATCH_SIZE = 1000
 
 
 # =========================
 # Funções utilitárias comuns
 # =========================
-async def _ensure_exists(model, **filters):
-    obj = await model.get_or_none(**filters)
+async def _ensure_exists(model, loader: Optional[DataLoader] = None, **filters):
+    """
+    Objeto que atende `filters` ou 404. Com `loader` e busca só pela pk, a
+    consulta entra no lote (e no cache) da requisição.
+    """
+    if loader is not None and list(filters) == [model._meta.pk_attr]:
+        obj = await loader.load(model, filters[model._meta.pk_attr])
+    else:
+        obj = await model.get_or_none(**filters)
     if not obj:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -36,23 +71,163 @@ async def _ensure_exists(model, **filters):
     return obj
 
 
+async def _ensure_exists_all(*refs: Tuple[Type[Model], Any]) -> None:
+    """
+    Valida várias FKs de um payload numa única consulta.
+
+    Cada ref é `(Model, pk)`; refs com pk `None` (FK opcional ausente) são
+    ignoradas. Gera um único `SELECT (SELECT COUNT(*) ...) AS r0, ...` e, se
+    alguma chave não existir, levanta o mesmo 404 de `_ensure_exists` para a
+    primeira FK ausente, na ordem em que foram passadas.
+    Chaves de tabelas de referência já presentes no `reference_cache` não
+    vão ao banco.
+    """
+    refs = tuple(
+        (model, pk)
+        for model, pk in refs
+        if pk is not None
+        and not (reference_cache.handles(model) and reference_cache.cached(model, pk))
+    )
+    if not refs:
+        return
+
+    db = refs[0][0]._meta.db
+    terms = []
+    for i, (model, pk) in enumerate(refs):
+        table = model._meta.basetable
+        subquery = (
+            db.query_class.from_(table)
+            .select(Count(Star()))
+            .where(table[model._meta.db_pk_column] == pk)
+        )
+        terms.append(subquery.as_(f"r{i}"))
+    sql, params = db.query_class.select(*terms).get_parameterized_sql()
+    row = (await db.execute_query_dict(sql, params))[0]
+
+    for i, (model, _) in enumerate(refs):
+        if not row[f"r{i}"]:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{model.__name__} não encontrado.",
+            )
+
+
+def _is_unique_violation(exc: IntegrityError) -> bool:
+    """
+    Violação de pk/unique (SQLSTATE 23505 no Postgres, "UNIQUE constraint" no
+    SQLite), em oposição a FK/NOT NULL, que seguem como IntegrityError.
+    """
+    cause = exc.args[0] if exc.args else exc
+    return getattr(cause, "sqlstate", None) == "23505" or "UNIQUE constraint" in str(
+        cause
+    )
+
+
+async def _insert(obj: Model, conflict_detail: str) -> Model:
+    """
+    Grava `obj` com um único INSERT e deixa a unicidade com as constraints do
+    banco (pk / unique_together): sem SELECT prévio e sem a janela em que duas
+    requisições passam juntas pela checagem. Violação de unique vira 409 com
+    `conflict_detail`. No Postgres o erro invalida a transação corrente, que
+    quem chama deve descartar (os routers fazem isso ao repassar a exceção).
+    """
+    try:
+        await obj.save(force_create=True)
+    except IntegrityError as e:
+        if _is_unique_violation(e):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT, detail=conflict_detail
+            )
+        raise
+    return obj
+
+
+async def _prime_references(rows, *refs: Tuple[Type[Model], str]) -> None:
+    """
+    Carrega no `reference_cache` os resumos usados por `rows` (uma consulta por
+    tabela, só para as chaves ausentes), para que `response` não vá ao banco
+    linha a linha. Cada ref é `(Model, atributo_fk)`.
+    """
+    for model, attr in refs:
+        await reference_cache.prime(model, (getattr(row, attr) for row in rows))
+
+
+async def _alunos_com_historico(**filters: Any) -> List[int]:
+    """Matrículas dos alunos com algum histórico que atenda `filters`."""
+    return await (
+        Historico.filter(**filters).distinct().values_list("aluno_id", flat=True)
+    )
+
+
+def _nest_rows(rows: List[dict]) -> List[dict]:
+    """
+    Converte linhas de `.values()` com colunas `relacao__campo` em dicts
+    aninhados no formato dos *Response: {"curso": {"id": .., "nome": ..}}.
+    Relação opcional ausente (LEFT JOIN sem par) vira None.
+    """
+    nested_rows = []
+    for row in rows:
+        out, related = {}, {}
+        for key, value in row.items():
+            rel, sep, field = key.partition("__")
+            if sep:
+                related.setdefault(rel, {})[field] = value
+            else:
+                out[key] = value
+        for rel, fields in related.items():
+            out[rel] = fields if any(v is not None for v in fields.values()) else None
+        nested_rows.append(out)
+    return nested_rows
+
+
+async def _values(
+    qs, columns: Sequence[str], fields: Optional[Sequence[str]] = None
+) -> List[dict]:
+    """
+    Linhas de `qs` no formato do *Response, só com as colunas de `fields`
+    (campos de topo; todos se None). Relações não pedidas ficam fora do SELECT.
+    """
+    return _nest_rows(await qs.values(*select_columns(columns, fields)))
+
+
+async def _get_values(
+    model, columns: Sequence[str], fields: Optional[Sequence[str]], **filters
+) -> dict:
+    """Como `_values` para o objeto que atende `filters`, ou 404."""
+    rows = await _values(model.filter(**filters), columns, fields)
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{model.__name__} não encontrado.",
+        )
+    return rows[0]
+
+
+def _page_columns(
+    columns: Sequence[str], fields: Optional[Sequence[str]]
+) -> Optional[Sequence[str]]:
+    # `values` do keyset_page: None (models) quando não há `fields`
+    return None if fields is None else select_columns(columns, fields)
+
+
+def _sparse_page(page: Page, fields: Sequence[str]) -> Page:
+    # as linhas trazem também as colunas da ordenação (usadas nos cursores)
+    return page._replace(rows=[trim(row, fields) for row in _nest_rows(page.rows)])
+
+
 # =========================
 # PeriodoLetivo
 # =========================
 class PeriodoLetivoService:
+    RESPONSE_COLUMNS = ("id", "ano", "semestre", "data_inicio", "data_fim")
+
     @staticmethod
     async def create(payload: PeriodoLetivoCreate) -> PeriodoLetivo:
-        # unique (ano, semestre)
-        exists = await PeriodoLetivo.get_or_none(
-            ano=payload.ano, semestre=payload.semestre
-        )
-        if exists:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Período letivo já existe para (ano, semestre).",
-            )
         obj = PeriodoLetivo(**payload.model_dump())
-        await obj.save()
+        await _insert(obj, "Período letivo já existe para (ano, semestre).")
+        count_provider.invalidate(PeriodoLetivo)
+        table_versions.bump(PeriodoLetivo)
+        reference_cache.invalidate(PeriodoLetivo, obj.id)
         return obj
 
     @staticmethod
@@ -72,21 +247,55 @@ class PeriodoLetivoService:
         for k, v in data.items():
             setattr(obj, k, v)
         await obj.save()
+        table_versions.bump(PeriodoLetivo)
+        reference_cache.invalidate(PeriodoLetivo, id_)
+        historico_escolar_cache.clear()
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(PeriodoLetivo, id=id_)
+        # os históricos do período somem em cascata
+        afetados = await _alunos_com_historico(periodo_letivo_id=id_)
         await obj.delete()
+        await MgpService.recompute(afetados)
+        count_provider.invalidate(PeriodoLetivo)
+        table_versions.bump(PeriodoLetivo)
+        reference_cache.invalidate(PeriodoLetivo, id_)
+        historico_escolar_cache.clear()
 
     @staticmethod
-    async def get(id_: int) -> PeriodoLetivo:
-        return await _ensure_exists(PeriodoLetivo, id=id_)
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> PeriodoLetivo:
+        return await _ensure_exists(PeriodoLetivo, loader, id=id_)
 
     @staticmethod
     async def list_all():
         return await PeriodoLetivo.all()
 
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+    ):
+        return await keyset_page(
+            PeriodoLetivo.all(),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+        )
+
+    @staticmethod
+    async def list_values(fields: Optional[Sequence[str]] = None) -> List[dict]:
+        return await _values(
+            PeriodoLetivo.all(), PeriodoLetivoService.RESPONSE_COLUMNS, fields
+        )
+
     @staticmethod
     async def response(obj: PeriodoLetivo) -> PeriodoLetivoResponse:
         return PeriodoLetivoResponse(
@@ -102,15 +311,17 @@ class PeriodoLetivoService:
 # Professor
 # =========================
 class ProfessorService:
+    RESPONSE_COLUMNS = ("id", "matricula", "nome")
+    FILTERS = FilterSpec(Professor, sorts=("nome",))
+
     @staticmethod
     async def create(payload: ProfessorCreate) -> Professor:
-        exists = await Professor.get_or_none(id=payload.id)
-        if exists:
-            raise HTTPException(
-                status_code=409, detail="Professor com este ID já existe."
-            )
         obj = Professor(**payload.model_dump())
-        await obj.save()
+        await _insert(obj, "Professor com este ID já existe.")
+        count_provider.invalidate(Professor)
+        table_versions.bump(Professor)
+        reference_cache.invalidate(Professor, obj.id)
+        name_index.add(Professor, obj.id, obj.nome)
         return obj
 
     @staticmethod
@@ -119,21 +330,69 @@ class ProfessorService:
         for k, v in payload.model_dump(exclude_unset=True).items():
             setattr(obj, k, v)
         await obj.save()
+        table_versions.bump(Professor)
+        reference_cache.invalidate(Professor, id_)
+        name_index.add(Professor, id_, obj.nome)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Professor, id=id_)
         await obj.delete()
+        count_provider.invalidate(Professor)
+        table_versions.bump(Professor)
+        reference_cache.invalidate(Professor, id_)
+        name_index.remove(Professor, id_)
 
     @staticmethod
-    async def get(id_: int) -> Professor:
-        return await _ensure_exists(Professor, id=id_)
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Professor:
+        return await _ensure_exists(Professor, loader, id=id_)
+
+    @staticmethod
+    async def get_values(id_: int, fields: Optional[Sequence[str]] = None) -> dict:
+        return await _get_values(
+            Professor, ProfessorService.RESPONSE_COLUMNS, fields, id=id_
+        )
 
     @staticmethod
     async def list_all():
         return await Professor.all()
 
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        page = await keyset_page(
+            ProfessorService.FILTERS.apply(Professor.all(), filters),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            allowed_sorts=ProfessorService.FILTERS.sorts,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+            values=_page_columns(ProfessorService.RESPONSE_COLUMNS, fields),
+        )
+        return page if fields is None else _sparse_page(page, fields)
+
+    @staticmethod
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        return await _values(
+            ProfessorService.FILTERS.apply(Professor.all(), filters),
+            ProfessorService.RESPONSE_COLUMNS,
+            fields,
+        )
+
     @staticmethod
     async def response(obj: Professor) -> ProfessorResponse:
         return ProfessorResponse(id=obj.id, matricula=obj.matricula, nome=obj.nome)
@@ -143,20 +402,34 @@ class ProfessorService:
 # Curso
 # =========================
 class CursoService:
+    RESPONSE_COLUMNS = (
+        "id",
+        "nome",
+        "total_creditos",
+        "coordenador_id",
+        "coordenador__id",
+        "coordenador__nome",
+    )
+    FILTERS = FilterSpec(
+        Curso,
+        # poucas linhas: o filtro por coordenador pode varrer a tabela
+        [Filtro("coordenador_id", scan="full")],
+        sorts=("nome",),
+    )
+
     @staticmethod
     async def create(payload: CursoCreate) -> Curso:
-        if payload.coordenador_id:
-            await _ensure_exists(Professor, id=payload.coordenador_id)
-        exists = await Curso.get_or_none(id=payload.id)
-        if exists:
-            raise HTTPException(status_code=409, detail="Curso com este ID já existe.")
+        await _ensure_exists_all((Professor, payload.coordenador_id or None))
         obj = Curso(
             id=payload.id,
             nome=payload.nome,
             total_creditos=payload.total_creditos,
             coordenador_id=payload.coordenador_id or None,
         )
-        await obj.save()
+        await _insert(obj, "Curso com este ID já existe.")
+        count_provider.invalidate(Curso)
+        table_versions.bump(Curso)
+        reference_cache.invalidate(Curso, obj.id)
         return obj
 
     @staticmethod
@@ -166,7 +439,7 @@ class CursoService:
 
         # Se coordenador_id veio não-nulo, valide existência
         if "coordenador_id" in data and data["coordenador_id"] is not None:
-            await _ensure_exists(Professor, id=data["coordenador_id"])
+            await _ensure_exists_all((Professor, data["coordenador_id"]))
 
         # Se explicitamente vier null, limpe a FK (deixe sem coordenador)
         if "coordenador_id" in data and data["coordenador_id"] is None:
@@ -177,37 +450,99 @@ class CursoService:
             setattr(obj, k, v)
 
         await obj.save()
+        table_versions.bump(Curso)
+        reference_cache.invalidate(Curso, id_)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Curso, id=id_)
-        await obj.delete()
+        alunos = await Aluno.filter(curso_id=id_).values_list("matricula", flat=True)
+        # as linhas do resumo do curso somem em cascata; as das turmas de
+        # outros cursos em que os alunos estão matriculados são recalculadas
+        chaves = {
+            chave
+            for chave in await Matricula.filter(aluno__curso_id=id_).values_list(
+                "turma__periodo_letivo_id", "turma__curso_id", "turma__disciplina_id"
+            )
+            if chave[1] != id_
+        }
+        async with in_transaction():
+            # os alunos do curso e as matrículas deles (inclusive em turmas de
+            # outros cursos) somem em cascata
+            await _devolver_vagas(Matricula.filter(aluno__curso_id=id_))
+            await obj.delete()
+        await EstatisticaService.refresh(chaves)
+        for matricula in alunos:
+            name_index.remove(Aluno, matricula)
+        # a cascata leva alunos (com históricos e matrículas), turmas e matriz
+        for model in (Curso, Aluno, Historico, Matricula, Turma, Matriz):
+            count_provider.invalidate(model)
+            table_versions.bump(model)
+        reference_cache.invalidate(Curso, id_)
+        curriculo_cache.invalidate(id_)
+        historico_escolar_cache.clear()
 
     @staticmethod
-    async def get(id_: int):
-        obj = await Curso.get_or_none(id=id_).prefetch_related("coordenador")
-        if not obj:
-            raise HTTPException(status_code=404, detail="Curso não encontrado.")
-        return obj
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Curso:
+        return await _ensure_exists(Curso, loader, id=id_)
+
+    @staticmethod
+    async def get_values(id_: int, fields: Optional[Sequence[str]] = None) -> dict:
+        return await _get_values(Curso, CursoService.RESPONSE_COLUMNS, fields, id=id_)
 
     @staticmethod
     async def list_all():
-        return await Curso.all().prefetch_related("coordenador")
+        rows = await Curso.all()
+        await _prime_references(rows, (Professor, "coordenador_id"))
+        return rows
 
     @staticmethod
-    async def response(obj: Curso) -> CursoResponse:
-        coord = (
-            ProfessorSummary(id=obj.coordenador.id, nome=obj.coordenador.nome)
-            if getattr(obj, "coordenador", None)
-            else None
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        page = await keyset_page(
+            CursoService.FILTERS.apply(Curso.all(), filters),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            allowed_sorts=CursoService.FILTERS.sorts,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+            values=_page_columns(CursoService.RESPONSE_COLUMNS, fields),
         )
+        if fields is not None:
+            return _sparse_page(page, fields)
+        await _prime_references(page.rows, (Professor, "coordenador_id"))
+        return page
+
+    @staticmethod
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        return await _values(
+            CursoService.FILTERS.apply(Curso.all(), filters),
+            CursoService.RESPONSE_COLUMNS,
+            fields,
+        )
+
+    @staticmethod
+    async def response(obj: Curso, loader: DataLoader) -> CursoResponse:
         return CursoResponse(
             id=obj.id,
             nome=obj.nome,
             total_creditos=obj.total_creditos,
             coordenador_id=obj.coordenador_id,
-            coordenador=coord,
+            coordenador=await loader.summary(Professor, obj.coordenador_id),
         )
 
 
@@ -215,38 +550,111 @@ class CursoService:
 # Disciplina
 # =========================
 class DisciplinaService:
+    RESPONSE_COLUMNS = (
+        "id",
+        "nome",
+        "creditos",
+        "tipo",
+        "horas_obrig",
+        "limite_faltas",
+    )
+    FILTERS = FilterSpec(
+        Disciplina, [Filtro("tipo", str, scan="full")], sorts=("nome",)
+    )
+
     @staticmethod
     async def create(payload: DisciplinaCreate) -> Disciplina:
-        exists = await Disciplina.get_or_none(id=payload.id)
-        if exists:
-            raise HTTPException(
-                status_code=409, detail="Disciplina com este ID já existe."
-            )
         obj = Disciplina(**payload.model_dump())
-        await obj.save()
+        await _insert(obj, "Disciplina com este ID já existe.")
+        count_provider.invalidate(Disciplina)
+        table_versions.bump(Disciplina)
+        reference_cache.invalidate(Disciplina, obj.id)
+        name_index.add(Disciplina, obj.id, obj.nome)
         return obj
 
     @staticmethod
     async def update(id_: int, payload: DisciplinaUpdate) -> Disciplina:
         obj = await _ensure_exists(Disciplina, id=id_)
-        for k, v in payload.model_dump(exclude_unset=True).items():
+        data = payload.model_dump(exclude_unset=True)
+        creditos_mudou = data.get("creditos", obj.creditos) != obj.creditos
+        horas_mudou = data.get("horas_obrig", obj.horas_obrig) != obj.horas_obrig
+        for k, v in data.items():
             setattr(obj, k, v)
         await obj.save()
+        table_versions.bump(Disciplina)
+        reference_cache.invalidate(Disciplina, id_)
+        name_index.add(Disciplina, id_, obj.nome)
+        historico_escolar_cache.clear()
+        if creditos_mudou:
+            # o peso da disciplina mudou: refaz a MGP de quem a cursou
+            await MgpService.recompute(await _alunos_com_historico(disciplina_id=id_))
+        if horas_mudou:
+            await EstatisticaService.definir_horas(id_, obj.horas_obrig)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Disciplina, id=id_)
+        # os históricos da disciplina somem em cascata
+        afetados = await _alunos_com_historico(disciplina_id=id_)
         await obj.delete()
+        await MgpService.recompute(afetados)
+        count_provider.invalidate(Disciplina)
+        table_versions.bump(Disciplina)
+        reference_cache.invalidate(Disciplina, id_)
+        name_index.remove(Disciplina, id_)
+        historico_escolar_cache.clear()
+        curriculo_cache.clear()
 
     @staticmethod
-    async def get(id_: int) -> Disciplina:
-        return await _ensure_exists(Disciplina, id=id_)
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Disciplina:
+        return await _ensure_exists(Disciplina, loader, id=id_)
+
+    @staticmethod
+    async def get_values(id_: int, fields: Optional[Sequence[str]] = None) -> dict:
+        return await _get_values(
+            Disciplina, DisciplinaService.RESPONSE_COLUMNS, fields, id=id_
+        )
 
     @staticmethod
     async def list_all():
         return await Disciplina.all()
 
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        page = await keyset_page(
+            DisciplinaService.FILTERS.apply(Disciplina.all(), filters),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            allowed_sorts=DisciplinaService.FILTERS.sorts,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+            values=_page_columns(DisciplinaService.RESPONSE_COLUMNS, fields),
+        )
+        return page if fields is None else _sparse_page(page, fields)
+
+    @staticmethod
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        return await _values(
+            DisciplinaService.FILTERS.apply(Disciplina.all(), filters),
+            DisciplinaService.RESPONSE_COLUMNS,
+            fields,
+        )
+
     @staticmethod
     async def response(obj: Disciplina) -> DisciplinaResponse:
         return DisciplinaResponse(
@@ -263,29 +671,37 @@ class DisciplinaService:
 # Matriz (currículo)
 # =========================
 class MatrizService:
+    RESPONSE_COLUMNS = (
+        "id",
+        "curso_id",
+        "disciplina_id",
+        "periodo",
+        "curso__id",
+        "curso__nome",
+        "disciplina__id",
+        "disciplina__nome",
+        "disciplina__creditos",
+    )
+
     @staticmethod
     async def create(payload: MatrizCreate) -> Matriz:
-        await _ensure_exists(Curso, id=payload.curso_id)
-        await _ensure_exists(Disciplina, id=payload.disciplina_id)
-        exists = await Matriz.get_or_none(
-            curso_id=payload.curso_id, disciplina_id=payload.disciplina_id
+        await _ensure_exists_all(
+            (Curso, payload.curso_id), (Disciplina, payload.disciplina_id)
         )
-        if exists:
-            raise HTTPException(
-                status_code=409, detail="Matriz já existe para (curso, disciplina)."
-            )
         obj = Matriz(**payload.model_dump())
-        await obj.save()
+        await _insert(obj, "Matriz já existe para (curso, disciplina).")
+        count_provider.invalidate(Matriz)
+        table_versions.bump(Matriz)
+        curriculo_cache.invalidate(obj.curso_id)
         return obj
 
     @staticmethod
     async def update(id_: int, payload: MatrizUpdate) -> Matriz:
         obj = await _ensure_exists(Matriz, id=id_)
         data = payload.model_dump(exclude_unset=True)
-        if "curso_id" in data:
-            await _ensure_exists(Curso, id=data["curso_id"])
-        if "disciplina_id" in data:
-            await _ensure_exists(Disciplina, id=data["disciplina_id"])
+        await _ensure_exists_all(
+            (Curso, data.get("curso_id")), (Disciplina, data.get("disciplina_id"))
+        )
         # checa unique se curso/disciplina mudarem
         cur = data.get("curso_id", obj.curso_id)
         dis = data.get("disciplina_id", obj.disciplina_id)
@@ -294,64 +710,118 @@ class MatrizService:
             raise HTTPException(
                 status_code=409, detail="Outra Matriz já usa (curso, disciplina)."
             )
+        curriculo_cache.invalidate(obj.curso_id)
         for k, v in data.items():
             setattr(obj, k, v)
         await obj.save()
+        table_versions.bump(Matriz)
+        curriculo_cache.invalidate(obj.curso_id)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Matriz, id=id_)
         await obj.delete()
+        count_provider.invalidate(Matriz)
+        table_versions.bump(Matriz)
+        curriculo_cache.invalidate(obj.curso_id)
 
     @staticmethod
-    async def get(id_: int) -> Matriz:
-        return await _ensure_exists(Matriz, id=id_)
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Matriz:
+        return await _ensure_exists(Matriz, loader, id=id_)
 
     @staticmethod
     async def list_all():
-        return await Matriz.all().prefetch_related("curso", "disciplina")
+        rows = await Matriz.all()
+        await _prime_references(
+            rows, (Curso, "curso_id"), (Disciplina, "disciplina_id")
+        )
+        return rows
+
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+    ):
+        page = await keyset_page(
+            Matriz.all(),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+        )
+        await _prime_references(
+            page.rows, (Curso, "curso_id"), (Disciplina, "disciplina_id")
+        )
+        return page
+
+    @staticmethod
+    async def list_values(fields: Optional[Sequence[str]] = None) -> List[dict]:
+        return await _values(Matriz.all(), MatrizService.RESPONSE_COLUMNS, fields)
 
     @staticmethod
-    async def response(obj: Matriz) -> MatrizResponse:
+    async def response(obj: Matriz, loader: DataLoader) -> MatrizResponse:
         return MatrizResponse(
             id=obj.id,
             curso_id=obj.curso_id,
             disciplina_id=obj.disciplina_id,
             periodo=obj.periodo,
-            curso=CursoSummary(id=obj.curso.id, nome=obj.curso.nome),
-            disciplina=DisciplinaSummary(
-                id=obj.disciplina.id,
-                nome=obj.disciplina.nome,
-                creditos=obj.disciplina.creditos,
-            ),
+            curso=await loader.summary(Curso, obj.curso_id),
+            disciplina=await loader.summary(Disciplina, obj.disciplina_id),
         )
 
 
 # =========================
 # Turma (oferta)
 # =========================
+def _chave_turma(turma: Turma) -> Tuple[int, int, int]:
+    return (turma.periodo_letivo_id, turma.curso_id, turma.disciplina_id)
+
+
 class TurmaService:
+    RESPONSE_COLUMNS = (
+        "id",
+        "periodo_letivo_id",
+        "curso_id",
+        "disciplina_id",
+        "professor_id",
+        "vagas",
+        "vagas_disponiveis",
+        "periodo_letivo__id",
+        "periodo_letivo__ano",
+        "periodo_letivo__semestre",
+        "curso__id",
+        "curso__nome",
+        "disciplina__id",
+        "disciplina__nome",
+        "disciplina__creditos",
+        "professor__id",
+        "professor__nome",
+    )
+    FILTERS = FilterSpec(
+        Turma,
+        [Filtro("periodo_letivo_id"), Filtro("curso_id"), Filtro("disciplina_id")],
+    )
+
     @staticmethod
     async def create(payload: TurmaCreate) -> Turma:
-        await _ensure_exists(PeriodoLetivo, id=payload.periodo_letivo_id)
-        await _ensure_exists(Curso, id=payload.curso_id)
-        await _ensure_exists(Disciplina, id=payload.disciplina_id)
-        if payload.professor_id:
-            await _ensure_exists(Professor, id=payload.professor_id)
-        # unique (periodo_letivo, curso, disciplina)
-        exists = await Turma.get_or_none(
-            periodo_letivo_id=payload.periodo_letivo_id,
-            curso_id=payload.curso_id,
-            disciplina_id=payload.disciplina_id,
-        )
-        if exists:
-            raise HTTPException(
-                status_code=409,
-                detail="Turma já ofertada neste período/curso/disciplina.",
-            )
+        await _ensure_exists_all(
+            (PeriodoLetivo, payload.periodo_letivo_id),
+            (Curso, payload.curso_id),
+            (Disciplina, payload.disciplina_id),
+            (Professor, payload.professor_id or None),
+        )
         obj = Turma(**payload.model_dump())
-        await obj.save()
+        obj.vagas_disponiveis = obj.vagas
+        await _insert(obj, "Turma já ofertada neste período/curso/disciplina.")
+        await EstatisticaService.definir_professor(_chave_turma(obj), obj.professor_id)
+        count_provider.invalidate(Turma)
+        table_versions.bump(Turma)
         return obj
 
     @staticmethod
@@ -359,14 +829,12 @@ class TurmaService:
         obj = await _ensure_exists(Turma, id=id_)
         data = payload.model_dump(exclude_unset=True)
         # valida FKs se vierem
-        if "periodo_letivo_id" in data:
-            await _ensure_exists(PeriodoLetivo, id=data["periodo_letivo_id"])
-        if "curso_id" in data:
-            await _ensure_exists(Curso, id=data["curso_id"])
-        if "disciplina_id" in data:
-            await _ensure_exists(Disciplina, id=data["disciplina_id"])
-        if "professor_id" in data and data["professor_id"] is not None:
-            await _ensure_exists(Professor, id=data["professor_id"])
+        await _ensure_exists_all(
+            (PeriodoLetivo, data.get("periodo_letivo_id")),
+            (Curso, data.get("curso_id")),
+            (Disciplina, data.get("disciplina_id")),
+            (Professor, data.get("professor_id")),
+        )
 
         # checa unique
         pl = data.get("periodo_letivo_id", obj.periodo_letivo_id)
@@ -379,28 +847,102 @@ class TurmaService:
             raise HTTPException(
                 status_code=409, detail="Já existe outra Turma com estes dados."
             )
+        delta = data.get("vagas", obj.vagas) - obj.vagas
+        # as vagas ocupadas precisam caber no novo total: UPDATE condicional,
+        # como em _ocupar_vaga, para não correr com matrículas concorrentes
+        if delta and not await Turma.filter(
+            id=id_, vagas_disponiveis__gte=-delta
+        ).update(vagas_disponiveis=F("vagas_disponiveis") + delta):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Vagas abaixo do número de alunos já matriculados na turma.",
+            )
+        chave_anterior = _chave_turma(obj)
+        professor_anterior = obj.professor_id
         for k, v in data.items():
             setattr(obj, k, v)
-        await obj.save()
+        if data:
+            # vagas_disponiveis fica fora do save para não sobrescrever o
+            # contador de matrículas concorrentes
+            await obj.save(update_fields=list(data))
+        if delta:
+            await obj.refresh_from_db(fields=["vagas_disponiveis"])
+        if _chave_turma(obj) != chave_anterior:
+            # as matrículas da turma mudaram de chave no resumo
+            await EstatisticaService.refresh([chave_anterior, _chave_turma(obj)])
+        elif obj.professor_id != professor_anterior:
+            await EstatisticaService.definir_professor(
+                _chave_turma(obj), obj.professor_id
+            )
+        table_versions.bump(Turma)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Turma, id=id_)
         await obj.delete()
+        # as matrículas somem em cascata
+        await EstatisticaService.refresh([_chave_turma(obj)])
+        count_provider.invalidate(Turma)
+        table_versions.bump(Turma)
 
     @staticmethod
-    async def get(id_: int) -> Turma:
-        return await _ensure_exists(Turma, id=id_)
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Turma:
+        return await _ensure_exists(Turma, loader, id=id_)
 
     @staticmethod
     async def list_all():
-        return await Turma.all().prefetch_related(
-            "periodo_letivo", "curso", "disciplina", "professor"
+        rows = await Turma.all()
+        await _prime_references(
+            rows,
+            (PeriodoLetivo, "periodo_letivo_id"),
+            (Curso, "curso_id"),
+            (Disciplina, "disciplina_id"),
+            (Professor, "professor_id"),
         )
+        return rows
 
     @staticmethod
-    async def response(obj: Turma) -> TurmaResponse:
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+    ):
+        page = await keyset_page(
+            TurmaService.FILTERS.apply(Turma.all(), filters),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+        )
+        await _prime_references(
+            page.rows,
+            (PeriodoLetivo, "periodo_letivo_id"),
+            (Curso, "curso_id"),
+            (Disciplina, "disciplina_id"),
+            (Professor, "professor_id"),
+        )
+        return page
+
+    @staticmethod
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        return await _values(
+            TurmaService.FILTERS.apply(Turma.all(), filters),
+            TurmaService.RESPONSE_COLUMNS,
+            fields,
+        )
+
+    @staticmethod
+    async def response(obj: Turma, loader: DataLoader) -> TurmaResponse:
         return TurmaResponse(
             id=obj.id,
             periodo_letivo_id=obj.periodo_letivo_id,
@@ -408,22 +950,11 @@ class TurmaService:
             disciplina_id=obj.disciplina_id,
             professor_id=obj.professor_id,
             vagas=obj.vagas,
-            periodo_letivo=PeriodoLetivoSummary(
-                id=obj.periodo_letivo.id,
-                ano=obj.periodo_letivo.ano,
-                semestre=obj.periodo_letivo.semestre,
-            ),
-            curso=CursoSummary(id=obj.curso.id, nome=obj.curso.nome),
-            disciplina=DisciplinaSummary(
-                id=obj.disciplina.id,
-                nome=obj.disciplina.nome,
-                creditos=obj.disciplina.creditos,
-            ),
-            professor=(
-                ProfessorSummary(id=obj.professor.id, nome=obj.professor.nome)
-                if getattr(obj, "professor", None)
-                else None
-            ),
+            vagas_disponiveis=obj.vagas_disponiveis,
+            periodo_letivo=await loader.summary(PeriodoLetivo, obj.periodo_letivo_id),
+            curso=await loader.summary(Curso, obj.curso_id),
+            disciplina=await loader.summary(Disciplina, obj.disciplina_id),
+            professor=await loader.summary(Professor, obj.professor_id),
         )
 
 
@@ -431,54 +962,248 @@ class TurmaService:
 # Aluno
 # =========================
 class AlunoService:
+    RESPONSE_COLUMNS = (
+        "matricula",
+        "nome",
+        "total_creditos",
+        "data_nascimento",
+        "mgp",
+        "curso_id",
+        "curso__id",
+        "curso__nome",
+    )
+    FILTERS = FilterSpec(
+        Aluno,
+        [
+            Filtro("curso_id"),
+            Filtro("mgp", Decimal, ops=("gte", "lte"), scan="residual"),
+        ],
+        sorts=("nome",),
+    )
+
     @staticmethod
     async def create(payload: AlunoCreate) -> Aluno:
-        await _ensure_exists(Curso, id=payload.curso_id)
-        exists = await Aluno.get_or_none(matricula=payload.matricula)
-        if exists:
-            raise HTTPException(
-                status_code=409, detail="Aluno com esta matrícula já existe."
-            )
-        obj = Aluno(**payload.model_dump())
-        await obj.save()
+        await _ensure_exists_all((Curso, payload.curso_id))
+        # sem históricos ainda: nada integralizado e sem MGP
+        obj = Aluno(**payload.model_dump(), total_creditos=0)
+        await _insert(obj, "Aluno com esta matrícula já existe.")
+        count_provider.invalidate(Aluno)
+        table_versions.bump(Aluno)
+        name_index.add(Aluno, obj.matricula, obj.nome)
         return obj
 
+    @staticmethod
+    async def bulk_create(
+        payloads: List[AlunoCreate], batch_size: int = BULK_BATCH_SIZE
+    ) -> List[AlunoBulkRowResult]:
+        """
+        Cria vários alunos de uma vez, com validação por conjunto:
+        uma consulta para os `curso_id` referenciados, uma para as matrículas
+        já cadastradas e os INSERTs em lotes de `batch_size`, numa única transação.
+        Retorna o resultado de cada linha (aceita/rejeitada), na ordem recebida.
+        """
+        if not payloads:
+            return []
+
+        curso_ids = {p.curso_id for p in payloads}
+        matriculas = {p.matricula for p in payloads}
+        cursos_existentes = set(await reference_cache.get_many(Curso, curso_ids))
+        matriculas_existentes = set(
+            await Aluno.filter(matricula__in=matriculas).values_list(
+                "matricula", flat=True
+            )
+        )
+
+        results: List[AlunoBulkRowResult] = []
+        novos: List[Aluno] = []
+        vistos = set()
+        for index, p in enumerate(payloads):
+            if p.curso_id not in cursos_existentes:
+                detail = "Curso não encontrado."
+            elif p.matricula in matriculas_existentes:
+                detail = "Aluno com esta matrícula já existe."
+            elif p.matricula in vistos:
+                detail = "Matrícula repetida no lote."
+            else:
+                detail = None
+
+            if detail:
+                results.append(
+                    AlunoBulkRowResult(
+                        index=index,
+                        matricula=p.matricula,
+                        status="rejected",
+                        detail=detail,
+                    )
+                )
+                continue
+
+            vistos.add(p.matricula)
+            novos.append(Aluno(**p.model_dump(), total_creditos=0))
+            results.append(
+                AlunoBulkRowResult(
+                    index=index, matricula=p.matricula, status="accepted"
+                )
+            )
+
+        if novos:
+            async with in_transaction():
+                await Aluno.bulk_create(novos, batch_size=batch_size)
+            count_provider.invalidate(Aluno)
+            table_versions.bump(Aluno)
+            for obj in novos:
+                name_index.add(Aluno, obj.matricula, obj.nome)
+        return results
+
     @staticmethod
     async def update(matricula: int, payload: AlunoUpdate) -> Aluno:
         obj = await _ensure_exists(Aluno, matricula=matricula)
         data = payload.model_dump(exclude_unset=True)
         if "curso_id" in data:
-            await _ensure_exists(Curso, id=data["curso_id"])
+            await _ensure_exists_all((Curso, data["curso_id"]))
+        curso_anterior = obj.curso_id
         for k, v in data.items():
             setattr(obj, k, v)
         await obj.save()
+        if obj.curso_id != curso_anterior:
+            # os históricos do aluno passam a contar para o novo curso
+            await EstatisticaService.refresh(
+                await EstatisticaService.chaves_do_aluno(matricula, curso_anterior)
+                | await EstatisticaService.chaves_do_aluno(matricula, obj.curso_id)
+            )
+        table_versions.bump(Aluno)
+        historico_escolar_cache.invalidate(matricula)
+        name_index.add(Aluno, matricula, obj.nome)
         return obj
 
     @staticmethod
     async def delete(matricula: int) -> None:
         obj = await _ensure_exists(Aluno, matricula=matricula)
-        await obj.delete()
+        # históricos e matrículas do aluno somem em cascata
+        chaves = await EstatisticaService.chaves_do_aluno(matricula, obj.curso_id)
+        async with in_transaction():
+            await _devolver_vagas(Matricula.filter(aluno_id=matricula))
+            await obj.delete()
+        await EstatisticaService.refresh(chaves)
+        for model in (Aluno, Historico, Matricula):
+            count_provider.invalidate(model)
+            table_versions.bump(model)
+        table_versions.bump(Turma)
+        historico_escolar_cache.invalidate(matricula)
+        name_index.remove(Aluno, matricula)
 
     @staticmethod
-    async def get(matricula: int) -> Aluno:
-        return await _ensure_exists(Aluno, matricula=matricula)
+    async def get(matricula: int, loader: Optional[DataLoader] = None) -> Aluno:
+        return await _ensure_exists(Aluno, loader, matricula=matricula)
+
+    @staticmethod
+    async def get_values(
+        matricula: int, fields: Optional[Sequence[str]] = None
+    ) -> dict:
+        return await _get_values(
+            Aluno, AlunoService.RESPONSE_COLUMNS, fields, matricula=matricula
+        )
 
     @staticmethod
     async def list_all():
-        return await Aluno.all().prefetch_related("curso")
+        rows = await Aluno.all()
+        await _prime_references(rows, (Curso, "curso_id"))
+        return rows
+
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        """
+        Retorna a `Page` (rows, cursores e total) paginando por cursor (keyset)
+        sobre a pk ou sobre `nome`; o total só é obtido com `with_total`.
+        """
+        page = await keyset_page(
+            AlunoService.FILTERS.apply(Aluno.all(), filters),
+            pk="matricula",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            allowed_sorts=AlunoService.FILTERS.sorts,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+            values=_page_columns(AlunoService.RESPONSE_COLUMNS, fields),
+        )
+        if fields is not None:
+            return _sparse_page(page, fields)
+        await _prime_references(page.rows, (Curso, "curso_id"))
+        return page
+
+    @staticmethod
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        """
+        Listagem só com as colunas do `AlunoResponse` (JOIN em cursos), sem
+        instanciar models nem copiar campo a campo em `response`: cada linha
+        de `.values()` já vira o dict da resposta. Com `fields`, só as colunas
+        desses campos (sem `curso`, sem JOIN).
+        """
+        return await _values(
+            AlunoService.FILTERS.apply(Aluno.all(), filters),
+            AlunoService.RESPONSE_COLUMNS,
+            fields,
+        )
 
     @staticmethod
-    async def list_paginated(limit: int = 10, offset: int = 0):
+    async def list_paginated(
+        limit: int = 10,
+        offset: int = 0,
+        count_mode: CountModeLiteral = "exact",
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ):
         """
-        Retorna (rows, total) para paginação.
+        Retorna (rows, total, total_mode) para paginação. Com `fields`, as
+        linhas são dicts só com esses campos; com `filters`, o total é o
+        COUNT(*) exato das linhas filtradas.
         """
-        qs = Aluno.all().offset(offset).limit(limit).prefetch_related("curso")
-        rows = await qs
-        total = await Aluno.all().count()
-        return rows, total
+        filtrado = AlunoService.FILTERS.apply(Aluno.all(), filters)
+        qs = filtrado.offset(offset).limit(limit)
+        if fields is not None:
+            rows = await _values(qs, AlunoService.RESPONSE_COLUMNS, fields)
+        else:
+            rows = await qs
+            await _prime_references(rows, (Curso, "curso_id"))
+        if filters:
+            total, total_mode = await filtrado.count(), "exact"
+        else:
+            total, total_mode = await count_provider.count(Aluno, count_mode)
+        return rows, total, total_mode
 
     @staticmethod
-    async def response(obj: Aluno) -> AlunoResponse:
+    def export_rows(chunk_size: int = EXPORT_CHUNK_SIZE):
+        """
+        Blocos de linhas (dicts) para a exportação em streaming, com o nome do curso.
+        """
+        return iter_chunks(
+            Aluno.all(),
+            "matricula",
+            "matricula",
+            "nome",
+            "total_creditos",
+            "data_nascimento",
+            "mgp",
+            "curso_id",
+            chunk_size=chunk_size,
+            curso_nome="curso__nome",
+        )
+
+    @staticmethod
+    async def response(obj: Aluno, loader: DataLoader) -> AlunoResponse:
         return AlunoResponse(
             matricula=obj.matricula,
             nome=obj.nome,
@@ -486,43 +1211,101 @@ class AlunoService:
             data_nascimento=obj.data_nascimento,
             mgp=obj.mgp,
             curso_id=obj.curso_id,
-            curso=CursoSummary(id=obj.curso.id, nome=obj.curso.nome),
+            curso=await loader.summary(Curso, obj.curso_id),
         )
 
 
 # =========================
 # Histórico
 # =========================
+def _historico_escolar(aluno: AlunoSummary, rows: List[dict]) -> HistoricoEscolar:
+    """
+    Agrupa as linhas (já aninhadas e ordenadas por período) em períodos, com a
+    média do período e a acumulada ponderadas pelos créditos, pelas mesmas
+    regras da MGP (app.services.mgp).
+    """
+    periodos: List[HistoricoEscolarPeriodo] = []
+    acumulado = Acumulado()
+    for _, grupo in groupby(rows, key=lambda r: r["periodo_letivo"]["id"]):
+        grupo = list(grupo)
+        do_periodo = Acumulado()
+        for r in grupo:
+            do_periodo += contribution(
+                r["situacao"], r["media_final"], r["disciplina"]["creditos"]
+            )
+        acumulado += do_periodo
+        periodos.append(
+            HistoricoEscolarPeriodo(
+                periodo_letivo=grupo[0]["periodo_letivo"],
+                disciplinas=[HistoricoEscolarItem(**r) for r in grupo],
+                media_periodo=mgp_of(do_periodo.pontos, do_periodo.creditos_mgp),
+                media_acumulada=mgp_of(acumulado.pontos, acumulado.creditos_mgp),
+                creditos_periodo=do_periodo.creditos,
+                creditos_acumulados=acumulado.creditos,
+            )
+        )
+    return HistoricoEscolar(
+        aluno=aluno,
+        periodos=periodos,
+        mgp=mgp_of(acumulado.pontos, acumulado.creditos_mgp),
+        total_creditos=acumulado.creditos,
+    )
+
+
 class HistoricoService:
+    RESPONSE_COLUMNS = (
+        "id",
+        "periodo_letivo_id",
+        "aluno_id",
+        "disciplina_id",
+        "situacao",
+        "media_final",
+        "faltas",
+        "periodo_letivo__id",
+        "periodo_letivo__ano",
+        "periodo_letivo__semestre",
+        "aluno__matricula",
+        "aluno__nome",
+        "disciplina__id",
+        "disciplina__nome",
+        "disciplina__creditos",
+    )
+    FILTERS = FilterSpec(
+        Historico,
+        [
+            Filtro("aluno_id"),
+            Filtro("periodo_letivo_id"),
+            Filtro("disciplina_id"),
+            Filtro("situacao", str, scan="residual"),
+        ],
+    )
+
     @staticmethod
     async def create(payload: HistoricoCreate) -> Historico:
-        await _ensure_exists(PeriodoLetivo, id=payload.periodo_letivo_id)
-        await _ensure_exists(Aluno, matricula=payload.aluno_id)
-        await _ensure_exists(Disciplina, id=payload.disciplina_id)
-        exists = await Historico.get_or_none(
-            periodo_letivo_id=payload.periodo_letivo_id,
-            aluno_id=payload.aluno_id,
-            disciplina_id=payload.disciplina_id,
-        )
-        if exists:
-            raise HTTPException(
-                status_code=409,
-                detail="Histórico já existe para (PL, aluno, disciplina).",
-            )
+        await _ensure_exists_all(
+            (PeriodoLetivo, payload.periodo_letivo_id),
+            (Aluno, payload.aluno_id),
+            (Disciplina, payload.disciplina_id),
+        )
         obj = Historico(**payload.model_dump())
-        await obj.save()
+        async with in_transaction():
+            await _insert(obj, "Histórico já existe para (PL, aluno, disciplina).")
+            await MgpService.apply_change(None, Lancamento.of(obj))
+            await EstatisticaService.historico_alterado(None, LinhaHistorico.of(obj))
+        historico_escolar_cache.invalidate(obj.aluno_id)
+        count_provider.invalidate(Historico)
+        table_versions.bump(Historico)
         return obj
 
     @staticmethod
     async def update(id_: int, payload: HistoricoUpdate) -> Historico:
         obj = await _ensure_exists(Historico, id=id_)
         data = payload.model_dump(exclude_unset=True)
-        if "periodo_letivo_id" in data:
-            await _ensure_exists(PeriodoLetivo, id=data["periodo_letivo_id"])
-        if "aluno_id" in data:
-            await _ensure_exists(Aluno, matricula=data["aluno_id"])
-        if "disciplina_id" in data:
-            await _ensure_exists(Disciplina, id=data["disciplina_id"])
+        await _ensure_exists_all(
+            (PeriodoLetivo, data.get("periodo_letivo_id")),
+            (Aluno, data.get("aluno_id")),
+            (Disciplina, data.get("disciplina_id")),
+        )
         # checa unique
         pl = data.get("periodo_letivo_id", obj.periodo_letivo_id)
         al = data.get("aluno_id", obj.aluno_id)
@@ -534,28 +1317,137 @@ class HistoricoService:
             raise HTTPException(
                 status_code=409, detail="Outro Histórico já usa estes dados."
             )
+        before = Lancamento.of(obj)
+        linha_anterior = LinhaHistorico.of(obj)
         for k, v in data.items():
             setattr(obj, k, v)
-        await obj.save()
+        async with in_transaction():
+            await obj.save()
+            await MgpService.apply_change(before, Lancamento.of(obj))
+            await EstatisticaService.historico_alterado(
+                linha_anterior, LinhaHistorico.of(obj)
+            )
+        historico_escolar_cache.invalidate(before.aluno_id)
+        historico_escolar_cache.invalidate(obj.aluno_id)
+        table_versions.bump(Historico)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Historico, id=id_)
-        await obj.delete()
+        async with in_transaction():
+            await obj.delete()
+            await MgpService.apply_change(Lancamento.of(obj), None)
+            await EstatisticaService.historico_alterado(LinhaHistorico.of(obj), None)
+        historico_escolar_cache.invalidate(obj.aluno_id)
+        count_provider.invalidate(Historico)
+        table_versions.bump(Historico)
 
     @staticmethod
-    async def get(id_: int) -> Historico:
-        return await _ensure_exists(Historico, id=id_)
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Historico:
+        return await _ensure_exists(Historico, loader, id=id_)
+
+    @staticmethod
+    async def historico_escolar(aluno_id: int) -> HistoricoEscolar:
+        """
+        Histórico escolar do aluno numa única consulta: os históricos dele
+        (índice `(aluno_id, periodo_letivo_id)`) com disciplina e período via
+        JOIN, agrupados por período. Fica em `historico_escolar_cache` até a
+        próxima escrita em Histórico do aluno.
+        """
+        cached = historico_escolar_cache.get(aluno_id)
+        if cached is not None:
+            return cached
+
+        rows = await (
+            Historico.filter(aluno_id=aluno_id)
+            .order_by(
+                "periodo_letivo__ano",
+                "periodo_letivo__semestre",
+                "periodo_letivo_id",
+                "disciplina__nome",
+            )
+            .values(*HistoricoService.RESPONSE_COLUMNS)
+        )
+        if rows:
+            rows = _nest_rows(rows)
+            aluno = AlunoSummary(**rows[0]["aluno"])
+        else:
+            # sem históricos: só confirma que o aluno existe
+            obj = await _ensure_exists(Aluno, matricula=aluno_id)
+            aluno = AlunoSummary(matricula=obj.matricula, nome=obj.nome)
+
+        result = _historico_escolar(aluno, rows)
+        historico_escolar_cache.set(aluno_id, result)
+        return result
 
     @staticmethod
     async def list_all():
-        return await Historico.all().prefetch_related(
-            "periodo_letivo", "aluno", "disciplina"
+        rows = await Historico.all()
+        await _prime_references(
+            rows, (PeriodoLetivo, "periodo_letivo_id"), (Disciplina, "disciplina_id")
+        )
+        return rows
+
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+    ):
+        page = await keyset_page(
+            HistoricoService.FILTERS.apply(Historico.all(), filters),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+        )
+        await _prime_references(
+            page.rows,
+            (PeriodoLetivo, "periodo_letivo_id"),
+            (Disciplina, "disciplina_id"),
         )
+        return page
 
     @staticmethod
-    async def response(obj: Historico) -> HistoricoResponse:
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        return await _values(
+            HistoricoService.FILTERS.apply(Historico.all(), filters),
+            HistoricoService.RESPONSE_COLUMNS,
+            fields,
+        )
+
+    @staticmethod
+    def export_rows(chunk_size: int = EXPORT_CHUNK_SIZE):
+        return iter_chunks(
+            Historico.all(),
+            "id",
+            "id",
+            "periodo_letivo_id",
+            "aluno_id",
+            "disciplina_id",
+            "situacao",
+            "media_final",
+            "faltas",
+            chunk_size=chunk_size,
+            ano="periodo_letivo__ano",
+            semestre="periodo_letivo__semestre",
+            aluno_nome="aluno__nome",
+            disciplina_nome="disciplina__nome",
+        )
+
+    @staticmethod
+    async def response(obj: Historico, loader: DataLoader) -> HistoricoResponse:
+        aluno = await loader.load(Aluno, obj.aluno_id)
         return HistoricoResponse(
             id=obj.id,
             periodo_letivo_id=obj.periodo_letivo_id,
@@ -564,47 +1456,125 @@ class HistoricoService:
             situacao=obj.situacao,
             media_final=obj.media_final,
             faltas=obj.faltas,
-            periodo_letivo=PeriodoLetivoSummary(
-                id=obj.periodo_letivo.id,
-                ano=obj.periodo_letivo.ano,
-                semestre=obj.periodo_letivo.semestre,
-            ),
-            aluno=AlunoSummary(matricula=obj.aluno.matricula, nome=obj.aluno.nome),
-            disciplina=DisciplinaSummary(
-                id=obj.disciplina.id,
-                nome=obj.disciplina.nome,
-                creditos=obj.disciplina.creditos,
-            ),
+            periodo_letivo=await loader.summary(PeriodoLetivo, obj.periodo_letivo_id),
+            aluno=AlunoSummary(matricula=aluno.matricula, nome=aluno.nome),
+            disciplina=await loader.summary(Disciplina, obj.disciplina_id),
         )
 
 
 # =========================
 # Matrícula (lançamentos por turma)
 # =========================
+async def _ocupar_vaga(turma_id: int) -> None:
+    """
+    Reserva uma vaga da turma com um UPDATE condicional
+    (`SET vagas_disponiveis = vagas_disponiveis - 1 WHERE vagas_disponiveis > 0`).
+    O banco serializa as requisições concorrentes no lock da linha da turma, sem
+    ler-e-depois-gravar, então não há como passar do limite. Deve rodar na mesma
+    transação do INSERT/UPDATE da matrícula: se ele falhar, a vaga volta.
+    """
+    ocupadas = await Turma.filter(id=turma_id, vagas_disponiveis__gt=0).update(
+        vagas_disponiveis=F("vagas_disponiveis") - 1
+    )
+    if not ocupadas:
+        await _ensure_exists_all((Turma, turma_id))
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Turma sem vagas."
+        )
+
+
+async def _liberar_vaga(turma_id: int) -> None:
+    await Turma.filter(id=turma_id).update(vagas_disponiveis=F("vagas_disponiveis") + 1)
+
+
+async def _devolver_vagas(matriculas) -> None:
+    """
+    Devolve às turmas as vagas das matrículas do QuerySet `matriculas`, que vão
+    sumir em cascata (aluno ou curso removido): uma consulta agrupada por turma
+    e um UPDATE `vagas_disponiveis + n` por quantidade distinta. Deve rodar na
+    mesma transação da remoção.
+    """
+    rows = (
+        await matriculas.annotate(n=Count("id"))
+        .group_by("turma_id")
+        .values_list("turma_id", "n")
+    )
+    por_quantidade: Dict[int, List[int]] = {}
+    for turma_id, n in rows:
+        por_quantidade.setdefault(n, []).append(turma_id)
+    for n, turmas in por_quantidade.items():
+        await Turma.filter(id__in=turmas).update(
+            vagas_disponiveis=F("vagas_disponiveis") + n
+        )
+
+
+async def _inserir_matriculas(
+    novos: List[Matricula],
+) -> List[Optional[HTTPException]]:
+    """
+    Insere `novos` com um único `bulk_create`. Se uma linha violar a unicidade
+    (matrícula gravada por outra requisição depois da checagem), o lote volta
+    ao savepoint e as linhas são inseridas uma a uma, cada uma no seu
+    savepoint: só as que conflitam são recusadas (409). Retorna uma lista
+    paralela a `novos`.
+    """
+    try:
+        async with in_transaction():
+            await Matricula.bulk_create(novos, batch_size=len(novos))
+        return [None] * len(novos)
+    except IntegrityError as e:
+        if not _is_unique_violation(e):
+            raise
+    recusas: List[Optional[HTTPException]] = []
+    for obj in novos:
+        try:
+            async with in_transaction():
+                await _insert(obj, "Aluno já matriculado nesta Turma.")
+            recusas.append(None)
+        except HTTPException as e:
+            recusas.append(e)
+    return recusas
+
+
 class MatriculaService:
+    RESPONSE_COLUMNS = (
+        "id",
+        "aluno_id",
+        "turma_id",
+        "nota_01",
+        "nota_02",
+        "nota_03",
+        "faltas_01",
+        "faltas_02",
+        "faltas_03",
+        "aluno__matricula",
+        "aluno__nome",
+        "turma__id",
+        "turma__vagas",
+    )
+    FILTERS = FilterSpec(Matricula, [Filtro("aluno_id"), Filtro("turma_id")])
+
     @staticmethod
     async def create(payload: MatriculaCreate) -> Matricula:
-        await _ensure_exists(Aluno, matricula=payload.aluno_id)
-        await _ensure_exists(Turma, id=payload.turma_id)
-        exists = await Matricula.get_or_none(
-            aluno_id=payload.aluno_id, turma_id=payload.turma_id
-        )
-        if exists:
-            raise HTTPException(
-                status_code=409, detail="Aluno já matriculado nesta Turma."
-            )
+        await _ensure_exists_all((Aluno, payload.aluno_id))
         obj = Matricula(**payload.model_dump())
-        await obj.save()
+        async with in_transaction():
+            # a vaga também valida a turma (404 se não existir)
+            await _ocupar_vaga(payload.turma_id)
+            await _insert(obj, "Aluno já matriculado nesta Turma.")
+            await EstatisticaService.matricula_alterada(None, LinhaMatricula.of(obj))
+        count_provider.invalidate(Matricula)
+        table_versions.bump(Matricula)
+        table_versions.bump(Turma)
         return obj
 
     @staticmethod
     async def update(id_: int, payload: MatriculaUpdate) -> Matricula:
         obj = await _ensure_exists(Matricula, id=id_)
         data = payload.model_dump(exclude_unset=True)
-        if "aluno_id" in data:
-            await _ensure_exists(Aluno, matricula=data["aluno_id"])
-        if "turma_id" in data:
-            await _ensure_exists(Turma, id=data["turma_id"])
+        await _ensure_exists_all(
+            (Aluno, data.get("aluno_id")), (Turma, data.get("turma_id"))
+        )
         # checa unique
         al = data.get("aluno_id", obj.aluno_id)
         tu = data.get("turma_id", obj.turma_id)
@@ -613,26 +1583,240 @@ class MatriculaService:
             raise HTTPException(
                 status_code=409, detail="Já existe outra Matrícula com estes dados."
             )
+        turma_anterior = obj.turma_id
+        linha_anterior = LinhaMatricula.of(obj)
         for k, v in data.items():
             setattr(obj, k, v)
-        await obj.save()
+        async with in_transaction():
+            if obj.turma_id != turma_anterior:
+                # troca de turma: ocupa a nova antes de devolver a antiga
+                await _ocupar_vaga(obj.turma_id)
+                await _liberar_vaga(turma_anterior)
+                table_versions.bump(Turma)
+            await obj.save()
+            await EstatisticaService.matricula_alterada(
+                linha_anterior, LinhaMatricula.of(obj)
+            )
+        table_versions.bump(Matricula)
         return obj
 
     @staticmethod
     async def delete(id_: int) -> None:
         obj = await _ensure_exists(Matricula, id=id_)
-        await obj.delete()
+        async with in_transaction():
+            await obj.delete()
+            await _liberar_vaga(obj.turma_id)
+            await EstatisticaService.matricula_alterada(LinhaMatricula.of(obj), None)
+        count_provider.invalidate(Matricula)
+        table_versions.bump(Matricula)
+        table_versions.bump(Turma)
+
+    @staticmethod
+    async def create_lote_turma(
+        turma_id: int, payloads: List[MatriculaCreate]
+    ) -> List[Optional[HTTPException]]:
+        """
+        Matricula vários alunos na mesma turma numa transação: trava a linha da
+        turma, valida alunos e matrículas existentes com uma consulta cada, insere
+        com um único `bulk_create` (ver `_inserir_matriculas`) e ocupa as vagas
+        de uma vez.
+        Usado pela fila de admissão (app.services.admissao). Retorna uma lista
+        paralela a `payloads`: `None` para aceita ou o HTTPException da recusa,
+        com os mesmos status/mensagens de `create`; pedidos além das vagas
+        são recusados na ordem de chegada.
+        """
+        async with in_transaction():
+            turma = await Turma.select_for_update().get_or_none(id=turma_id)
+            if turma is None:
+                erro = HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Turma não encontrado.",
+                )
+                return [erro] * len(payloads)
+
+            alunos = {p.aluno_id for p in payloads}
+            existentes = set(
+                await Aluno.filter(matricula__in=alunos).values_list(
+                    "matricula", flat=True
+                )
+            )
+            ocupados = set(
+                await Matricula.filter(
+                    turma_id=turma_id, aluno_id__in=alunos
+                ).values_list("aluno_id", flat=True)
+            )
+            ids_usados = set(
+                await Matricula.filter(id__in=[p.id for p in payloads]).values_list(
+                    "id", flat=True
+                )
+            )
+
+            results: List[Optional[HTTPException]] = []
+            novos: List[Matricula] = []
+            posicoes: List[int] = []  # índice de cada item de `novos` em results
+            vagas = turma.vagas_disponiveis
+            for p in payloads:
+                if p.aluno_id not in existentes:
+                    erro = HTTPException(
+                        status_code=404, detail="Aluno não encontrado."
+                    )
+                elif p.aluno_id in ocupados or p.id in ids_usados:
+                    erro = HTTPException(
+                        status_code=409, detail="Aluno já matriculado nesta Turma."
+                    )
+                elif len(novos) >= vagas:
+                    erro = HTTPException(status_code=409, detail="Turma sem vagas.")
+                else:
+                    erro = None
+                    ocupados.add(p.aluno_id)
+                    ids_usados.add(p.id)
+                    posicoes.append(len(results))
+                    novos.append(Matricula(**p.model_dump()))
+                results.append(erro)
+
+            if novos:
+                recusas = await _inserir_matriculas(novos)
+                for posicao, erro in zip(posicoes, recusas):
+                    results[posicao] = erro
+                novos = [m for m, erro in zip(novos, recusas) if erro is None]
+            if novos:
+                await Turma.filter(id=turma_id).update(
+                    vagas_disponiveis=F("vagas_disponiveis") - len(novos)
+                )
+                await EstatisticaService.apply(
+                    {
+                        _chave_turma(turma): sum(
+                            (LinhaMatricula.of(m).contagem() for m in novos),
+                            Contagem(),
+                        )
+                    }
+                )
+
+        if novos:
+            count_provider.invalidate(Matricula)
+            table_versions.bump(Matricula)
+            table_versions.bump(Turma)
+        return results
 
     @staticmethod
-    async def get(id_: int) -> Matricula:
-        return await _ensure_exists(Matricula, id=id_)
+    async def lancar_pauta(turma_id: int, linhas: List[PautaLinha]) -> List[str]:
+        """
+        Grava notas/faltas da turma inteira de uma vez: uma consulta valida
+        todos os `aluno_id` contra as matrículas da turma (e as trava) e um
+        único UPDATE em lote aplica as alterações. O número de consultas não
+        depende do tamanho da turma. Deve rodar dentro da transação do router.
+        Retorna as colunas gravadas.
+        """
+        # a chave da turma no resumo de estatísticas também valida a turma
+        chaves = await EstatisticaService.chaves_das_turmas([turma_id])
+        if turma_id not in chaves:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Turma não encontrado."
+            )
+        mudancas = {}
+        for linha in linhas:
+            if linha.aluno_id in mudancas:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Aluno {linha.aluno_id} repetido na pauta.",
+                )
+            mudancas[linha.aluno_id] = linha.model_dump(
+                exclude_unset=True, exclude={"aluno_id"}
+            )
+
+        matriculas = await Matricula.select_for_update().filter(
+            turma_id=turma_id, aluno_id__in=list(mudancas)
+        )
+        faltando = set(mudancas) - {m.aluno_id for m in matriculas}
+        if faltando:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Alunos não matriculados na turma: "
+                + ", ".join(str(a) for a in sorted(faltando)),
+            )
+
+        campos = sorted({campo for data in mudancas.values() for campo in data})
+        if not campos:
+            return []
+        antes = sum((LinhaMatricula.of(m).contagem() for m in matriculas), Contagem())
+        for obj in matriculas:
+            for k, v in mudancas[obj.aluno_id].items():
+                setattr(obj, k, v)
+        await Matricula.bulk_update(matriculas, fields=campos, batch_size=len(linhas))
+        depois = sum((LinhaMatricula.of(m).contagem() for m in matriculas), Contagem())
+        if depois != antes:
+            # só faltas mudam o resumo
+            await EstatisticaService.apply({chaves[turma_id]: depois - antes})
+        table_versions.bump(Matricula)
+        return campos
+
+    @staticmethod
+    async def get(id_: int, loader: Optional[DataLoader] = None) -> Matricula:
+        return await _ensure_exists(Matricula, loader, id=id_)
+
+    @staticmethod
+    async def get_values(id_: int, fields: Optional[Sequence[str]] = None) -> dict:
+        return await _get_values(
+            Matricula, MatriculaService.RESPONSE_COLUMNS, fields, id=id_
+        )
 
     @staticmethod
     async def list_all():
-        return await Matricula.all().prefetch_related("aluno", "turma")
+        return await Matricula.all()
+
+    @staticmethod
+    async def list_page(
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        sort: Optional[str] = None,
+        with_total: bool = False,
+        count_mode: CountModeLiteral = "exact",
+        filters: Optional[Dict[str, Any]] = None,
+    ):
+        return await keyset_page(
+            MatriculaService.FILTERS.apply(Matricula.all(), filters),
+            pk="id",
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            with_total=with_total,
+            count_mode=count_mode,
+            filtered=bool(filters),
+        )
+
+    @staticmethod
+    async def list_values(
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> List[dict]:
+        return await _values(
+            MatriculaService.FILTERS.apply(Matricula.all(), filters),
+            MatriculaService.RESPONSE_COLUMNS,
+            fields,
+        )
+
+    @staticmethod
+    def export_rows(chunk_size: int = EXPORT_CHUNK_SIZE):
+        return iter_chunks(
+            Matricula.all(),
+            "id",
+            "id",
+            "aluno_id",
+            "turma_id",
+            "nota_01",
+            "nota_02",
+            "nota_03",
+            "faltas_01",
+            "faltas_02",
+            "faltas_03",
+            chunk_size=chunk_size,
+            aluno_nome="aluno__nome",
+        )
 
     @staticmethod
-    async def response(obj: Matricula) -> MatriculaResponse:
+    async def response(obj: Matricula, loader: DataLoader) -> MatriculaResponse:
+        aluno = await loader.load(Aluno, obj.aluno_id)
+        turma = await loader.load(Turma, obj.turma_id)
         return MatriculaResponse(
             id=obj.id,
             aluno_id=obj.aluno_id,
@@ -643,6 +1827,6 @@ class MatriculaService:
             faltas_01=obj.faltas_01,
             faltas_02=obj.faltas_02,
             faltas_03=obj.faltas_03,
-            aluno=AlunoSummary(matricula=obj.aluno.matricula, nome=obj.aluno.nome),
-            turma=TurmaSummary(id=obj.turma.id, vagas=obj.turma.vagas),
+            aluno=AlunoSummary(matricula=aluno.matricula, nome=aluno.nome),
+            turma=TurmaSummary(id=turma.id, vagas=turma.vagas),
         )
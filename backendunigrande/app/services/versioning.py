@@ -0,0 +1,130 @@
+# app/services/versioning.py
+from __future__ import annotations
+
+import secrets
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Set, Type
+
+from fastapi import HTTPException, Request, Response, status
+from tortoise.models import Model
+
+# validade máxima de um ETag, para escritas feitas fora da API (scripts, psql)
+ETAG_MAX_AGE_SECONDS = 60
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+# tabelas alteradas pela requisição de escrita em andamento
+_written_tables: ContextVar[Optional[Set[str]]] = ContextVar(
+    "written_tables", default=None
+)
+# invalidações de cache a repetir depois do commit da escrita em andamento
+_after_commit: ContextVar[Optional[List[Callable[[], None]]]] = ContextVar(
+    "after_commit", default=None
+)
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """
+    Agenda `callback` para rodar de novo depois do handler da requisição de
+    escrita em andamento (ver `bump_after_commit`); fora dela, não faz nada.
+    """
+    pending = _after_commit.get()
+    if pending is not None:
+        pending.append(callback)
+
+
+class TableVersions:
+    """
+    Contador de versão por tabela, incrementado pelos métodos de escrita dos
+    services (`bump`). O ETag de uma rota de leitura é derivado das versões
+    das tabelas que compõem a resposta, então dá para responder 304 sem ir ao
+    banco.
+
+    O ETag também carrega um id do processo (versões zeram no restart) e uma
+    janela de `ETAG_MAX_AGE_SECONDS`, que limita por quanto tempo uma escrita
+    feita fora da API pode passar despercebida.
+    """
+
+    def __init__(self):
+        self.boot_id = secrets.token_hex(4)
+        self._versions: Dict[str, int] = {}
+
+    def bump(self, model: Type[Model]) -> None:
+        table = model._meta.db_table
+        self._versions[table] = self._versions.get(table, 0) + 1
+        written = _written_tables.get()
+        if written is not None:
+            written.add(table)
+
+    def bump_tables(self, tables: Set[str]) -> None:
+        for table in tables:
+            self._versions[table] = self._versions.get(table, 0) + 1
+
+    def version(self, model: Type[Model]) -> int:
+        return self._versions.get(model._meta.db_table, 0)
+
+    def etag(self, *models: Type[Model]) -> str:
+        window = int(time.time() // ETAG_MAX_AGE_SECONDS)
+        versions = ".".join(str(self.version(m)) for m in models)
+        return f'W/"{self.boot_id}-{window}-{versions}"'
+
+
+table_versions = TableVersions()
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # comparação fraca (RFC 9110): ignora o prefixo W/
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(",")
+    )
+
+
+def conditional_get(*models: Type[Model]):
+    """
+    Dependência para rotas de leitura cuja resposta depende de `models`.
+    Se o `If-None-Match` da requisição bate com o ETag atual, responde 304 antes
+    de a rota rodar (nenhuma consulta ao banco); senão, põe o `ETag` na resposta
+    e devolve o valor (rotas que retornam um `Response` próprio o repassam).
+    """
+
+    async def dependency(request: Request, response: Response) -> str:
+        etag = table_versions.etag(*models)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+        response.headers["ETag"] = etag
+        return etag
+
+    return dependency
+
+
+async def bump_after_commit(request: Request):
+    """
+    Dependência dos routers: as rotas de escrita abrem e confirmam a transação
+    dentro do handler, e os services incrementam a versão antes do commit.
+    Incrementar de novo as mesmas tabelas aqui, depois do handler, garante que
+    um ETag emitido por uma leitura concorrente (ainda com os dados antigos)
+    não continue valendo. Pelo mesmo motivo, as invalidações de cache feitas
+    pelos services (`after_commit`) são repetidas aqui: uma leitura entre a
+    invalidação e o commit pode ter posto a linha antiga de volta no cache.
+    """
+    if request.method in SAFE_METHODS:
+        yield
+        return
+    written: Set[str] = set()
+    pending: List[Callable[[], None]] = []
+    _written_tables.set(written)
+    _after_commit.set(pending)
+    try:
+        yield
+    finally:
+        table_versions.bump_tables(written)
+        for callback in pending:
+            callback()
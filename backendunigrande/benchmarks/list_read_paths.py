@@ -0,0 +1,144 @@
+"""
+Compara o caminho atual de listagem (`list_all` + `response` por linha, com
+prefetch e instâncias de model) com o caminho por projeção (`list_values`,
+`.values()` com JOIN e dicts direto) para Aluno, Turma e Histórico.
+
+Uso (a partir de backendunigrande/):
+    python -m benchmarks.list_read_paths --rows 20000
+    python -m benchmarks.list_read_paths --db-url postgres://.../unigrande_bench
+
+O banco informado é populado do zero: use um banco descartável.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+from decimal import Decimal
+
+from tortoise import Tortoise
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
+                                  PeriodoLetivo, Professor, Turma)
+from app.services.unigrande import AlunoService, HistoricoService, TurmaService
+
+
+async def seed(rows: int) -> None:
+    n_prof, n_curso, n_disc, n_pl = 100, 50, 200, 10
+    await Professor.bulk_create(
+        [
+            Professor(id=i, matricula=i, nome=f"PROFESSOR {i}")
+            for i in range(1, n_prof + 1)
+        ]
+    )
+    await Curso.bulk_create(
+        [
+            Curso(id=i, nome=f"CURSO {i}", total_creditos=200, coordenador_id=i)
+            for i in range(1, n_curso + 1)
+        ]
+    )
+    await Disciplina.bulk_create(
+        [
+            Disciplina(
+                id=i,
+                nome=f"DISCIPLINA {i}",
+                creditos=4,
+                tipo="N",
+                horas_obrig=4,
+                limite_faltas=18,
+            )
+            for i in range(1, n_disc + 1)
+        ]
+    )
+    await PeriodoLetivo.bulk_create(
+        [
+            PeriodoLetivo(id=i, ano=2020 + i // 2, semestre=i % 2 + 1)
+            for i in range(1, n_pl + 1)
+        ]
+    )
+    await Aluno.bulk_create(
+        [
+            Aluno(
+                matricula=i,
+                nome=f"ALUNO {i}",
+                total_creditos=100,
+                data_nascimento=date(2000, 1, 1),
+                mgp=Decimal("7.50"),
+                curso_id=i % n_curso + 1,
+            )
+            for i in range(1, rows + 1)
+        ],
+        batch_size=1000,
+    )
+    await Turma.bulk_create(
+        [
+            Turma(
+                id=i,
+                periodo_letivo_id=i % n_pl + 1,
+                curso_id=i // n_pl % n_curso + 1,
+                disciplina_id=i // (n_pl * n_curso) % n_disc + 1,
+                professor_id=(i % n_prof + 1) if i % 5 else None,
+                vagas=60,
+            )
+            for i in range(1, min(rows, n_pl * n_curso * n_disc) + 1)
+        ],
+        batch_size=1000,
+    )
+    await Historico.bulk_create(
+        [
+            Historico(
+                id=i,
+                periodo_letivo_id=i % n_pl + 1,
+                aluno_id=i,
+                disciplina_id=i % n_disc + 1,
+                situacao="AP",
+                media_final=Decimal("8.00"),
+                faltas=2,
+            )
+            for i in range(1, rows + 1)
+        ],
+        batch_size=1000,
+    )
+
+
+async def _best_of(fn, repeat: int):
+    best, count = float("inf"), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(await fn())
+        best = min(best, time.perf_counter() - start)
+    return count, best
+
+
+async def run(db_url: str, rows: int, repeat: int) -> None:
+    await Tortoise.init(db_url=db_url, modules={"models": ["app.models.tortoise"]})
+    await Tortoise.generate_schemas()
+    try:
+        await seed(rows)
+        print(f"{'entidade':<10} {'caminho':<22} {'linhas':>8} {'linhas/s':>12}")
+        for name, service in (
+            ("Aluno", AlunoService),
+            ("Turma", TurmaService),
+            ("Historico", HistoricoService),
+        ):
+
+            async def current(service=service):
+                return [await service.response(x) for x in await service.list_all()]
+
+            for label, fn in (
+                ("list_all + response", current),
+                ("list_values", service.list_values),
+            ):
+                count, elapsed = await _best_of(fn, repeat)
+                print(f"{name:<10} {label:<22} {count:>8} {count / elapsed:>12,.0f}")
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.db_url, args.rows, args.repeat))
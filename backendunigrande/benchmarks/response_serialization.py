@@ -0,0 +1,122 @@
+"""
+Compara a serialização padrão do FastAPI (valor devolvido pela rota, validado
+contra o `response_model`, `jsonable_encoder` e `json.dumps`) com
+`json_response` em `/alunos/listar-alunos`: validando uma vez com um
+`TypeAdapter` ou, como a rota faz com as linhas de `list_values`, sem validar.
+
+Mede só a serialização (as mesmas linhas de `list_values`) e a requisição
+inteira via ASGI, com a rota antiga montada num app à parte.
+
+Uso (a partir de backendunigrande/):
+    python -m benchmarks.response_serialization --rows 20000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from httpx import AsyncClient
+from tortoise import Tortoise
+
+from app.api.alunos import router as alunos_router
+from app.schemas.unigrande import AlunoResponse
+from app.services.serialization import json_response
+from app.services.unigrande import AlunoService
+from benchmarks.list_read_paths import seed
+
+PATH = "/listar-alunos"
+
+
+def _app_antigo() -> FastAPI:
+    app = FastAPI()
+
+    @app.get(PATH, response_model=List[AlunoResponse])
+    async def list_alunos():
+        return await AlunoService.list_values()
+
+    return app
+
+
+def _app_novo() -> FastAPI:
+    app = FastAPI()
+    app.include_router(alunos_router)
+    return app
+
+
+async def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def run(db_url: str, rows: int, repeat: int) -> None:
+    await Tortoise.init(db_url=db_url, modules={"models": ["app.models.tortoise"]})
+    await Tortoise.generate_schemas()
+    try:
+        await seed(rows)
+        valores = await AlunoService.list_values()
+        field = next(
+            r.response_field
+            for r in _app_antigo().routes
+            if isinstance(r, APIRoute) and r.path == PATH
+        )
+
+        async def padrao():
+            content = await serialize_response(field=field, response_content=valores)
+            return JSONResponse(content).body
+
+        async def adapter():
+            return json_response(List[AlunoResponse], valores).body
+
+        async def direto():
+            return json_response(List[AlunoResponse], valores, validate=False).body
+
+        assert (await padrao()) == (await adapter())
+        assert json.loads(await padrao()) == json.loads(await direto())
+
+        print(f"{'etapa':<24} {'caminho':<22} {'linhas':>8} {'ms':>9} {'linhas/s':>12}")
+        for label, fn in (
+            ("response_model", padrao),
+            ("TypeAdapter", adapter),
+            ("sem validação", direto),
+        ):
+            elapsed = await _best_of(fn, repeat)
+            print(
+                f"{'serialização':<24} {label:<22} {len(valores):>8}"
+                f" {elapsed * 1000:>9.1f} {len(valores) / elapsed:>12,.0f}"
+            )
+
+        for label, app in (
+            ("response_model", _app_antigo()),
+            ("json_response (rota)", _app_novo()),
+        ):
+            async with AsyncClient(app=app, base_url="http://bench") as client:
+
+                async def requisicao(client=client):
+                    resp = await client.get(PATH)
+                    assert resp.status_code == 200
+
+                elapsed = await _best_of(requisicao, repeat)
+            print(
+                f"{'GET /alunos' + PATH:<24} {label:<22} {len(valores):>8}"
+                f" {elapsed * 1000:>9.1f} {len(valores) / elapsed:>12,.0f}"
+            )
+    finally:
+        await Tortoise.close_connections()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db-url", default="sqlite://:memory:")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.db_url, args.rows, args.repeat))
@@ -0,0 +1,38 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    # acumuladores, total_creditos e mgp de todos os alunos recalculados dos
+    # históricos (as mesmas regras de app.services.mgp): os valores antigos
+    # de total_creditos/mgp não somam com os deltas aplicados daqui em diante
+    return """
+        ALTER TABLE "alunos" ADD "mgp_pontos" DECIMAL(12,2) NOT NULL DEFAULT 0;
+ALTER TABLE "alunos" ADD "mgp_creditos" INT NOT NULL DEFAULT 0;
+UPDATE "alunos" AS a
+SET "mgp_pontos" = h."pontos",
+    "mgp_creditos" = h."creditos_mgp",
+    "total_creditos" = h."creditos",
+    "mgp" = CASE WHEN h."creditos_mgp" = 0 THEN NULL
+                 ELSE ROUND(h."pontos" / h."creditos_mgp", 2) END
+FROM (
+    SELECT al."matricula" AS "aluno_id",
+           COALESCE(SUM(h."media_final" * d."creditos") FILTER (
+               WHERE h."situacao" IN ('AP', 'RE') AND h."media_final" IS NOT NULL
+           ), 0) AS "pontos",
+           COALESCE(SUM(d."creditos") FILTER (
+               WHERE h."situacao" IN ('AP', 'RE') AND h."media_final" IS NOT NULL
+           ), 0) AS "creditos_mgp",
+           COALESCE(SUM(d."creditos") FILTER (WHERE h."situacao" = 'AP'), 0)
+               AS "creditos"
+    FROM "alunos" al
+    LEFT JOIN "historicos" h ON h."aluno_id" = al."matricula"
+    LEFT JOIN "disciplinas" d ON d."id" = h."disciplina_id"
+    GROUP BY al."matricula"
+) AS h
+WHERE a."matricula" = h."aluno_id";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "alunos" DROP COLUMN "mgp_creditos";
+ALTER TABLE "alunos" DROP COLUMN "mgp_pontos";"""
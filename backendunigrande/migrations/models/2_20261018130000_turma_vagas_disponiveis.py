@@ -0,0 +1,14 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "turmas" ADD "vagas_disponiveis" INT NOT NULL DEFAULT 0;
+UPDATE "turmas" AS t SET "vagas_disponiveis" = t."vagas" - (
+    SELECT COUNT(*) FROM "matriculas" m WHERE m."turma_id" = t."id"
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        ALTER TABLE "turmas" DROP COLUMN "vagas_disponiveis";"""
@@ -0,0 +1,59 @@
+from tortoise import BaseDBAsyncClient
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "estatisticas" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "horas_obrig" INT NOT NULL DEFAULT 0,
+    "historicos" INT NOT NULL DEFAULT 0,
+    "aprovados" INT NOT NULL DEFAULT 0,
+    "com_media" INT NOT NULL DEFAULT 0,
+    "soma_medias" DECIMAL(14,2) NOT NULL DEFAULT 0,
+    "com_faltas" INT NOT NULL DEFAULT 0,
+    "soma_faltas" INT NOT NULL DEFAULT 0,
+    "matriculas" INT NOT NULL DEFAULT 0,
+    "faltas_matriculas" INT NOT NULL DEFAULT 0,
+    "curso_id" INT NOT NULL REFERENCES "cursos" ("id") ON DELETE CASCADE,
+    "disciplina_id" INT NOT NULL REFERENCES "disciplinas" ("id") ON DELETE CASCADE,
+    "periodo_letivo_id" INT NOT NULL REFERENCES "periodos_letivos" ("id") ON DELETE CASCADE,
+    "professor_id" INT REFERENCES "professores" ("id") ON DELETE SET NULL,
+    CONSTRAINT "uid_estatistica_periodo_c8869a" UNIQUE ("periodo_letivo_id", "curso_id", "disciplina_id")
+);
+CREATE INDEX IF NOT EXISTS "idx_estatistica_curso_i_850361" ON "estatisticas" ("curso_id");
+CREATE INDEX IF NOT EXISTS "idx_estatistica_discipl_8ae812" ON "estatisticas" ("disciplina_id");
+CREATE INDEX IF NOT EXISTS "idx_estatistica_profess_b9bf73" ON "estatisticas" ("professor_id");
+COMMENT ON TABLE "estatisticas" IS 'ESTATISTICAS (contadores de históricos e matrículas por período/curso/disciplina)';
+INSERT INTO "estatisticas" (
+    "periodo_letivo_id", "curso_id", "disciplina_id", "historicos", "aprovados",
+    "com_media", "soma_medias", "com_faltas", "soma_faltas"
+)
+SELECT h."periodo_letivo_id", a."curso_id", h."disciplina_id", COUNT(*),
+       COUNT(*) FILTER (WHERE h."situacao" = 'AP'), COUNT(h."media_final"),
+       COALESCE(SUM(h."media_final"), 0), COUNT(h."faltas"),
+       COALESCE(SUM(h."faltas"), 0)
+FROM "historicos" h
+JOIN "alunos" a ON a."matricula" = h."aluno_id"
+GROUP BY h."periodo_letivo_id", a."curso_id", h."disciplina_id";
+INSERT INTO "estatisticas" (
+    "periodo_letivo_id", "curso_id", "disciplina_id", "matriculas", "faltas_matriculas"
+)
+SELECT t."periodo_letivo_id", t."curso_id", t."disciplina_id", COUNT(*),
+       SUM(COALESCE(m."faltas_01", 0) + COALESCE(m."faltas_02", 0) + COALESCE(m."faltas_03", 0))
+FROM "matriculas" m
+JOIN "turmas" t ON t."id" = m."turma_id"
+GROUP BY t."periodo_letivo_id", t."curso_id", t."disciplina_id"
+ON CONFLICT ("periodo_letivo_id", "curso_id", "disciplina_id") DO UPDATE
+SET "matriculas" = EXCLUDED."matriculas", "faltas_matriculas" = EXCLUDED."faltas_matriculas";
+UPDATE "estatisticas" AS e SET "horas_obrig" = d."horas_obrig"
+FROM "disciplinas" d WHERE d."id" = e."disciplina_id";
+UPDATE "estatisticas" AS e SET "professor_id" = t."professor_id"
+FROM "turmas" t
+WHERE t."periodo_letivo_id" = e."periodo_letivo_id"
+  AND t."curso_id" = e."curso_id"
+  AND t."disciplina_id" = e."disciplina_id";"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        DROP TABLE IF EXISTS "estatisticas";"""
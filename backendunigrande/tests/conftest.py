@@ -1,3 +1,4 @@
+import logging
 import os
 
 import pytest
@@ -5,10 +6,16 @@ import pytest_asyncio
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from httpx import AsyncClient
 from starlette.testclient import TestClient
+from tortoise import Tortoise
 from tortoise.contrib.fastapi import RegisterTortoise
 
 from app.config.application import create_application
 from app.config.settings import Settings, get_settings
+from app.services.admissao import fila_matriculas
+from app.services.busca import name_index
+from app.services.cache import (curriculo_cache, historico_escolar_cache,
+                                reference_cache)
+from app.services.counting import count_provider
 
 
 def get_settings_override():
@@ -53,3 +60,55 @@ async def test_app_with_db():
     async with AsyncClient(app=app, base_url="http://test") as client:
         await client.get("/")  # Garante que lifespan/startup sejam executados
         yield client
+
+
+@pytest_asyncio.fixture
+async def sqlite_db():
+    """
+    Banco SQLite em memória com o schema gerado pelos models,
+    para testes de service que não dependem do Postgres.
+    """
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["app.models.tortoise"]},
+    )
+    await Tortoise.generate_schemas()
+    # caches em memória não podem sobreviver de um banco de teste para outro
+    count_provider.clear()
+    reference_cache.clear()
+    historico_escolar_cache.clear()
+    curriculo_cache.clear()
+    name_index.clear()
+    yield
+    await fila_matriculas.stop()
+    await Tortoise.close_connections()
+
+
+@pytest.fixture
+def consultas(caplog):
+    """
+    Função que devolve o SQL enviado ao banco desde o último
+    `caplog.clear()`, para testes que contam consultas.
+    """
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+
+    def _consultas():
+        return [
+            r.getMessage() for r in caplog.records if r.name == "tortoise.db_client"
+        ]
+
+    return _consultas
+
+
+@pytest_asyncio.fixture
+async def sqlite_client(sqlite_db):
+    app = create_application()
+    app.dependency_overrides[get_settings] = get_settings_override
+
+    app.user_middleware = [
+        mw for mw in app.user_middleware if mw.cls is not TrustedHostMiddleware
+    ]
+    app.middleware_stack = app.build_middleware_stack()
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,33 @@
+import pytest
+
+from app.models.unigrande import Aluno, Curso
+
+
+@pytest.mark.asyncio
+async def test_create_alunos_lote_reporta_linhas_rejeitadas(sqlite_client):
+    await Curso.create(id=35, nome="Odontologia - Integral", total_creditos=0)
+    await Aluno.create(matricula=1, nome="JA CADASTRADO", total_creditos=0, curso_id=35)
+
+    def aluno(matricula, curso_id=35):
+        return {
+            "matricula": matricula,
+            "nome": f"ALUNO {matricula}",
+            "curso_id": curso_id,
+        }
+
+    payload = {"alunos": [aluno(10), aluno(11, curso_id=999), aluno(1), aluno(10)]}
+    response = await sqlite_client.post("/alunos/create-alunos-lote", json=payload)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["accepted"], body["rejected"]) == (4, 1, 3)
+    assert [r["status"] for r in body["results"]] == [
+        "accepted",
+        "rejected",
+        "rejected",
+        "rejected",
+    ]
+    assert body["results"][1]["detail"] == "Curso não encontrado."
+    assert body["results"][2]["detail"] == "Aluno com esta matrícula já existe."
+    assert body["results"][3]["detail"] == "Matrícula repetida no lote."
+    assert await Aluno.all().count() == 2
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+
+import pytest
+
+from app.models.unigrande import Aluno, Curso, Professor
+from app.schemas.unigrande import AlunoCreate, AlunoUpdate
+from app.services.busca import NameIndex, NameIndexes, normalizar
+from app.services.unigrande import AlunoService
+
+
+def test_normalizar_remove_acento_e_caixa():
+    assert normalizar("  JOÃO  da Conceição ") == "joao da conceicao"
+
+
+def test_indice_prefixo_tokens_e_remocao():
+    index = NameIndex()
+    index.load([(1, "MARIA DA SILVA"), (2, "Mário Silveira"), (3, "ANA MARIA")])
+
+    # primeiro quem começa com a consulta, depois quem tem a palavra
+    assert [i for i, _ in index.search("mari")] == [1, 2, 3]
+    assert index.search("mar silv") == [(1, "MARIA DA SILVA"), (2, "Mário Silveira")]
+    assert index.search("silva maria") == [(1, "MARIA DA SILVA")]
+    assert index.search("xyz") == [] and index.search("  ") == []
+    # palavra curta só filtra: "ma" não busca tokens, "ma silv" sim
+    assert [i for i, _ in index.search("ma")] == [1, 2]
+    assert [i for i, _ in index.search("silv ma")] == [1, 2]
+
+    index.add(4, "Ângela Maria")
+    index.add(2, "MARIO SOUZA")  # renomeado
+    assert [i for i, _ in index.search("angela")] == [4]
+    assert index.search("silveira") == []
+    index.remove(1)
+    assert [i for i, _ in index.search("maria")] == [3, 4]
+
+
+def test_indice_grande_responde_rapido():
+    rnd = random.Random(1)
+    nomes = ["ANA", "JOSE", "MARIA", "JOAO", "PEDRO", "LUCAS", "BRUNA", "RITA"]
+    sobrenomes = ["SILVA", "SOUZA", "COSTA", "LIMA", "ALVES", "ARAUJO", "ROCHA"]
+    index = NameIndex()
+    index.load(
+        [
+            (i, " ".join([rnd.choice(nomes), *rnd.sample(sobrenomes, 2), str(i)]))
+            for i in range(100_000)
+        ]
+    )
+    consultas = ("maria sil", "jo", "rocha 4242", "pedro lima 99", "alves souza")
+    start = time.perf_counter()
+    for consulta in consultas:
+        assert len(index.search(consulta)) == 10 or consulta == "rocha 4242"
+    assert (time.perf_counter() - start) / len(consultas) < 0.05
+
+    # prefixos curtos cobrem ~11 mil tokens numéricos: não são expandidos
+    start = time.perf_counter()
+    for _ in range(20):
+        assert index.search("4") == []
+        assert len(index.search("silva 4")) == 10
+    assert (time.perf_counter() - start) / 40 < 0.005
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_acompanha_escritas(sqlite_client):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Aluno.create(matricula=1, nome="JOSÉ ALVES", total_creditos=0, curso_id=1)
+    await Professor.create(id=1, matricula=10, nome="Érica Lima")
+
+    resp = await sqlite_client.get("/alunos/autocomplete-alunos", params={"q": "jose"})
+    assert resp.json() == [{"id": 1, "nome": "JOSÉ ALVES"}]
+    resp = await sqlite_client.get(
+        "/professores/autocomplete-professores", params={"q": "ERICA"}
+    )
+    assert resp.json() == [{"id": 1, "nome": "Érica Lima"}]
+
+    # índice já montado: os services mantêm
+    await AlunoService.create(AlunoCreate(matricula=2, nome="JOSEFA ROCHA", curso_id=1))
+    await AlunoService.update(1, AlunoUpdate(nome="JOÃO ALVES"))
+    resp = await sqlite_client.get("/alunos/autocomplete-alunos", params={"q": "jo"})
+    assert resp.json() == [
+        {"id": 1, "nome": "JOÃO ALVES"},
+        {"id": 2, "nome": "JOSEFA ROCHA"},
+    ]
+    await AlunoService.delete(2)
+    resp = await sqlite_client.get("/alunos/autocomplete-alunos", params={"q": "rocha"})
+    assert resp.json() == []
+
+    stats = (await sqlite_client.get("/metricas/indice-nomes")).json()
+    assert stats == {"alunos": 1, "professores": 1}
+
+    # a cascata do curso também tira os alunos do índice
+    resp = await sqlite_client.delete("/cursos/delete-curso/1")
+    assert resp.status_code == 204
+    resp = await sqlite_client.get("/alunos/autocomplete-alunos", params={"q": "jo"})
+    assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_escritas_durante_a_montagem_sao_reaplicadas(monkeypatch):
+    indices = NameIndexes()
+    lendo, liberar = asyncio.Event(), asyncio.Event()
+
+    async def build(model):
+        # leitura do banco feita antes das escritas abaixo
+        lendo.set()
+        await liberar.wait()
+        index = NameIndex()
+        index.load([(1, "ANA"), (2, "BIA")])
+        return index
+
+    monkeypatch.setattr(indices, "_build", build)
+    montagem = asyncio.create_task(indices.index(Aluno))
+    await lendo.wait()
+    indices.add(Aluno, 3, "CAIO")
+    indices.remove(Aluno, 2)
+    indices.add(Aluno, 1, "ANABELA")
+    liberar.set()
+    await montagem
+
+    assert await indices.search(Aluno, "a") == [(1, "ANABELA")]
+    assert await indices.search(Aluno, "caio") == [(3, "CAIO")]
+    assert await indices.search(Aluno, "bia") == []
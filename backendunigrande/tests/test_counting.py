@@ -0,0 +1,28 @@
+import pytest
+
+from app.models.unigrande import Aluno, Curso
+from app.schemas.unigrande import AlunoCreate
+from app.services.counting import count_provider
+from app.services.unigrande import AlunoService
+
+
+@pytest.mark.asyncio
+async def test_total_em_cache_e_invalidado_pelas_escritas(sqlite_db):
+    await Curso.create(id=35, nome="Odontologia - Integral", total_creditos=0)
+    await Aluno.create(matricula=1, nome="ANA", total_creditos=0, curso_id=35)
+
+    assert await count_provider.count(Aluno, "cached") == (1, "cached")
+
+    # escrita por fora do service: o cache segue valendo até o TTL
+    await Aluno.create(matricula=2, nome="BRUNO", total_creditos=0, curso_id=35)
+    assert await count_provider.count(Aluno, "cached") == (1, "cached")
+    assert await count_provider.count(Aluno, "exact") == (2, "exact")
+
+    await AlunoService.create(
+        AlunoCreate(matricula=3, nome="CARLA", curso_id=35)
+    )
+    assert await count_provider.count(Aluno, "cached") == (3, "cached")
+
+    await AlunoService.delete(3)
+    # SQLite não tem pg_class: a estimativa cai para o modo cached
+    assert await count_provider.count(Aluno, "estimate") == (2, "cached")
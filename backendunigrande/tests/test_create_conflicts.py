@@ -0,0 +1,57 @@
+import asyncio
+import logging
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import Curso, Disciplina, Matriz, PeriodoLetivo
+from app.schemas.unigrande import MatrizCreate, PeriodoLetivoCreate
+from app.services.cache import reference_cache
+from app.services.unigrande import MatrizService, PeriodoLetivoService
+
+
+@pytest.mark.asyncio
+async def test_creates_concorrentes_gravam_uma_linha_so(sqlite_db):
+    payload = PeriodoLetivoCreate(ano=2026, semestre=1)
+
+    results = await asyncio.gather(
+        *(PeriodoLetivoService.create(payload) for _ in range(10)),
+        return_exceptions=True,
+    )
+
+    created = [r for r in results if isinstance(r, PeriodoLetivo)]
+    conflicts = [r for r in results if isinstance(r, HTTPException)]
+    assert len(created) == 1
+    assert len(conflicts) == 9
+    assert {(c.status_code, c.detail) for c in conflicts} == {
+        (409, "Período letivo já existe para (ano, semestre).")
+    }
+    assert await PeriodoLetivo.filter(ano=2026, semestre=1).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_create_bem_sucedido_faz_uma_ida_ao_banco(sqlite_db, caplog):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    # FKs de tabelas de referência já em cache não vão ao banco
+    await reference_cache.prime(Curso, [1])
+    await reference_cache.prime(Disciplina, [1])
+
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+    caplog.clear()
+    await MatrizService.create(
+        MatrizCreate(id=1, curso_id=1, disciplina_id=1, periodo=1)
+    )
+    queries = [r for r in caplog.records if r.name == "tortoise.db_client"]
+    assert len(queries) == 1
+    assert queries[0].getMessage().upper().startswith("INSERT")
+
+    with pytest.raises(HTTPException) as exc:
+        await MatrizService.create(
+            MatrizCreate(id=2, curso_id=1, disciplina_id=1, periodo=2)
+        )
+    assert exc.value.status_code == 409
+    assert exc.value.detail == "Matriz já existe para (curso, disciplina)."
+    assert await Matriz.all().count() == 1
@@ -0,0 +1,198 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Estatistica,
+                                  PeriodoLetivo, Professor)
+from app.schemas.unigrande import (AlunoUpdate, HistoricoCreate,
+                                   HistoricoUpdate, MatriculaCreate,
+                                   MatriculaUpdate, PautaLinha, TurmaCreate,
+                                   TurmaUpdate)
+from app.services.estatisticas import Contagem, EstatisticaService
+from app.services.unigrande import (AlunoService, CursoService,
+                                    HistoricoService, MatriculaService,
+                                    TurmaService)
+
+
+async def _snapshot():
+    return {
+        (e["periodo_letivo_id"], e["curso_id"], e["disciplina_id"]): (
+            e["professor_id"],
+            e["horas_obrig"],
+            Contagem(*(e[f] for f in Contagem._fields)),
+        )
+        for e in await Estatistica.all().values()
+        if any(e[f] for f in Contagem._fields)
+    }
+
+
+async def _cadastros():
+    for id_ in (1, 2):
+        await Curso.create(id=id_, nome=f"CURSO {id_}", total_creditos=200)
+        await Professor.create(id=id_, nome=f"PROF {id_}")
+        await Disciplina.create(
+            id=id_,
+            nome=f"DISC {id_}",
+            creditos=4,
+            tipo="N",
+            horas_obrig=20 * id_,
+            limite_faltas=18,
+        )
+        await PeriodoLetivo.create(id=id_, ano=2026, semestre=id_)
+    for matricula in (1, 2, 3, 4):
+        await Aluno.create(
+            matricula=matricula, nome="A", total_creditos=0, curso_id=1 + matricula % 2
+        )
+
+
+async def _historico(id_, pl, aluno, disc, situacao, media, faltas):
+    await HistoricoService.create(
+        HistoricoCreate(
+            id=id_,
+            periodo_letivo_id=pl,
+            aluno_id=aluno,
+            disciplina_id=disc,
+            situacao=situacao,
+            media_final=media,
+            faltas=faltas,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_incremental_igual_ao_rebuild(sqlite_db):
+    await _cadastros()
+    await _historico(1, 1, 1, 1, "AP", "8.25", 2)
+    await _historico(2, 1, 2, 1, "RE", "4.50", 10)
+    await _historico(3, 1, 3, 1, "AP", "7.00", None)
+    await _historico(4, 1, 4, 2, "TC", None, None)
+    await _historico(5, 2, 1, 2, "AP", "9.75", 0)
+    await HistoricoService.update(2, HistoricoUpdate(situacao="AP", media_final=7))
+    await HistoricoService.update(3, HistoricoUpdate(aluno_id=4))
+    await HistoricoService.delete(5)
+
+    await TurmaService.create(
+        TurmaCreate(id=1, periodo_letivo_id=2, curso_id=1, disciplina_id=1, vagas=10)
+    )
+    await TurmaService.create(
+        TurmaCreate(
+            id=2,
+            periodo_letivo_id=2,
+            curso_id=2,
+            disciplina_id=2,
+            professor_id=2,
+            vagas=10,
+        )
+    )
+    await MatriculaService.create(MatriculaCreate(id=1, aluno_id=1, turma_id=1))
+    await MatriculaService.create(MatriculaCreate(id=2, aluno_id=2, turma_id=1))
+    await MatriculaService.update(1, MatriculaUpdate(faltas_01=4, faltas_02=2))
+    await MatriculaService.update(2, MatriculaUpdate(turma_id=2))
+    await MatriculaService.create_lote_turma(
+        1, [MatriculaCreate(id=3, aluno_id=3, turma_id=1)]
+    )
+    await MatriculaService.lancar_pauta(1, [PautaLinha(aluno_id=3, faltas_03=6)])
+    await MatriculaService.delete(1)
+    await TurmaService.update(1, TurmaUpdate(professor_id=1))
+
+    # chave do aluno muda com o curso; turma removida leva as matrículas
+    await AlunoService.update(4, AlunoUpdate(curso_id=2))
+    await TurmaService.delete(2)
+
+    incremental = await _snapshot()
+    await EstatisticaService.rebuild(chunk_size=1)
+    assert await _snapshot() == incremental
+
+    assert incremental[(1, 1, 1)] == (
+        None,
+        20,
+        Contagem(1, 1, 1, Decimal("7.00"), 1, 10, 0, 0),
+    )
+    assert incremental[(1, 2, 1)] == (
+        None,
+        20,
+        Contagem(2, 2, 2, Decimal("15.25"), 1, 2, 0, 0),
+    )
+    assert incremental[(2, 1, 1)] == (1, 20, Contagem(0, 0, 0, 0, 0, 0, 1, 6))
+    assert (2, 2, 2) not in incremental
+
+
+@pytest.mark.asyncio
+async def test_remover_curso_recalcula_turmas_de_outros_cursos(sqlite_db):
+    await _cadastros()
+    await TurmaService.create(
+        TurmaCreate(id=1, periodo_letivo_id=1, curso_id=2, disciplina_id=1, vagas=10)
+    )
+    # alunos 1 (curso 2) e 2 (curso 1) na turma do curso 2
+    await MatriculaService.create(MatriculaCreate(id=1, aluno_id=1, turma_id=1))
+    await MatriculaService.create(MatriculaCreate(id=2, aluno_id=2, turma_id=1))
+    await MatriculaService.update(2, MatriculaUpdate(faltas_01=3))
+    await _historico(1, 1, 2, 1, "AP", "8.00", 4)
+
+    await CursoService.delete(1)
+
+    incremental = await _snapshot()
+    await EstatisticaService.rebuild()
+    assert await _snapshot() == incremental
+    assert incremental == {(1, 2, 1): (None, 20, Contagem(matriculas=1))}
+
+
+@pytest.mark.asyncio
+async def test_endpoints_leem_so_o_resumo(sqlite_client, caplog):
+    await _cadastros()
+    await TurmaService.create(
+        TurmaCreate(
+            id=1,
+            periodo_letivo_id=1,
+            curso_id=2,
+            disciplina_id=1,
+            professor_id=1,
+            vagas=10,
+        )
+    )
+    await _historico(1, 1, 1, 1, "AP", "8.00", 4)
+    await _historico(2, 1, 3, 1, "RE", "5.00", 6)
+    await _historico(3, 1, 2, 2, "AP", "9.50", 8)
+    await MatriculaService.create(MatriculaCreate(id=1, aluno_id=1, turma_id=1))
+    await MatriculaService.update(1, MatriculaUpdate(faltas_01=5))
+
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+    caplog.clear()
+    resp = await sqlite_client.get("/estatisticas/por-curso?periodo_letivo_id=1")
+    queries = [r for r in caplog.records if r.name == "tortoise.db_client"]
+
+    assert resp.status_code == 200
+    assert len(queries) == 1
+    assert resp.json() == [
+        {
+            "id": 1,
+            "historicos": 1,
+            "aprovados": 1,
+            "taxa_aprovacao": 100.0,
+            "media_final": "9.50",
+            "taxa_faltas": 20.0,
+            "matriculas": 0,
+            "taxa_faltas_em_curso": None,
+        },
+        {
+            "id": 2,
+            "historicos": 2,
+            "aprovados": 1,
+            "taxa_aprovacao": 50.0,
+            "media_final": "6.50",
+            "taxa_faltas": 25.0,
+            "matriculas": 1,
+            "taxa_faltas_em_curso": 25.0,
+        },
+    ]
+
+    resp = await sqlite_client.get("/estatisticas/por-professor")
+    assert [(g["id"], g["historicos"], g["matriculas"]) for g in resp.json()] == [
+        (1, 2, 1)
+    ]
+    etag = resp.headers["etag"]
+    resp = await sqlite_client.get(
+        "/estatisticas/por-professor", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
@@ -0,0 +1,59 @@
+import pytest
+
+from app.models.unigrande import Curso, Professor
+from app.services.unigrande import CursoService
+from app.services.versioning import table_versions
+
+
+@pytest.mark.asyncio
+async def test_listagem_responde_304_sem_consultar_o_banco(sqlite_client, monkeypatch):
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(id=1, nome="CURSO A", total_creditos=200, coordenador_id=1)
+
+    resp = await sqlite_client.get("/cursos/listar-cursos")
+    etag = resp.headers["ETag"]
+    assert resp.status_code == 200
+
+    async def sem_banco():
+        raise AssertionError("304 não deveria consultar o banco")
+
+    monkeypatch.setattr(CursoService, "list_values", sem_banco)
+    resp = await sqlite_client.get(
+        "/cursos/listar-cursos", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert resp.headers["ETag"] == etag
+    assert resp.content == b""
+
+
+@pytest.mark.asyncio
+async def test_escrita_pela_api_muda_o_etag(sqlite_client):
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    resp = await sqlite_client.get("/cursos/listar-cursos")
+    etag = resp.headers["ETag"]
+    versao = table_versions.version(Professor)
+
+    resp = await sqlite_client.put(
+        "/professores/atualizar-professor/1", json={"nome": "PROFESSOR NOVO"}
+    )
+    assert resp.status_code == 200
+    # incrementado no service e de novo depois do commit
+    assert table_versions.version(Professor) == versao + 2
+
+    resp = await sqlite_client.get(
+        "/cursos/listar-cursos", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_view_html_de_alunos_usa_etag(sqlite_client):
+    resp = await sqlite_client.get("/alunos/list-alunos/view")
+    assert resp.status_code == 200
+    etag = resp.headers["ETag"]
+
+    resp = await sqlite_client.get(
+        "/alunos/list-alunos/view", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
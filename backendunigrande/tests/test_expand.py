@@ -0,0 +1,110 @@
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Matricula,
+                                  PeriodoLetivo, Professor, Turma)
+from app.services import expand
+
+
+async def _dados():
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(id=1, nome="CURSO 1", total_creditos=200, coordenador_id=1)
+    await Curso.create(id=2, nome="CURSO 2", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Turma.create(
+        id=1, periodo_letivo_id=1, curso_id=1, disciplina_id=1, professor_id=1, vagas=9
+    )
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1)
+            for m in range(1, 6)
+        ]
+    )
+    await Matricula.bulk_create(
+        [Matricula(id=m, aluno_id=m, turma_id=1) for m in range(1, 6)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_expand_curso_numa_requisicao(sqlite_client, caplog, consultas):
+    await _dados()
+
+    resp = await sqlite_client.get("/cursos/buscar-curso/1")
+    assert resp.status_code == 200
+    assert resp.json()["expanded"] is None
+
+    url = "/cursos/buscar-curso/1?expand=coordenador,alunos,turmas.professor"
+    caplog.clear()
+    resp = await sqlite_client.get(url)
+    assert resp.status_code == 200
+    # resumos com o reference_cache frio: no máximo uma consulta por tabela
+    assert len(consultas()) <= 8
+    caplog.clear()
+    resp = await sqlite_client.get(url)
+    # curso, professor, alunos e turmas: uma consulta por relação
+    assert len(consultas()) == 4
+    expanded = resp.json()["expanded"]
+    assert expanded["coordenador"] == {
+        "id": 1,
+        "matricula": 10,
+        "nome": "PROFESSOR 1",
+    }
+    assert [a["matricula"] for a in expanded["alunos"]] == [1, 2, 3, 4, 5]
+    assert expanded["alunos"][0]["curso"] == {"id": 1, "nome": "CURSO 1"}
+    (turma,) = expanded["turmas"]
+    assert turma["id"] == 1
+    assert turma["expanded"]["professor"]["nome"] == "PROFESSOR 1"
+    assert "X-Expand-Truncated" not in resp.headers
+
+    resp = await sqlite_client.get("/cursos/buscar-curso/2?expand=coordenador,alunos")
+    assert resp.json()["expanded"] == {"coordenador": None, "alunos": []}
+
+
+@pytest.mark.asyncio
+async def test_expand_matricula_aninhado(sqlite_client):
+    await _dados()
+    resp = await sqlite_client.get(
+        "/matriculas/buscar-matricula/3?expand=aluno,turma.disciplina"
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["aluno"] == {"matricula": 3, "nome": "A3"}
+    assert body["expanded"]["aluno"]["curso"] == {"id": 1, "nome": "CURSO 1"}
+    turma = body["expanded"]["turma"]
+    assert turma["vagas"] == 9
+    assert turma["expanded"]["disciplina"]["nome"] == "DISC"
+
+    resp = await sqlite_client.get("/matriculas/buscar-matricula/99")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_expand_fora_da_lista_e_limite(sqlite_client, monkeypatch):
+    await _dados()
+
+    resp = await sqlite_client.get("/alunos/buscar-aluno/1?expand=curso.alunos")
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("expand inválido: curso.alunos.")
+
+    monkeypatch.setattr(expand, "EXPAND_MAX_ROWS", 2)
+    resp = await sqlite_client.get("/cursos/buscar-curso/1?expand=alunos,turmas")
+    assert resp.headers["X-Expand-Truncated"] == "alunos"
+    assert [a["matricula"] for a in resp.json()["expanded"]["alunos"]] == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_expand_etag_inclui_as_relacoes(sqlite_client):
+    await _dados()
+    url = "/cursos/buscar-curso/1?expand=alunos"
+    etag = (await sqlite_client.get(url)).headers["ETag"]
+    assert (
+        await sqlite_client.get(url, headers={"If-None-Match": etag})
+    ).status_code == 304
+
+    resp = await sqlite_client.put("/alunos/atualizar-aluno/2", json={"nome": "B2"})
+    assert resp.status_code == 200
+    resp = await sqlite_client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["expanded"]["alunos"][1]["nome"] == "B2"
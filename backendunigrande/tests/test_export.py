@@ -0,0 +1,38 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.models.unigrande import Aluno, Curso
+from app.services.unigrande import AlunoService
+
+
+@pytest.mark.asyncio
+async def test_exportar_alunos_ndjson_e_csv(sqlite_client):
+    await Curso.create(id=35, nome="Odontologia - Integral", total_creditos=0)
+    for matricula in range(1, 6):
+        await Aluno.create(
+            matricula=matricula,
+            nome=f"ALUNO {matricula}",
+            total_creditos=10,
+            mgp="6.55",
+            curso_id=35,
+        )
+
+    # blocos pequenos para garantir a leitura em várias consultas
+    chunks = [c async for c in AlunoService.export_rows(chunk_size=2)]
+    assert [len(c) for c in chunks] == [2, 2, 1]
+
+    response = await sqlite_client.get("/alunos/exportar-alunos")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    linhas = [json.loads(x) for x in response.text.splitlines()]
+    assert [x["matricula"] for x in linhas] == [1, 2, 3, 4, 5]
+    assert linhas[0]["curso_nome"] == "Odontologia - Integral"
+    assert linhas[0]["mgp"] == "6.55"
+
+    response = await sqlite_client.get(
+        "/alunos/exportar-alunos", params={"formato": "csv"}
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 5 and rows[4]["nome"] == "ALUNO 5"
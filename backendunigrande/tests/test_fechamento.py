@@ -0,0 +1,75 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
+                                  Matricula, PeriodoLetivo, Turma)
+from app.services.fechamento import fechar_periodo
+
+
+@pytest.mark.asyncio
+async def test_fechamento_gera_historicos_e_pode_rodar_de_novo(sqlite_client):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=10
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Turma.create(id=1, periodo_letivo_id=1, curso_id=1, disciplina_id=1)
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1)
+            for m in range(1, 5)
+        ]
+    )
+    await Matricula.bulk_create(
+        [
+            # aprovado
+            Matricula(id=1, aluno_id=1, turma_id=1, nota_01=8, nota_02=7, nota_03=9),
+            # média baixa
+            Matricula(id=2, aluno_id=2, turma_id=1, nota_01=6, nota_02=6, nota_03=7),
+            # faltas acima do limite
+            Matricula(
+                id=3,
+                aluno_id=3,
+                turma_id=1,
+                nota_01=10,
+                nota_02=10,
+                nota_03=10,
+                faltas_01=4,
+                faltas_02=4,
+                faltas_03=4,
+            ),
+            # nota não lançada conta como zero
+            Matricula(id=4, aluno_id=4, turma_id=1, nota_01=10, nota_02=10),
+        ]
+    )
+    # lançamento manual anterior é preservado
+    await Historico.create(
+        periodo_letivo_id=1, aluno_id=4, disciplina_id=1, situacao="TC"
+    )
+
+    report = await fechar_periodo(1, chunk_size=2)
+    assert (report.matriculas, report.gravados, report.existentes) == (4, 3, 1)
+
+    historicos = {
+        h["aluno_id"]: (h["situacao"], h["media_final"], h["faltas"])
+        for h in await Historico.filter(periodo_letivo_id=1).values(
+            "aluno_id", "situacao", "media_final", "faltas"
+        )
+    }
+    assert historicos == {
+        1: ("AP", Decimal("8"), 0),
+        2: ("RE", Decimal("6.33"), 0),
+        3: ("RE", Decimal("10"), 12),
+        4: ("TC", None, None),
+    }
+    # a MGP acompanha os históricos gravados em lote
+    assert (await Aluno.get(matricula=1)).mgp == Decimal("8.00")
+
+    resp = await sqlite_client.post("/historicos/fechar-periodo/1")
+    assert resp.status_code == 200
+    assert resp.json()["gravados"] == 0
+    assert await Historico.filter(periodo_letivo_id=1).count() == 4
+
+    resp = await sqlite_client.post("/historicos/fechar-periodo/99")
+    assert resp.status_code == 404
@@ -0,0 +1,92 @@
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
+                                  PeriodoLetivo, Professor, Turma)
+from app.services.unigrande import HistoricoService, TurmaService
+
+
+async def _dados():
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(id=1, nome="CURSO 1", total_creditos=200, coordenador_id=1)
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=m, curso_id=1)
+            for m in range(1, 6)
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_listagem_com_fields_em_um_select_estreito(
+    sqlite_client, caplog, consultas
+):
+    await _dados()
+
+    caplog.clear()
+    resp = await sqlite_client.get("/alunos/listar-alunos?fields=matricula,nome")
+    assert resp.status_code == 200
+    assert resp.json()[:2] == [
+        {"matricula": 1, "nome": "A1"},
+        {"matricula": 2, "nome": "A2"},
+    ]
+    (sql,) = consultas()
+    assert "JOIN" not in sql and "total_creditos" not in sql
+
+    resp = await sqlite_client.get("/alunos/listar-alunos?fields=nome,curso")
+    assert resp.json()[0] == {"nome": "A1", "curso": {"id": 1, "nome": "CURSO 1"}}
+
+    resp = await sqlite_client.get("/alunos/listar-alunos?fields=nome,senha")
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("fields inválido: senha.")
+
+
+@pytest.mark.asyncio
+async def test_cursor_e_busca_com_fields(sqlite_client):
+    await _dados()
+
+    resp = await sqlite_client.get(
+        "/alunos/listar-alunos-cursor?limit=2&sort=nome&fields=matricula"
+    )
+    page = resp.json()
+    assert page["results"] == [{"matricula": 1}, {"matricula": 2}]
+    resp = await sqlite_client.get(
+        "/alunos/listar-alunos-cursor?limit=2&sort=nome&fields=matricula"
+        f"&cursor={page['next_cursor']}"
+    )
+    assert resp.json()["results"] == [{"matricula": 3}, {"matricula": 4}]
+
+    resp = await sqlite_client.get("/cursos/buscar-curso/1?fields=nome")
+    assert resp.status_code == 200
+    assert resp.json() == {"nome": "CURSO 1"}
+    assert resp.headers["ETag"]
+
+    resp = await sqlite_client.get(
+        "/cursos/buscar-curso/1?fields=nome&expand=coordenador"
+    )
+    assert resp.json() == {
+        "nome": "CURSO 1",
+        "expanded": {"coordenador": {"id": 1, "matricula": 10, "nome": "PROFESSOR 1"}},
+    }
+
+    resp = await sqlite_client.get("/professores/buscar-professor/9?fields=nome")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_services_sem_join_das_relacoes_nao_pedidas(sqlite_db):
+    await _dados()
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Turma.create(id=1, periodo_letivo_id=1, curso_id=1, disciplina_id=1, vagas=9)
+    await Historico.create(
+        id=1, aluno_id=1, disciplina_id=1, periodo_letivo_id=1, situacao="AP"
+    )
+
+    assert await TurmaService.list_values(["id", "vagas", "disciplina"]) == [
+        {"id": 1, "vagas": 9, "disciplina": {"id": 1, "nome": "DISC", "creditos": 4}}
+    ]
+    assert await HistoricoService.list_values(["id", "situacao"]) == [
+        {"id": 1, "situacao": "AP"}
+    ]
@@ -0,0 +1,146 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Matricula,
+                                  PeriodoLetivo, Turma)
+from app.schemas.unigrande import MatriculaCreate
+from app.services.admissao import FilaMatriculas, fila_matriculas
+from app.services.unigrande import MatriculaService, _inserir_matriculas
+
+
+@pytest.mark.asyncio
+async def test_fila_processa_em_lote_e_respeita_vagas(sqlite_client):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Turma.create(
+        id=1,
+        periodo_letivo_id=1,
+        curso_id=1,
+        disciplina_id=1,
+        vagas=10,
+        vagas_disponiveis=10,
+    )
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1)
+            for m in range(1, 31)
+        ]
+    )
+
+    pedidos = [{"id": m, "aluno_id": m, "turma_id": 1} for m in range(1, 31)]
+    pedidos.insert(1, {"id": 100, "aluno_id": 1, "turma_id": 1})  # repetido
+    pedidos.append({"id": 101, "aluno_id": 1, "turma_id": 99})  # turma inexistente
+    tickets = []
+    for pedido in pedidos:
+        resp = await sqlite_client.post("/matriculas/fila", json=pedido)
+        assert resp.status_code == 202
+        assert resp.json()["status"] == "pendente"
+        tickets.append(resp.json()["ticket"])
+
+    await fila_matriculas.join()
+
+    resultados = [
+        (await sqlite_client.get(f"/matriculas/fila/{t}")).json() for t in tickets
+    ]
+    aceitas = [r for r in resultados if r["status"] == "aceita"]
+    assert [r["matricula_id"] for r in aceitas] == list(range(1, 11))
+    assert resultados[1]["detail"] == "Aluno já matriculado nesta Turma."
+    assert resultados[-1]["status_code"] == 404
+    sem_vaga = [r for r in resultados if r["detail"] == "Turma sem vagas."]
+    assert len(sem_vaga) == 20
+    assert await Matricula.filter(turma_id=1).count() == 10
+    assert (await Turma.get(id=1)).vagas_disponiveis == 0
+
+    stats = (await sqlite_client.get("/metricas/fila-matriculas")).json()
+    assert stats["enfileirados"] == 32
+    assert (stats["aceitos"], stats["recusados"]) == (10, 22)
+    assert stats["profundidade"] == 0
+    assert stats["espera"]["amostras"] == 32
+
+    resp = await sqlite_client.get("/matriculas/fila/nao-existe")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_fila_cheia_responde_429():
+    fila = FilaMatriculas(maxsize=2, workers=0)
+    payload = MatriculaCreate(id=1, aluno_id=1, turma_id=1)
+    fila.submit(payload)
+    fila.submit(payload)
+    with pytest.raises(HTTPException) as exc:
+        fila.submit(payload)
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"]
+    assert fila.stats()["profundidade"] == 2
+    assert fila.stats()["recusados_fila_cheia"] == 1
+    await fila.stop()
+
+
+@pytest.mark.asyncio
+async def test_lote_com_conflito_recusa_so_a_linha(sqlite_db):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Turma.create(id=1, periodo_letivo_id=1, curso_id=1, disciplina_id=1, vagas=5)
+    await Aluno.bulk_create(
+        [Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1) for m in (1, 2)]
+    )
+    # gravada por outra requisição depois da checagem do lote
+    await Matricula.create(id=1, aluno_id=1, turma_id=1)
+
+    recusas = await _inserir_matriculas(
+        [
+            Matricula(id=2, aluno_id=1, turma_id=1),
+            Matricula(id=3, aluno_id=2, turma_id=1),
+        ]
+    )
+    assert recusas[0].status_code == 409
+    assert recusas[1] is None
+    assert sorted(await Matricula.all().values_list("id", flat=True)) == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_falha_de_uma_turma_nao_derruba_o_lote(sqlite_db, monkeypatch):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    for id_ in (1, 2, 3):
+        await PeriodoLetivo.create(id=id_, ano=2025 + id_, semestre=1)
+        await Turma.create(
+            id=id_,
+            periodo_letivo_id=id_,
+            curso_id=1,
+            disciplina_id=1,
+            vagas=5,
+            vagas_disponiveis=5,
+        )
+    await Aluno.create(matricula=1, nome="A1", total_creditos=0, curso_id=1)
+
+    original = MatriculaService.create_lote_turma
+
+    async def create_lote_turma(turma_id, payloads):
+        if turma_id == 2:
+            raise RuntimeError("lock timeout")
+        return await original(turma_id, payloads)
+
+    monkeypatch.setattr(MatriculaService, "create_lote_turma", create_lote_turma)
+
+    fila = FilaMatriculas(workers=0)
+    tickets = [
+        fila.submit(MatriculaCreate(id=t, aluno_id=1, turma_id=t)).ticket
+        for t in (1, 2, 3)
+    ]
+    lote = [fila._queue.get_nowait() for _ in tickets]
+    await fila._processar(lote)
+
+    resultados = [fila.ticket(t) for t in tickets]
+    assert [r.status for r in resultados] == ["aceita", "recusada", "aceita"]
+    assert (resultados[1].status_code, resultados[1].detail) == (500, "lock timeout")
+    assert sorted(await Matricula.all().values_list("id", flat=True)) == [1, 3]
+    await fila.stop()
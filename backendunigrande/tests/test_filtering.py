@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
+                                  PeriodoLetivo, Professor)
+from app.services.filtering import FilterSpec, Filtro
+from app.services.unigrande import HistoricoService, TurmaService
+
+
+async def _dados():
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(id=1, nome="CURSO 1", total_creditos=200, coordenador_id=1)
+    await Curso.create(id=2, nome="CURSO 2", total_creditos=200)
+    await Aluno.bulk_create(
+        [
+            Aluno(
+                matricula=m,
+                nome=f"A{m}",
+                total_creditos=0,
+                mgp=Decimal(m),
+                curso_id=1 if m <= 6 else 2,
+            )
+            for m in range(1, 10)
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_listagens_filtradas_por_coluna_indexada(sqlite_client):
+    await _dados()
+
+    resp = await sqlite_client.get("/alunos/listar-alunos?curso_id=2&fields=matricula")
+    assert resp.json() == [{"matricula": 7}, {"matricula": 8}, {"matricula": 9}]
+
+    resp = await sqlite_client.get(
+        "/alunos/listar-alunos-cursor?limit=2&curso_id=1&mgp__gte=3&with_total=true"
+    )
+    page = resp.json()
+    assert [a["matricula"] for a in page["results"]] == [3, 4]
+    assert (page["total"], page["total_mode"]) == (4, "exact")
+
+    resp = await sqlite_client.get(
+        "/alunos/listar-alunos-paginado?curso_id__in=2&curso_id__in=9&limit=2"
+    )
+    assert resp.json()["total"] == 3
+
+    resp = await sqlite_client.get("/cursos/listar-cursos?coordenador_id=1")
+    assert [c["id"] for c in resp.json()] == [1]
+
+
+@pytest.mark.asyncio
+async def test_filtro_sem_indice_so_junto_de_um_indexado(sqlite_client):
+    resp = await sqlite_client.get("/alunos/listar-alunos?mgp__gte=7")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == (
+        "Filtro mgp (sem índice) só junto de um filtro indexado: curso_id."
+    )
+
+    resp = await sqlite_client.get("/alunos/listar-alunos?curso_id=x")
+    assert resp.status_code == 422
+
+
+def test_declaracao_e_plano_dos_filtros():
+    with pytest.raises(ValueError, match="nenhum índice atende"):
+        FilterSpec(Aluno, [Filtro("total_creditos")])
+    with pytest.raises(ValueError, match="ordenação sem índice"):
+        FilterSpec(Aluno, sorts=("mgp",))
+
+    spec = TurmaService.FILTERS
+    assert spec.plano["curso_id"].requer == ("periodo_letivo_id",)
+    with pytest.raises(HTTPException) as exc:
+        spec.validate({"curso_id": 1})
+    assert exc.value.detail == (
+        "Filtro curso_id exige também periodo_letivo_id "
+        "(índice turmas (periodo_letivo_id, curso_id, disciplina_id))."
+    )
+    assert spec.validate({"periodo_letivo_id__in": [1, 2], "curso_id": 1})
+
+
+@pytest.mark.asyncio
+async def test_service_com_filtro_residual(sqlite_db):
+    await _dados()
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Historico.bulk_create(
+        [
+            Historico(
+                id=m,
+                aluno_id=m,
+                disciplina_id=1,
+                periodo_letivo_id=1,
+                situacao="AP" if m % 2 else "RP",
+            )
+            for m in range(1, 5)
+        ]
+    )
+
+    filtros = HistoricoService.FILTERS.validate(
+        {"periodo_letivo_id": 1, "situacao": "RP"}
+    )
+    assert await HistoricoService.list_values(["id"], filtros) == [
+        {"id": 2},
+        {"id": 4},
+    ]
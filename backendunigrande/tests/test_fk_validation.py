@@ -0,0 +1,32 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import Curso, Disciplina, PeriodoLetivo, Turma
+from app.schemas.unigrande import TurmaCreate
+from app.services.unigrande import TurmaService
+
+
+@pytest.mark.asyncio
+async def test_turma_create_aponta_primeira_fk_ausente(sqlite_db):
+    await PeriodoLetivo.create(id=1, ano=2025, semestre=1)
+    await Curso.create(id=26, nome="Ciencia da Computacao", total_creditos=0)
+
+    payload = TurmaCreate(
+        id=1, periodo_letivo_id=1, curso_id=26, disciplina_id=597, professor_id=4689
+    )
+    with pytest.raises(HTTPException) as exc:
+        await TurmaService.create(payload)
+    assert exc.value.status_code == 404
+    assert exc.value.detail == "Disciplina não encontrado."
+
+    await Disciplina.create(
+        id=597,
+        nome="LINGUA PORTUGUESA I",
+        creditos=4,
+        tipo="N",
+        horas_obrig=4,
+        limite_faltas=18,
+    )
+    payload.professor_id = None
+    await TurmaService.create(payload)
+    assert await Turma.filter(id=1).exists()
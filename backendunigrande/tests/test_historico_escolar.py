@@ -0,0 +1,88 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico,
+                                  PeriodoLetivo)
+from app.schemas.unigrande import HistoricoCreate, HistoricoUpdate
+from app.services.counting import count_provider
+from app.services.unigrande import HistoricoService
+
+
+@pytest.mark.asyncio
+async def test_historico_escolar_agrupa_por_periodo_e_usa_cache(sqlite_client, caplog):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Aluno.create(matricula=1, nome="ANA", total_creditos=0, curso_id=1)
+    await Aluno.create(matricula=2, nome="BIA", total_creditos=0, curso_id=1)
+    for id_, nome, creditos in ((1, "CALCULO", 4), (2, "ALGORITMOS", 2)):
+        await Disciplina.create(
+            id=id_,
+            nome=nome,
+            creditos=creditos,
+            tipo="N",
+            horas_obrig=4,
+            limite_faltas=18,
+        )
+    await PeriodoLetivo.create(id=1, ano=2025, semestre=2)
+    await PeriodoLetivo.create(id=2, ano=2026, semestre=1)
+    for id_, pl, disc, situacao, media in (
+        (1, 2, 1, "AP", "9.00"),
+        (2, 1, 1, "RE", "4.00"),
+        (3, 1, 2, "AP", "8.00"),
+    ):
+        await HistoricoService.create(
+            HistoricoCreate(
+                id=id_,
+                periodo_letivo_id=pl,
+                aluno_id=1,
+                disciplina_id=disc,
+                situacao=situacao,
+                media_final=media,
+            )
+        )
+
+    resp = await sqlite_client.get("/historicos/historico-escolar/1")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["aluno"] == {"matricula": 1, "nome": "ANA"}
+    assert [p["periodo_letivo"]["id"] for p in body["periodos"]] == [1, 2]
+    primeiro, segundo = body["periodos"]
+    assert [d["disciplina"]["nome"] for d in primeiro["disciplinas"]] == [
+        "ALGORITMOS",
+        "CALCULO",
+    ]
+    # (4*4 + 8*2) / 6 = 5.33; acumulada (16 + 16 + 36) / 10 = 6.8
+    assert Decimal(primeiro["media_periodo"]) == Decimal("5.33")
+    assert (primeiro["creditos_periodo"], primeiro["creditos_acumulados"]) == (2, 2)
+    assert Decimal(segundo["media_acumulada"]) == Decimal("6.80")
+    assert Decimal(body["mgp"]) == Decimal("6.80")
+    assert body["total_creditos"] == 6
+    assert Decimal(body["mgp"]) == (await Aluno.get(matricula=1)).mgp
+
+    # segunda leitura sai do cache, sem consulta
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+    caplog.clear()
+    assert await HistoricoService.historico_escolar(
+        1
+    ) == await HistoricoService.historico_escolar(1)
+    assert not [r for r in caplog.records if r.name == "tortoise.db_client"]
+
+    # escrita em histórico do aluno invalida
+    await HistoricoService.update(2, HistoricoUpdate(situacao="AP", media_final=7))
+    transcript = await HistoricoService.historico_escolar(1)
+    assert transcript.periodos[0].media_periodo == Decimal("7.33")
+
+    # aluno sem históricos e aluno inexistente
+    resp = await sqlite_client.get("/historicos/historico-escolar/2")
+    assert resp.json()["periodos"] == [] and resp.json()["mgp"] is None
+    resp = await sqlite_client.get("/historicos/historico-escolar/99")
+    assert resp.status_code == 404
+
+    # remover o curso leva os alunos (e os históricos) em cascata
+    assert await count_provider.count(Historico, "cached") == (3, "cached")
+    resp = await sqlite_client.delete("/cursos/delete-curso/1")
+    assert resp.status_code == 204
+    resp = await sqlite_client.get("/historicos/historico-escolar/1")
+    assert resp.status_code == 404
+    assert await count_provider.count(Historico, "cached") == (0, "cached")
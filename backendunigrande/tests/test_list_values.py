@@ -0,0 +1,41 @@
+import pytest
+
+from app.models.unigrande import (Curso, Disciplina, PeriodoLetivo, Professor,
+                                  Turma)
+from app.schemas.unigrande import TurmaResponse
+from app.services.loader import DataLoader
+from app.services.unigrande import TurmaService
+
+
+@pytest.mark.asyncio
+async def test_list_values_equivale_ao_caminho_por_model(sqlite_db):
+    await PeriodoLetivo.create(id=1, ano=2025, semestre=1)
+    await Curso.create(id=26, nome="Ciencia da Computacao", total_creditos=0)
+    await Professor.create(id=4689, matricula=5032, nome="Sylvia Oliveira Chagas")
+    for id_ in (597, 3):
+        await Disciplina.create(
+            id=id_,
+            nome=f"DISCIPLINA {id_}",
+            creditos=4,
+            tipo="N",
+            horas_obrig=4,
+            limite_faltas=18,
+        )
+    # uma turma com professor e outra sem (LEFT JOIN sem par)
+    await Turma.create(
+        id=1, periodo_letivo_id=1, curso_id=26, disciplina_id=597, professor_id=4689
+    )
+    await Turma.create(id=2, periodo_letivo_id=1, curso_id=26, disciplina_id=3)
+
+    via_models = [
+        await TurmaService.response(t, DataLoader())
+        for t in await TurmaService.list_all()
+    ]
+    via_values = [TurmaResponse(**row) for row in await TurmaService.list_values()]
+
+    assert sorted(via_values, key=lambda t: t.id) == sorted(
+        via_models, key=lambda t: t.id
+    )
+    professores = {t.id: t.professor for t in via_values}
+    assert professores[1].nome == "Sylvia Oliveira Chagas"
+    assert professores[2] is None
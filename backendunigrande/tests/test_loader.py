@@ -0,0 +1,102 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Matricula,
+                                  PeriodoLetivo, Professor, Turma)
+from app.services.cache import reference_cache
+from app.services.loader import DataLoader, responses
+from app.services.unigrande import AlunoService, MatriculaService, TurmaService
+
+
+async def _dados():
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(id=1, nome="CURSO 1", total_creditos=200, coordenador_id=1)
+    await Curso.create(id=2, nome="CURSO 2", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    for t in (1, 2):
+        await Turma.create(
+            id=t,
+            periodo_letivo_id=1,
+            curso_id=t,
+            disciplina_id=1,
+            professor_id=1,
+            vagas=10,
+        )
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=m % 2 + 1)
+            for m in range(1, 21)
+        ]
+    )
+    await Matricula.bulk_create(
+        [Matricula(id=m, aluno_id=m, turma_id=m % 2 + 1) for m in range(1, 21)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_respostas_aninhadas_em_lote(sqlite_db, caplog, consultas):
+    await _dados()
+    matriculas = await Matricula.all().order_by("id")
+
+    caplog.clear()
+    loader = DataLoader()
+    result = await responses(MatriculaService.response, matriculas, loader)
+
+    # 20 linhas: uma consulta para os alunos e uma para as turmas
+    assert len(consultas()) == 2
+    assert loader.lotes == 2
+    # os lotes despachados ficam referenciados até terminarem
+    assert loader._tasks == set()
+    assert [r.aluno.nome for r in result] == [f"A{m}" for m in range(1, 21)]
+    assert {r.turma.id for r in result} == {1, 2}
+
+    # mesmas chaves na mesma requisição: nada de novo no banco
+    caplog.clear()
+    await responses(MatriculaService.response, matriculas, loader)
+    assert consultas() == []
+
+    # resumos das tabelas de referência passam pelo reference_cache
+    caplog.clear()
+    turmas = await TurmaService.list_all()
+    caplog.clear()
+    result = await responses(TurmaService.response, turmas, DataLoader())
+    assert len(consultas()) <= 4
+    assert [r.curso.nome for r in result] == ["CURSO 1", "CURSO 2"]
+    assert result[0].professor.nome == "PROFESSOR 1"
+
+
+@pytest.mark.asyncio
+async def test_get_pelo_loader(sqlite_db, caplog, consultas):
+    await _dados()
+    loader = DataLoader()
+    caplog.clear()
+
+    aluno = await AlunoService.get(3, loader)
+    assert aluno.nome == "A3"
+    assert (await loader.load(Aluno, 3)) is aluno
+    assert len(consultas()) == 1
+
+    with pytest.raises(HTTPException) as exc:
+        await AlunoService.get(999, loader)
+    assert exc.value.status_code == 404
+    assert exc.value.detail == "Aluno não encontrado."
+
+
+@pytest.mark.asyncio
+async def test_rota_cursor_com_consultas_constantes(sqlite_client, caplog, consultas):
+    await _dados()
+
+    for limit in (2, 20):
+        reference_cache.clear()
+        caplog.clear()
+        resp = await sqlite_client.get(f"/alunos/listar-alunos-cursor?limit={limit}")
+        assert resp.status_code == 200
+        assert len(resp.json()["results"]) == limit
+        por_limite = len(consultas())
+        if limit == 2:
+            base = por_limite
+    # página e cursos do cache frio: duas consultas com 2 ou com 20 linhas
+    assert por_limite == base == 2
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import pytest
+
+from app.models.unigrande import Aluno, Curso, Disciplina, PeriodoLetivo
+from app.schemas.unigrande import (DisciplinaUpdate, HistoricoCreate,
+                                   HistoricoUpdate)
+from app.services.mgp import MgpService
+from app.services.unigrande import (DisciplinaService, HistoricoService,
+                                    PeriodoLetivoService)
+
+ACUMULADORES = ("mgp", "mgp_pontos", "mgp_creditos", "total_creditos")
+
+
+async def _snapshot():
+    return {
+        a["matricula"]: tuple(a[f] for f in ACUMULADORES)
+        for a in await Aluno.all().values("matricula", *ACUMULADORES)
+    }
+
+
+@pytest.mark.asyncio
+async def test_incremental_igual_ao_recompute(sqlite_db):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    for matricula in (1, 2):
+        await Aluno.create(matricula=matricula, nome="A", total_creditos=0, curso_id=1)
+    for id_, creditos in ((1, 4), (2, 2), (3, 6)):
+        await Disciplina.create(
+            id=id_,
+            nome="D",
+            creditos=creditos,
+            tipo="N",
+            horas_obrig=4,
+            limite_faltas=18,
+        )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await PeriodoLetivo.create(id=2, ano=2026, semestre=2)
+
+    lancamentos = [
+        (1, 1, 1, 1, "AP", "8.00"),
+        (2, 1, 1, 2, "RE", "3.50"),
+        (3, 1, 1, 3, "TC", None),
+        (4, 1, 2, 1, "AP", "7.25"),
+        (5, 2, 1, 2, "AP", "9.00"),
+        (6, 2, 2, 3, "AP", "5.00"),
+    ]
+    for id_, pl, aluno, disc, situacao, media in lancamentos:
+        await HistoricoService.create(
+            HistoricoCreate(
+                id=id_,
+                periodo_letivo_id=pl,
+                aluno_id=aluno,
+                disciplina_id=disc,
+                situacao=situacao,
+                media_final=media,
+            )
+        )
+
+    aluno = await Aluno.get(matricula=1)
+    # (8*4 + 3.5*2 + 9*2) / 8 = 7.125; só AP integraliza créditos
+    assert aluno.mgp == Decimal("7.13")
+    assert aluno.mgp_creditos == 8
+    assert aluno.total_creditos == 6
+
+    # troca de situação, de aluno e remoção
+    await HistoricoService.update(3, HistoricoUpdate(situacao="AP", media_final=6))
+    await HistoricoService.update(2, HistoricoUpdate(aluno_id=2))
+    await HistoricoService.delete(5)
+    # mudança de créditos e remoção em cascata
+    await DisciplinaService.update(1, DisciplinaUpdate(creditos=5))
+    await PeriodoLetivoService.delete(2)
+
+    incremental = await _snapshot()
+    await MgpService.recompute_all(batch_size=1)
+    assert await _snapshot() == incremental
+    assert incremental[1] == (Decimal("6.91"), Decimal("76.00"), 11, 11)
+    assert incremental[2] == (Decimal("6.18"), Decimal("43.25"), 7, 5)
+
+
+@pytest.mark.asyncio
+async def test_mgp_e_creditos_nao_sao_gravados_pela_api(sqlite_client):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    resp = await sqlite_client.post(
+        "/alunos/create-aluno",
+        json={"matricula": 1, "nome": "A", "curso_id": 1, "mgp": "9.99"},
+    )
+    assert resp.status_code == 201
+    assert (resp.json()["total_creditos"], resp.json()["mgp"]) == (0, None)
+
+    resp = await sqlite_client.put(
+        "/alunos/atualizar-aluno/1",
+        json={"nome": "B", "total_creditos": 50, "mgp": "9.99"},
+    )
+    assert resp.status_code == 200
+    assert await _snapshot() == {1: (None, Decimal("0"), 0, 0)}
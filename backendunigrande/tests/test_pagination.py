@@ -0,0 +1,76 @@
+import logging
+
+import pytest
+
+from app.models.unigrande import Aluno, Curso
+
+
+@pytest.mark.asyncio
+async def test_listar_alunos_cursor_navega_nos_dois_sentidos(sqlite_client):
+    await Curso.create(id=35, nome="Odontologia - Integral", total_creditos=0)
+    # nomes repetidos para exercitar o desempate pela pk
+    nomes = ["ANA", "BRUNO", "ANA", "CARLA", "BRUNO", "DANIEL", "ANA"]
+    for matricula, nome in enumerate(nomes, start=100):
+        await Aluno.create(
+            matricula=matricula, nome=nome, total_creditos=0, curso_id=35
+        )
+    esperado = sorted((nome, m) for m, nome in enumerate(nomes, start=100))
+
+    url = "/alunos/listar-alunos-cursor"
+    vistos, paginas, cursor = [], [], None
+    while True:
+        params = {"limit": 3, "sort": "nome"}
+        if cursor:
+            params["cursor"] = cursor
+        body = (await sqlite_client.get(url, params=params)).json()
+        assert body["total"] is None
+        paginas.append(body)
+        vistos += [(a["nome"], a["matricula"]) for a in body["results"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert vistos == esperado
+    assert len(paginas) == 3 and paginas[0]["prev_cursor"] is None
+
+    # volta da última página para a anterior
+    params = {"limit": 3, "sort": "nome", "cursor": paginas[-1]["prev_cursor"]}
+    body = (await sqlite_client.get(url, params=params)).json()
+    assert body["results"] == paginas[1]["results"]
+
+    params = {"limit": 3, "with_total": "true"}
+    body = (await sqlite_client.get(url, params=params)).json()
+    assert body["total"] == len(nomes)
+    assert [a["matricula"] for a in body["results"]] == [100, 101, 102]
+
+
+@pytest.mark.asyncio
+async def test_listar_alunos_cursor_rejeita_cursor_invalido(sqlite_client):
+    response = await sqlite_client.get(
+        "/alunos/listar-alunos-cursor", params={"cursor": "nao-e-um-cursor"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_view_html_so_conta_com_with_total(sqlite_client, caplog):
+    await Curso.create(id=35, nome="Odontologia - Integral", total_creditos=0)
+    for matricula in range(100, 103):
+        await Aluno.create(
+            matricula=matricula, nome=f"A{matricula}", total_creditos=0, curso_id=35
+        )
+
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+    caplog.clear()
+    resp = await sqlite_client.get("/alunos/list-alunos/view?limit=2")
+    assert resp.status_code == 200
+    assert "Total de alunos" not in resp.text
+    consultas = [r.getMessage() for r in caplog.records]
+    assert not any("COUNT" in c.upper() for c in consultas)
+    assert "with_total" not in resp.text
+
+    resp = await sqlite_client.get(
+        "/alunos/list-alunos/view?limit=2&with_total=true&count_mode=exact"
+    )
+    assert "Total de alunos: <strong>3</strong>" in resp.text
+    assert "&with_total=true" in resp.text
@@ -0,0 +1,68 @@
+import logging
+from decimal import Decimal
+
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Matricula,
+                                  PeriodoLetivo, Turma)
+from app.services.estatisticas import EstatisticaService
+
+
+async def _turma_com_alunos(n: int):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Turma.create(id=1, periodo_letivo_id=1, curso_id=1, disciplina_id=1, vagas=n)
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1)
+            for m in range(1, n + 2)
+        ]
+    )
+    await Matricula.bulk_create(
+        [Matricula(id=m, aluno_id=m, turma_id=1) for m in range(1, n + 1)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_pauta_da_turma_inteira_com_consultas_constantes(sqlite_client, caplog):
+    await _turma_com_alunos(60)
+    await EstatisticaService.rebuild()
+    lancamentos = [
+        {"aluno_id": m, "nota_01": "7.50", "faltas_01": m % 4} for m in range(1, 61)
+    ]
+    lancamentos[0]["nota_02"] = "9.00"
+
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+    caplog.clear()
+    resp = await sqlite_client.put(
+        "/matriculas/turma/1/pauta", json={"lancamentos": lancamentos}
+    )
+    queries = [r for r in caplog.records if r.name == "tortoise.db_client"]
+
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "turma_id": 1,
+        "atualizadas": 60,
+        "campos": ["faltas_01", "nota_01", "nota_02"],
+    }
+    # turma, matrículas da turma, um UPDATE em lote e o UPDATE do resumo
+    assert len(queries) == 4
+    primeira = await Matricula.get(id=1)
+    assert (primeira.nota_01, primeira.nota_02) == (Decimal("7.5"), Decimal("9"))
+    segunda = await Matricula.get(id=2)
+    assert (segunda.nota_02, segunda.faltas_01) == (None, 2)
+
+
+@pytest.mark.asyncio
+async def test_pauta_com_aluno_fora_da_turma_nao_grava(sqlite_client):
+    await _turma_com_alunos(3)
+    resp = await sqlite_client.put(
+        "/matriculas/turma/1/pauta",
+        json={"lancamentos": [{"aluno_id": 1, "nota_01": 5}, {"aluno_id": 4}]},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Alunos não matriculados na turma: 4"
+    assert (await Matricula.get(id=1)).nota_01 is None
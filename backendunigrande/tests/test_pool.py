@@ -0,0 +1,142 @@
+import asyncio
+
+import asyncpg
+import pytest
+from pydantic import ValidationError
+from tortoise import connections
+
+from app.config import db
+from app.config.application import create_application
+from app.config.db import db_config
+from app.config.settings import Settings, get_settings
+from app.services import pool
+from app.services.busca import name_index
+from app.services.pool import MonitoredAsyncpgDBClient, PoolMonitorado
+
+
+class _Pool:
+    """Pool de duas conexões, com a interface de `asyncpg.Pool` usada."""
+
+    def __init__(self):
+        self.livres = ["c1", "c2"]
+        self.liberada = asyncio.Event()
+
+    async def acquire(self, *, timeout=None):
+        while not self.livres:
+            self.liberada.clear()
+            await asyncio.wait_for(self.liberada.wait(), timeout)
+        return self.livres.pop()
+
+    async def release(self, connection):
+        self.livres.append(connection)
+        self.liberada.set()
+
+    async def close(self):
+        pass
+
+    def get_size(self):
+        return 2
+
+    def get_idle_size(self):
+        return len(self.livres)
+
+    def get_min_size(self):
+        return 1
+
+    def get_max_size(self):
+        return 2
+
+
+def test_pool_configurado_pelos_settings():
+    settings = Settings(
+        db_pool_min_size=2,
+        db_pool_max_size=20,
+        db_pool_max_idle=60,
+        db_statement_cache_size=0,
+        db_command_timeout=30,
+    )
+    config = db_config(["app.models.tortoise"], "postgres://u:s@db:5432/uni", settings)
+    connection = config["connections"]["default"]
+    assert connection["engine"] == "app.services.pool"
+
+    client = MonitoredAsyncpgDBClient(
+        connection_name="default", **connection["credentials"]
+    )
+    assert (client.pool_minsize, client.pool_maxsize) == (2, 20)
+    # repassados ao asyncpg.create_pool
+    assert client.extra == {
+        "max_inactive_connection_lifetime": 60,
+        "statement_cache_size": 0,
+        "command_timeout": 30,
+    }
+
+    config = db_config(["app.models.tortoise"], "sqlite://:memory:", settings)
+    assert config["connections"]["default"]["engine"] == "tortoise.backends.sqlite"
+
+    with pytest.raises(ValidationError, match="db_pool_min_size maior"):
+        Settings(db_pool_min_size=10, db_pool_max_size=5)
+
+
+@pytest.mark.asyncio
+async def test_metricas_do_pool():
+    monitorado = PoolMonitorado(_Pool())
+    primeira = await monitorado.acquire()
+    await monitorado.acquire()
+    terceira = asyncio.create_task(monitorado.acquire())
+    await asyncio.sleep(0.01)
+    assert monitorado.stats()["aguardando"] == 1
+    assert monitorado.stats()["em_uso"] == 2
+
+    await monitorado.release(primeira)
+    assert await terceira == primeira
+    with pytest.raises(asyncio.TimeoutError):
+        await monitorado.acquire(timeout=0.01)
+
+    stats = monitorado.stats()
+    assert (stats["aguardando"], stats["falhas"]) == (0, 1)
+    espera = stats["espera"]
+    assert espera["amostras"] == 3
+    assert sum(espera["histograma_ms"].values()) == 3
+    # a terceira aquisição esperou a liberação da primeira (>= 10 ms)
+    assert espera["max_ms"] >= 10
+    assert list(espera["histograma_ms"])[-1] == "+inf"
+
+
+@pytest.mark.asyncio
+async def test_rota_sem_postgres(sqlite_client):
+    assert pool.pools == {}
+    resp = await sqlite_client.get("/metricas/pool-conexoes")
+    assert resp.status_code == 200
+    assert resp.json() == {}
+
+
+@pytest.mark.asyncio
+async def test_lifespan_usa_o_pool_dos_settings(monkeypatch):
+    criados = []
+
+    async def create_pool(dsn, **kwargs):
+        criados.append(kwargs)
+        return _Pool()
+
+    async def _sem_aquecer():
+        return None
+
+    monkeypatch.setattr(db, "DATABASE_URL", "postgres://u:s@db:5432/uni")
+    monkeypatch.setattr(asyncpg, "create_pool", create_pool)
+    monkeypatch.setattr(name_index, "warm", _sem_aquecer)
+
+    app = create_application()
+    async with app.router.lifespan_context(app):
+        client = connections.get("default")
+        assert isinstance(client, MonitoredAsyncpgDBClient)
+        settings = get_settings()
+        assert client.pool_maxsize == settings.db_pool_max_size
+        assert client.extra["statement_cache_size"] == (
+            settings.db_statement_cache_size
+        )
+
+        # o pool é criado na primeira conexão e aparece nas métricas
+        await client.create_connection(with_db=True)
+        assert criados[0]["max_size"] == settings.db_pool_max_size
+        assert list(pool.stats()) == ["default"]
+    assert pool.pools == {}
@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Historico, Matriz,
+                                  PeriodoLetivo)
+from app.schemas.unigrande import MatrizCreate
+from app.services.progresso import ProgressoService
+from app.services.unigrande import MatrizService
+
+
+@pytest.mark.asyncio
+async def test_progresso_do_aluno_e_do_curso(sqlite_client, caplog):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    for id_ in range(1, 6):
+        await Disciplina.create(
+            id=id_,
+            nome=f"D{id_}",
+            creditos=4,
+            tipo="N",
+            horas_obrig=4,
+            limite_faltas=18,
+        )
+    # disciplinas 1-2 no 1º período, 3-4 no 2º; a 5 fica fora da matriz
+    await Matriz.bulk_create(
+        [
+            Matriz(id=d, curso_id=1, disciplina_id=d, periodo=(d + 1) // 2)
+            for d in range(1, 5)
+        ]
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1)
+            for m in range(1, 201)
+        ]
+    )
+    await Historico.bulk_create(
+        [
+            Historico(
+                periodo_letivo_id=1, aluno_id=m, disciplina_id=d, situacao=situacao
+            )
+            for m in range(1, 201)
+            for d, situacao in ((1, "AP"), (2, "RE"), (5, "AP"))
+        ]
+    )
+
+    resp = await sqlite_client.get("/alunos/progresso-aluno/1")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["concluidas"], body["pendentes"]) == ([1], [2, 3, 4])
+    # cursou um período: só a disciplina 2 (1º período) está atrasada
+    assert (body["semestres_cursados"], body["atrasadas"]) == (1, [2])
+    assert body["percentual"] == 25.0
+
+    caplog.set_level(logging.DEBUG, logger="tortoise.db_client")
+    caplog.clear()
+    progresso = await ProgressoService.do_curso(1)
+    queries = [r for r in caplog.records if r.name == "tortoise.db_client"]
+    assert len(progresso) == 200
+    assert all(p.concluidas == [1] and p.atrasadas == [2] for p in progresso)
+    # matriz já em cache: curso, alunos, aprovadas e períodos cursados
+    assert len(queries) == 4
+
+    # mudança na matriz invalida o cache do curso
+    await MatrizService.create(
+        MatrizCreate(id=5, curso_id=1, disciplina_id=5, periodo=3)
+    )
+    assert (await ProgressoService.do_aluno(1)).concluidas == [1, 5]
+
+    resp = await sqlite_client.get("/cursos/progresso-curso/99")
+    assert resp.status_code == 404
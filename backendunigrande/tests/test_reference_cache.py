@@ -0,0 +1,85 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import Curso, Professor
+from app.schemas.unigrande import (CursoUpdate, ProfessorSummary,
+                                   ProfessorUpdate)
+from app.services.cache import TTLCache, reference_cache
+from app.services.loader import DataLoader
+from app.services.unigrande import CursoService, ProfessorService
+
+
+def test_ttl_cache_despeja_o_menos_usado():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.stats()["size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_resumos_vem_do_cache_e_escritas_invalidam(sqlite_db):
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR ANTIGO")
+    await Curso.create(id=1, nome="CURSO A", total_creditos=200, coordenador_id=1)
+    await Curso.create(id=2, nome="CURSO B", total_creditos=200, coordenador_id=1)
+
+    rows = await CursoService.list_all()
+    misses = reference_cache.stats()["professores"]["misses"]
+    responses = [await CursoService.response(c, DataLoader()) for c in rows]
+
+    assert [r.coordenador.nome for r in responses] == ["PROFESSOR ANTIGO"] * 2
+    # o list_all já carregou o coordenador; as respostas não voltam ao banco
+    assert reference_cache.stats()["professores"]["misses"] == misses
+
+    await ProfessorService.update(1, ProfessorUpdate(nome="PROFESSOR NOVO"))
+    resp = await CursoService.response(await CursoService.get(1), DataLoader())
+    assert resp.coordenador.nome == "PROFESSOR NOVO"
+
+    # FK validada pelo cache continua refletindo deleções feitas pela API
+    await ProfessorService.delete(1)
+    with pytest.raises(HTTPException) as exc:
+        await CursoService.update(2, CursoUpdate(coordenador_id=1))
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_endpoint_de_metricas_do_cache(sqlite_client):
+    resp = await sqlite_client.get("/metricas/cache")
+
+    assert resp.status_code == 200
+    assert set(resp.json()) == {
+        "cursos",
+        "disciplinas",
+        "professores",
+        "periodos_letivos",
+    }
+
+
+@pytest.mark.asyncio
+async def test_invalidacao_repetida_depois_do_commit(sqlite_client, monkeypatch):
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    original = ProfessorService.delete
+
+    async def delete_com_leitura_concorrente(id_):
+        await original(id_)
+        # leitura concorrente, antes do commit, recarrega a linha antiga
+        reference_cache._caches[Professor].set(
+            id_, ProfessorSummary(id=id_, matricula=10, nome="PROFESSOR 1")
+        )
+
+    monkeypatch.setattr(ProfessorService, "delete", delete_com_leitura_concorrente)
+    resp = await sqlite_client.delete("/professores/delete-professor/1")
+    assert resp.status_code == 204
+    assert await reference_cache.get_many(Professor, [1]) == {}
+
+    # a FK validada pelo cache não aceita mais o professor removido
+    resp = await sqlite_client.post(
+        "/cursos/create-curso",
+        json={"id": 1, "nome": "CURSO", "total_creditos": 200, "coordenador_id": 1},
+    )
+    assert resp.status_code == 404
+    assert "Professor" in resp.json()["detail"]
@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from app.config import seed
+from app.models.unigrande import Aluno, Curso, Disciplina, Professor
+
+SCRIPTS_BD = Path(__file__).resolve().parents[2] / "scripts-bd"
+
+
+@pytest.mark.asyncio
+async def test_carga_dos_scripts_do_repositorio(sqlite_db):
+    datasets = seed.read_datasets([SCRIPTS_BD])
+    reports, problems = await seed.load(datasets)
+
+    assert [r.table for r in reports] == [
+        "professores",
+        "cursos",
+        "alunos",
+        "disciplinas",
+    ]
+    assert problems == []
+    assert await Professor.all().count() == 910
+    assert await Curso.all().count() == 11
+    assert await Aluno.all().count() == 5710
+    assert await Disciplina.all().count() == 811
+
+    # rodar de novo só pula linhas
+    reports, _ = await seed.load(datasets)
+    assert sum(r.loaded for r in reports) == 0
+    assert await Aluno.all().count() == 5710
+
+
+@pytest.mark.asyncio
+async def test_sql_e_csv_com_fk_invalida(sqlite_db, tmp_path):
+    (tmp_path / "professores.sql").write_text(
+        "insert into professores (id, matricula, nome)\n"
+        "values (1, 10, 'Maria D''Avila\nSantos');\n"
+    )
+    (tmp_path / "cursos.csv").write_text(
+        "id,nome,total_creditos,coordenador_id\n"
+        "1,Direito,200,1\n"
+        "2,Medicina,200,99\n"
+        "3,Odontologia,200,\n"
+    )
+    (tmp_path / "alunos.sql").write_text(
+        "insert into alunos (matricula, nome, total_creditos, data_nascimento,"
+        " mgp, curso_id)\n"
+        "values (7, 'ANA', 10, to_date('12-10-1968', 'dd-mm-yyyy'), .4, 2);\n"
+        "insert into alunos (matricula, nome, total_creditos, data_nascimento,"
+        " mgp, curso_id)\n"
+        "values (8, 'JOAO', 10, null, 6.68, 3);\n"
+    )
+
+    reports, problems = await seed.load(seed.read_datasets([tmp_path]))
+
+    by_table = {r.table: r for r in reports}
+    assert by_table["cursos"].loaded == 2
+    assert by_table["cursos"].rejected == 1
+    # o curso 2 foi rejeitado, então o aluno que aponta para ele também
+    assert by_table["alunos"].loaded == 1
+    assert problems == [
+        "cursos: coordenador_id=99 não encontrado",
+        "alunos: curso_id=2 não encontrado",
+    ]
+    professor = await Professor.get(id=1)
+    assert professor.nome == "Maria D'Avila\nSantos"
+    aluno = await Aluno.get(matricula=8)
+    assert aluno.data_nascimento is None and aluno.mgp == Decimal("6.68")
+    assert seed.parse_sql(tmp_path / "alunos.sql")[0].rows[0][3] == date(1968, 10, 12)
@@ -0,0 +1,92 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi.routing import APIRoute, serialize_response
+
+from app.config.application import create_application
+from app.models.unigrande import Aluno, Curso, Disciplina, Professor
+from app.schemas.unigrande import (AlunoResponse, CursoResponse,
+                                   DisciplinaResponse, ProfessorResponse)
+from app.services.unigrande import (AlunoService, CursoService,
+                                    DisciplinaService, ProfessorService)
+
+
+async def _serializado_pelo_fastapi(path: str, content):
+    """O que a rota devolveria pelo caminho padrão (response_model + encoder)."""
+    route = next(
+        r
+        for r in create_application().routes
+        if isinstance(r, APIRoute) and r.path == path
+    )
+    return await serialize_response(
+        field=route.response_field, response_content=content
+    )
+
+
+@pytest.mark.asyncio
+async def test_listagem_igual_ao_caminho_padrao(sqlite_client):
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(id=1, nome="CURSO Á", total_creditos=200, coordenador_id=1)
+    await Aluno.create(
+        matricula=1,
+        nome="JOÃO",
+        total_creditos=10,
+        data_nascimento=date(2001, 2, 3),
+        mgp=Decimal("7.50"),
+        curso_id=1,
+    )
+    await Aluno.create(matricula=2, nome="ANA", total_creditos=0, curso_id=1)
+
+    resp = await sqlite_client.get("/alunos/listar-alunos")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.headers["ETag"]
+    esperado = await _serializado_pelo_fastapi(
+        "/alunos/listar-alunos", await AlunoService.list_values()
+    )
+    assert resp.json() == esperado
+    assert esperado[0]["curso"] == {"id": 1, "nome": "CURSO Á"}
+
+    resp = await sqlite_client.get("/alunos/listar-alunos-cursor?limit=1")
+    page = resp.json()
+    assert page["results"] == esperado[:1]
+    assert page["next_cursor"] and page["prev_cursor"] is None
+
+    resp = await sqlite_client.get(
+        "/alunos/listar-alunos", headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert resp.status_code == 304
+
+
+def _formato(valor):
+    """Chaves (e chaves aninhadas) de um dict."""
+    if isinstance(valor, dict):
+        return {k: _formato(v) for k, v in valor.items()}
+    return None
+
+
+@pytest.mark.asyncio
+async def test_list_values_no_formato_exato_do_schema(sqlite_db):
+    # as rotas de listagem serializam estas linhas sem validar (validate=False):
+    # nenhuma coluna a mais nem a menos que o *Response
+    await Professor.create(id=1, matricula=10, nome="PROFESSOR 1")
+    await Curso.create(
+        id=1, nome="COM COORDENADOR", total_creditos=200, coordenador_id=1
+    )
+    await Curso.create(id=2, nome="SEM COORDENADOR", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await Aluno.create(matricula=1, nome="A", total_creditos=0, curso_id=1)
+
+    for service, schema in (
+        (AlunoService, AlunoResponse),
+        (CursoService, CursoResponse),
+        (DisciplinaService, DisciplinaResponse),
+        (ProfessorService, ProfessorResponse),
+    ):
+        rows = await service.list_values()
+        assert rows
+        for row in rows:
+            assert _formato(row) == _formato(schema(**row).model_dump())
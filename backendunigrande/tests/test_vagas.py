@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.unigrande import (Aluno, Curso, Disciplina, Matricula,
+                                  PeriodoLetivo, Turma)
+from app.schemas.unigrande import MatriculaCreate, TurmaCreate, TurmaUpdate
+from app.services.unigrande import (AlunoService, CursoService,
+                                    MatriculaService, TurmaService)
+
+
+async def _turma(vagas: int, alunos: int):
+    await Curso.create(id=1, nome="CURSO", total_creditos=200)
+    await Disciplina.create(
+        id=1, nome="DISC", creditos=4, tipo="N", horas_obrig=4, limite_faltas=18
+    )
+    await PeriodoLetivo.create(id=1, ano=2026, semestre=1)
+    await TurmaService.create(
+        TurmaCreate(id=1, periodo_letivo_id=1, curso_id=1, disciplina_id=1, vagas=vagas)
+    )
+    await Aluno.bulk_create(
+        [
+            Aluno(matricula=m, nome=f"A{m}", total_creditos=0, curso_id=1)
+            for m in range(1, alunos + 1)
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_matriculas_concorrentes_nao_passam_das_vagas(sqlite_db):
+    await _turma(vagas=5, alunos=40)
+
+    results = await asyncio.gather(
+        *(
+            MatriculaService.create(MatriculaCreate(id=m, aluno_id=m, turma_id=1))
+            for m in range(1, 41)
+        ),
+        return_exceptions=True,
+    )
+
+    created = [r for r in results if isinstance(r, Matricula)]
+    recusadas = [r for r in results if isinstance(r, HTTPException)]
+    assert len(created) == 5
+    assert {(r.status_code, r.detail) for r in recusadas} == {(409, "Turma sem vagas.")}
+    assert await Matricula.filter(turma_id=1).count() == 5
+    assert (await Turma.get(id=1)).vagas_disponiveis == 0
+
+
+@pytest.mark.asyncio
+async def test_vaga_volta_ao_cancelar_e_em_conflito(sqlite_db):
+    await _turma(vagas=2, alunos=3)
+    await MatriculaService.create(MatriculaCreate(id=1, aluno_id=1, turma_id=1))
+
+    # matrícula repetida: o 409 desfaz a reserva da vaga
+    with pytest.raises(HTTPException) as exc:
+        await MatriculaService.create(MatriculaCreate(id=2, aluno_id=1, turma_id=1))
+    assert exc.value.detail == "Aluno já matriculado nesta Turma."
+    assert (await Turma.get(id=1)).vagas_disponiveis == 1
+
+    await MatriculaService.create(MatriculaCreate(id=3, aluno_id=2, turma_id=1))
+    with pytest.raises(HTTPException):
+        await MatriculaService.create(MatriculaCreate(id=4, aluno_id=3, turma_id=1))
+
+    await MatriculaService.delete(1)
+    await MatriculaService.create(MatriculaCreate(id=4, aluno_id=3, turma_id=1))
+
+    # aumentar as vagas soma a diferença ao saldo
+    turma = await TurmaService.update(1, TurmaUpdate(vagas=5))
+    assert (turma.vagas, turma.vagas_disponiveis) == (5, 3)
+    # reduzir até as vagas ocupadas pode; abaixo delas, 409
+    turma = await TurmaService.update(1, TurmaUpdate(vagas=2))
+    assert (turma.vagas, turma.vagas_disponiveis) == (2, 0)
+    with pytest.raises(HTTPException) as exc:
+        await TurmaService.update(1, TurmaUpdate(vagas=1))
+    assert exc.value.status_code == 409
+    turma = await Turma.get(id=1)
+    assert (turma.vagas, turma.vagas_disponiveis) == (2, 0)
+
+    with pytest.raises(HTTPException) as exc:
+        await MatriculaService.create(MatriculaCreate(id=5, aluno_id=1, turma_id=99))
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_remover_aluno_ou_curso_devolve_as_vagas(sqlite_db):
+    await _turma(vagas=2, alunos=2)
+    await Curso.create(id=2, nome="OUTRO CURSO", total_creditos=200)
+    await TurmaService.create(
+        TurmaCreate(id=2, periodo_letivo_id=1, curso_id=2, disciplina_id=1, vagas=3)
+    )
+    for m in (1, 2):
+        await MatriculaService.create(MatriculaCreate(id=m, aluno_id=m, turma_id=1))
+        await MatriculaService.create(
+            MatriculaCreate(id=10 + m, aluno_id=m, turma_id=2)
+        )
+
+    await AlunoService.delete(1)
+    assert await Matricula.filter(turma_id=1).count() == 1
+    assert (await Turma.get(id=1)).vagas_disponiveis == 1
+    assert (await Turma.get(id=2)).vagas_disponiveis == 2
+
+    # o curso 1 leva o aluno 2 e a turma 1; a vaga dele na turma 2 (de
+    # outro curso) volta
+    await CursoService.delete(1)
+    assert await Matricula.all().count() == 0
+    assert (await Turma.get(id=2)).vagas_disponiveis == 3